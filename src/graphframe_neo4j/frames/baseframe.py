@@ -2,30 +2,27 @@
 BaseFrame: Common functionality for all frame types.
 """
 
-from typing import Any, Dict, List, Optional, Tuple
-from ..graph import Graph
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple
+from ..graph import Graph, _require
 
-# Optional pandas integration
-try:
+if TYPE_CHECKING:
     import pandas as pd
-    HAS_PANDAS = True
-except ImportError:
-    HAS_PANDAS = False
-    pd = None
-
-# Optional networkx integration
-try:
-    import networkx as nx
-    HAS_NETWORKX = True
-except ImportError:
-    HAS_NETWORKX = False
-    nx = None
 
 class BaseFrame:
     """
     Base class for all frame types (NodeFrame, EdgeFrame, PathFrame).
     """
     
+    __slots__ = (
+        "_filters",
+        "_graph",
+        "_label",
+        "_limit",
+        "_offset",
+        "_order_by",
+        "_selected_fields",
+    )
+    
     def __init__(self, graph: Graph, label: str):
         self._graph = graph
         self._label = label
@@ -60,10 +57,12 @@ class BaseFrame:
         Raises:
             ImportError: If pandas is not installed
         """
-        if not HAS_PANDAS:
+        try:
+            pd = _require("pandas")
+        except ImportError as exc:
             raise ImportError(
                 "pandas is required for to_df(). Install with: uv add pandas"
-            )
+            ) from exc
         
         # Execute the query and get records
         records = self.to_records()
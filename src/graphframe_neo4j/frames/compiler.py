@@ -2,11 +2,200 @@
 Query compiler for converting frame operations to Cypher queries.
 """
 
-from typing import Any, Dict, List, Optional, Tuple
+from functools import lru_cache
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple, Type
+
+from ..util.errors import QueryError
+from ..util.typing import CompiledQuery
+
+# Operators that test for null and take no parameter
+_NULL_OPS = ("exists", "is_null", "not_null")
+
+# Python-style filter op -> Cypher predicate ({f}: property reference, {p}: parameter)
+_OP_TEMPLATES = {
+    "eq": "{f} = {p}",
+    "ne": "{f} <> {p}",
+    "lt": "{f} < {p}",
+    "lte": "{f} <= {p}",
+    "gt": "{f} > {p}",
+    "gte": "{f} >= {p}",
+    "in": "{f} IN {p}",
+    "not_in": "{f} NOT IN {p}",
+    "contains": "{f} CONTAINS {p}",
+    "startswith": "{f} STARTS WITH {p}",
+    "endswith": "{f} ENDS WITH {p}",
+    "regex": "{f} =~ {p}",
+    "exists": "{f} IS NOT NULL",
+    "is_null": "{f} IS NULL",
+    "not_null": "{f} IS NOT NULL"
+}
+
+# Operation suffixes recognised in filter kwarg names
+_FILTER_OPS = frozenset(_OP_TEMPLATES)
+
+# Unknown operators fall back to equality
+_DEFAULT_OP_TEMPLATE = _OP_TEMPLATES["eq"]
+
+
+@lru_cache(maxsize=2048)
+def _predicate_prefix(alias: str, field: str, op: str) -> str:
+    """
+    A WHERE predicate up to its parameter reference, e.g. ``"to.city = "``.
+    
+    Every parameterised template ends with ``{p}``, so the full predicate is
+    this prefix plus the reference; NULL operations are already complete.
+    """
+    return _OP_TEMPLATES.get(op, _DEFAULT_OP_TEMPLATE).format(f=f"{alias}.{field}", p="")
+
+
+@lru_cache(maxsize=4096)
+def _is_identifier(name: str) -> bool:
+    """
+    Whether a name can be spliced into Cypher as is.
+    
+    Plain identifiers qualify, and so do backtick-quoted names such as
+    ``"`My Label`"`` whose inner backticks are doubled, the way Cypher
+    escapes them.
+    """
+    if name.isidentifier():
+        return True
+    return len(name) > 2 and name[0] == name[-1] == "`" and "`" not in name[1:-1].replace("``", "")
+
+
+def _check_identifier(
+    name: str,
+    kind: str,
+    optional: bool = False,
+    error: Type[Exception] = QueryError
+) -> None:
+    """Reject label, type or property names that are neither plain nor quoted identifiers.
+    
+    Names are spliced into the Cypher text (they cannot be parameters), so
+    anything else could change the shape of the query. Write compilers pass
+    their own ``error`` class (WriteError).
+    """
+    if _is_identifier(name) or (optional and not name):
+        return
+    raise error(f"Invalid {kind} name: {name!r} (quote it in backticks, e.g. `My Label`)")
+
+
+@lru_cache(maxsize=4096)
+def _is_field(field: str) -> bool:
+    """Whether a field reference is an identifier or dotted identifiers (e.g. ``n.age``)."""
+    return _is_identifier(field) or all(_is_identifier(part) for part in field.split("."))
+
+
+def _check_field(field: str, kind: str = "property", star: bool = False) -> None:
+    """
+    Reject a WHERE, ORDER BY or RETURN field unless each dotted part is an identifier.
+    
+    Alias-qualified references such as ``n.age`` pass, and so does a bare
+    ``*`` where ``star`` allows it (selections).
+    """
+    if _is_field(field) or (star and field == "*"):
+        return
+    raise QueryError(f"Invalid {kind} name: {field!r} (quote it in backticks, e.g. `My Label`)")
+
+
+def _unquote(name: str) -> str:
+    """The raw name behind a spliceable name (backticks removed and unescaped)."""
+    if name.startswith("`"):
+        return name[1:-1].replace("``", "`")
+    return name
+
+
+@lru_cache(maxsize=4096)
+def _quote(name: str) -> str:
+    """A raw name (e.g. a data key) as Cypher text, backtick-quoted unless it is a plain identifier."""
+    if name.isidentifier():
+        return name
+    return "`" + name.replace("`", "``") + "`"
+
+
+# Sort directions accepted in order_by pairs
+_SORT_DIRECTIONS = {"ASC": "ASC", "DESC": "DESC"}
+
+
+def _sort_direction(direction: Optional[str]) -> str:
+    """Normalise a sort direction to ASC/DESC; anything unknown sorts ascending."""
+    if not direction:
+        return "ASC"
+    normalised = _SORT_DIRECTIONS.get(direction)
+    if normalised is None:
+        normalised = _SORT_DIRECTIONS.get(direction.upper(), "ASC")
+    return normalised
+
+
+@lru_cache(maxsize=1024)
+def _parse_order_field(field: str) -> Tuple[str, str]:
+    """Split an order_by argument (field[__asc|__desc]) into (field, direction)."""
+    if field.endswith("__desc"):
+        return field[:-6], "DESC"
+    if field.endswith("__asc"):
+        return field[:-5], "ASC"
+    return field, "ASC"
+
+
+# Cypher for unfiltered node queries, keyed by (label, alias)
+_MATCH_RETURN_CACHE: Dict[Tuple[str, str], str] = {}
+
+# Traversal direction -> (left, right) arrow around the relationship pattern
+_ARROW = {"out": ("-", "->"), "in": ("<-", "-"), "both": ("-", "-")}
+
+# RETURN clause of traversals without a selection (or selecting "*"), keyed
+# by (from_alias, rel_alias, to_alias)
+_DEFAULT_RETURN = "RETURN from, rel, to"
+_RETURN_DEFAULTS: Dict[Tuple[str, str, str], str] = {("from", "rel", "to"): _DEFAULT_RETURN}
+
+# RETURN clause of back() queries without a selection
+_BACK_DEFAULT_RETURN = "RETURN from"
+
+# Interned names and $-references for the first _PARAM_POOL_SIZE parameters;
+# later ones (rare, e.g. huge generated filters) are formatted on demand
+_PARAM_POOL_SIZE = 256
+_PARAM_NAMES: Tuple[str, ...] = tuple(f"param_{i}" for i in range(_PARAM_POOL_SIZE))
+_PARAM_REFS: Tuple[str, ...] = tuple(f"${name}" for name in _PARAM_NAMES)
+
+
+def _param_names(start: int, stop: int) -> Sequence[str]:
+    """Parameter names ``param_<start>`` .. ``param_<stop - 1>``."""
+    if stop <= _PARAM_POOL_SIZE:
+        return _PARAM_NAMES[start:stop]
+    return [*_PARAM_NAMES[start:], *(f"param_{i}" for i in range(max(start, _PARAM_POOL_SIZE), stop))]
+
+
+def _param_refs(start: int, stop: int) -> Sequence[str]:
+    """``$``-references for ``param_<start>`` .. ``param_<stop - 1>``."""
+    if stop <= _PARAM_POOL_SIZE:
+        return _PARAM_REFS[start:stop]
+    return [*_PARAM_REFS[start:], *(f"$param_{i}" for i in range(max(start, _PARAM_POOL_SIZE), stop))]
+
+
+def _condition_shape(conditions: List[Dict[str, Any]]) -> Tuple[Tuple[str, str], ...]:
+    """The (field, op) pairs of the conditions that produce a predicate."""
+    return tuple(
+        (condition["field"], condition.get("op", "eq"))
+        for condition in conditions
+        if condition.get("field", "")
+    )
+
+
+def _condition_params(conditions: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Bind param_<i> values in the order _compile_where_clause numbers them."""
+    values = [
+        condition.get("value")
+        for condition in conditions
+        if condition.get("field", "") and condition.get("op", "eq") not in _NULL_OPS
+    ]
+    return dict(zip(_param_names(0, len(values)), values))
 
 class QueryCompiler:
     """
     Compiles frame operations into Cypher queries and parameters.
+    
+    Filter values are bound into ``params`` by reference, never copied (an
+    ``__in`` list of any size costs one dict entry). Mutating a bound list
+    after compiling changes what the query will send.
     """
     
     def __init__(self):
@@ -21,70 +210,42 @@ class QueryCompiler:
     
     def _add_param(self, value: Any) -> str:
         """Add a parameter and return its parameter name."""
-        param_name = f"param_{self._param_counter}"
-        self._param_counter += 1
+        index = self._param_counter
+        param_name = _PARAM_NAMES[index] if index < _PARAM_POOL_SIZE else f"param_{index}"
+        self._param_counter = index + 1
         self._params[param_name] = value
         return param_name
     
+    def _add_param_ref(self, value: Any) -> str:
+        """Add a parameter and return its ``$``-prefixed reference."""
+        index = self._param_counter
+        self._add_param(value)
+        return _PARAM_REFS[index] if index < _PARAM_POOL_SIZE else f"$param_{index}"
+    
+    def _bind_params(self, values: List[Any]) -> Iterator[str]:
+        """Bind values as consecutive parameters; yield their ``$`` references."""
+        start = self._param_counter
+        stop = start + len(values)
+        self._params.update(zip(_param_names(start, stop), values))
+        self._param_counter = stop
+        return iter(_param_refs(start, stop))
+    
     def _compile_where_clause(self, conditions: List[Dict[str, Any]]) -> str:
         """Compile WHERE conditions into Cypher."""
         if not conditions:
             return ""
         
-        where_parts = []
-        for condition in conditions:
-            field = condition.get("field", "")
-            op = condition.get("op", "eq")
-            value = condition.get("value")
-            
-            if not field:
-                continue
-            
-            # Handle parameterized values (skip for NULL operations)
-            if op not in ("exists", "is_null", "not_null"):
-                if isinstance(value, (str, int, float, bool)):
-                    param_name = self._add_param(value)
-                    cypher_value = f"${param_name}"
-                elif isinstance(value, list):
-                    # For IN operations
-                    param_name = self._add_param(value)
-                    cypher_value = f"${param_name}"
-                else:
-                    cypher_value = f"${self._add_param(value)}"
-            else:
-                cypher_value = ""  # Not used for NULL ops
-            
-            # Map Python-style ops to Cypher
-            op_mapping = {
-                "eq": "=",
-                "ne": "<>",
-                "lt": "<",
-                "lte": "<=",
-                "gt": ">",
-                "gte": ">=",
-                "in": "IN",
-                "not_in": "NOT IN",
-                "contains": "CONTAINS",
-                "startswith": "STARTS WITH",
-                "endswith": "ENDS WITH",
-                "regex": "=~",
-                "exists": "IS NOT NULL",
-                "is_null": "IS NULL",
-                "not_null": "IS NOT NULL"
-            }
-            
-            cypher_op = op_mapping.get(op, "=")
-            
-            if op in ("exists", "is_null", "not_null"):
-                where_parts.append(f"n.{field} {cypher_op}")
-            elif op in ("in", "not_in"):
-                where_parts.append(f"n.{field} {cypher_op} {cypher_value}")
-            elif op == "contains":
-                where_parts.append(f"n.{field} {cypher_op} {cypher_value}")
-            elif op == "regex":
-                where_parts.append(f"n.{field} {cypher_op} {cypher_value}")
-            else:
-                where_parts.append(f"n.{field} {cypher_op} {cypher_value}")
+        active = [
+            (condition["field"], condition.get("op", "eq"), condition.get("value"))
+            for condition in conditions
+            if condition.get("field", "")
+        ]
+        # NULL operations take no parameter
+        refs = self._bind_params([value for _, op, value in active if op not in _NULL_OPS])
+        where_parts = [
+            _predicate_prefix("n", field, op) + ("" if op in _NULL_OPS else next(refs))
+            for field, op, _ in active
+        ]
         
         if where_parts:
             return f"WHERE {' AND '.join(where_parts)}"
@@ -115,9 +276,7 @@ class QueryCompiler:
         
         order_parts = []
         for field, direction in order_by:
-            direction = direction.upper() if direction else "ASC"
-            if direction not in ("ASC", "DESC"):
-                direction = "ASC"
+            direction = _sort_direction(direction)
             
             if field.startswith(alias + "."):
                 order_parts.append(f"{field} {direction}")
@@ -149,48 +308,73 @@ class QueryCompiler:
         order_by: Optional[List[Tuple[str, str]]] = None,
         limit: Optional[int] = None,
         offset: Optional[int] = None
-    ) -> Dict[str, Any]:
-        """Compile a complete node query."""
-        self._clauses = []
+    ) -> CompiledQuery:
+        """
+        Compile a complete node query.
+        
+        The Cypher is looked up in a process-wide cache keyed by the query
+        shape (label, alias, filtered fields and operators, selected fields,
+        ordering, limit and offset); only the parameter values are bound per
+        call.
+        """
+        if not (conditions or fields or order_by) and limit is None and offset is None:
+            # Bare label scan: the most common shape, served from a plain dict
+            cypher = _MATCH_RETURN_CACHE.get((label, alias))
+            if cypher is None:
+                _check_identifier(label, "label")
+                cypher = _MATCH_RETURN_CACHE[(label, alias)] = f"MATCH ({alias}:{label})\nRETURN {alias}"
+            self._params = {}
+            return CompiledQuery(cypher, self._params)
+        
+        conditions = conditions or []
+        cypher = _node_query_template(
+            label,
+            alias,
+            _condition_shape(conditions),
+            tuple(fields or ()),
+            tuple(tuple(item) for item in order_by or ()),
+            limit,
+            offset
+        )
+        self._params = _condition_params(conditions)
+        
+        return CompiledQuery(cypher, self._params)
+    
+    def _build_node_query(
+        self,
+        label: str,
+        alias: str = "n",
+        conditions: Optional[List[Dict[str, Any]]] = None,
+        fields: Optional[List[str]] = None,
+        order_by: Optional[List[Tuple[str, str]]] = None,
+        limit: Optional[int] = None,
+        offset: Optional[int] = None
+    ) -> CompiledQuery:
+        """Build a complete node query clause by clause (uncached).
+
+        Clauses are written into fixed slots (MATCH, WHERE, RETURN, ORDER BY,
+        SKIP, LIMIT) and joined once at the end.
+        """
         self._params = {}
         self._param_counter = 0
+        parts: List[Optional[str]] = [None] * 6
+        
+        parts[0] = f"MATCH ({alias}:{label})"
+        # Clauses without input are skipped rather than built empty
+        if conditions:
+            parts[1] = self._compile_where_clause(conditions)
+        parts[2] = f"RETURN {self._compile_select_clause(fields, alias) if fields else alias}"
+        if order_by:
+            parts[3] = self._compile_order_by_clause(order_by, alias)
+        # OFFSET is SKIP in Cypher
+        if offset is not None:
+            parts[4] = self._compile_offset_clause(offset)
+        if limit is not None:
+            parts[5] = self._compile_limit_clause(limit)
         
-        # MATCH clause
-        match_clause = f"MATCH ({alias}:{label})"
-        self._add_clause(match_clause)
-        
-        # WHERE clause
-        where_clause = self._compile_where_clause(conditions or [])
-        if where_clause:
-            self._add_clause(where_clause)
-        
-        # RETURN clause
-        select_clause = self._compile_select_clause(fields or [], alias)
-        return_clause = f"RETURN {select_clause}"
-        self._add_clause(return_clause)
-        
-        # ORDER BY clause
-        order_by_clause = self._compile_order_by_clause(order_by or [], alias)
-        if order_by_clause:
-            self._add_clause(order_by_clause)
-        
-        # OFFSET clause (SKIP in Cypher)
-        offset_clause = self._compile_offset_clause(offset)
-        if offset_clause:
-            self._add_clause(offset_clause)
-        
-        # LIMIT clause
-        limit_clause = self._compile_limit_clause(limit)
-        if limit_clause:
-            self._add_clause(limit_clause)
-        
-        # Combine all clauses
-        cypher_query = "\n".join(self._clauses)
+        self._clauses = [part for part in parts if part]
         
-        return {
-            "cypher": cypher_query,
-            "params": self._params
-        }
+        return CompiledQuery("\n".join(self._clauses), self._params)
     
     def compile_edge_query(
         self,
@@ -200,8 +384,13 @@ class QueryCompiler:
         fields: Optional[List[str]] = None,
         limit: Optional[int] = None,
         offset: Optional[int] = None
-    ) -> Dict[str, Any]:
+    ) -> CompiledQuery:
         """Compile a relationship query."""
+        _check_identifier(rel_type, "relationship type")
+        for field, _ in _condition_shape(conditions or []):
+            _check_field(field)
+        for field in fields or ():
+            _check_field(field)
         self._clauses = []
         self._params = {}
         self._param_counter = 0
@@ -240,10 +429,7 @@ class QueryCompiler:
             self._add_clause(f"SKIP {offset}")
         
         cypher_query = "\n".join(self._clauses)
-        return {
-            "cypher": cypher_query,
-            "params": self._params
-        }
+        return CompiledQuery(cypher_query, self._params)
     
     def compile_traversal_query(
         self,
@@ -259,61 +445,74 @@ class QueryCompiler:
         order_by: Optional[List[Tuple[str, str]]] = None,
         limit: Optional[int] = None,
         offset: Optional[int] = None
-    ) -> Dict[str, Any]:
-        """Compile a traversal query with relationship patterns."""
-        self._clauses = []
+    ) -> CompiledQuery:
+        """
+        Compile a traversal query with relationship patterns.
+        
+        Like node queries, the Cypher is cached per query shape and only the
+        parameter values are bound per call.
+        """
+        conditions = conditions or []
+        cypher = _traversal_query_template(
+            from_label, from_alias, rel_type, rel_alias, to_label, to_alias, direction,
+            _condition_shape(conditions),
+            tuple(fields or ()),
+            tuple(tuple(item) for item in order_by or ()),
+            limit,
+            offset,
+            False
+        )
+        self._params = _condition_params(conditions)
+        return CompiledQuery(cypher, self._params)
+    
+    def _build_traversal_query(
+        self,
+        from_label: str,
+        from_alias: str = "from",
+        rel_type: str = "",
+        rel_alias: str = "rel",
+        to_label: str = "",
+        to_alias: str = "to",
+        direction: str = "out",
+        conditions: Optional[List[Dict[str, Any]]] = None,
+        fields: Optional[List[str]] = None,
+        order_by: Optional[List[Tuple[str, str]]] = None,
+        limit: Optional[int] = None,
+        offset: Optional[int] = None
+    ) -> CompiledQuery:
+        """Build a complete traversal query clause by clause (uncached)."""
         self._params = {}
         self._param_counter = 0
         
-        # Determine relationship direction pattern
-        direction_patterns = {
-            "out": f"-{rel_alias}:{rel_type}->",
-            "in": f"<-{rel_alias}:{rel_type}-",
-            "both": f"-{rel_alias}:{rel_type}-"
-        }
-        
-        dir_pattern = direction_patterns.get(direction, "->")
+        parts: List[Optional[str]] = [None] * 6
         
         # MATCH clause with relationship pattern
-        if to_label:
-            match_clause = f"MATCH ({from_alias}:{from_label}){dir_pattern}({to_alias}:{to_label})"
+        parts[0] = _match_skeleton(
+            from_alias, from_label, rel_alias, rel_type, to_alias, to_label, direction, False
+        )
+        # Clauses without input are skipped rather than built empty
+        if conditions:
+            parts[1] = _traversal_where(_condition_shape(conditions), from_alias, rel_alias, to_alias)
+            self._params = _condition_params(conditions)
+        if fields and fields != ["*"]:
+            parts[2] = f"RETURN {self._compile_traversal_select_clause(fields, from_alias, rel_alias, to_alias)}"
         else:
-            match_clause = f"MATCH ({from_alias}:{from_label}){dir_pattern}({to_alias})"
-        
-        self._add_clause(match_clause)
-        
-        # WHERE clause
-        where_clause = self._compile_traversal_where_clause(conditions or [], from_alias, rel_alias, to_alias)
-        if where_clause:
-            self._add_clause(where_clause)
-        
-        # RETURN clause
-        select_clause = self._compile_traversal_select_clause(fields or [], from_alias, rel_alias, to_alias)
-        return_clause = f"RETURN {select_clause}"
-        self._add_clause(return_clause)
-        
-        # ORDER BY clause
-        order_by_clause = self._compile_traversal_order_by_clause(order_by or [], from_alias, rel_alias, to_alias)
-        if order_by_clause:
-            self._add_clause(order_by_clause)
-        
-        # OFFSET clause (SKIP in Cypher)
-        offset_clause = self._compile_offset_clause(offset)
-        if offset_clause:
-            self._add_clause(offset_clause)
-        
-        # LIMIT clause
-        limit_clause = self._compile_limit_clause(limit)
-        if limit_clause:
-            self._add_clause(limit_clause)
+            aliases = (from_alias, rel_alias, to_alias)
+            return_clause = _RETURN_DEFAULTS.get(aliases)
+            if return_clause is None:
+                return_clause = _RETURN_DEFAULTS[aliases] = f"RETURN {from_alias}, {rel_alias}, {to_alias}"
+            parts[2] = return_clause
+        if order_by:
+            parts[3] = self._compile_traversal_order_by_clause(order_by, from_alias, rel_alias, to_alias)
+        # OFFSET is SKIP in Cypher
+        if offset is not None:
+            parts[4] = self._compile_offset_clause(offset)
+        if limit is not None:
+            parts[5] = self._compile_limit_clause(limit)
         
-        # Combine all clauses
-        cypher_query = "\n".join(self._clauses)
+        self._clauses = [part for part in parts if part]
         
-        return {
-            "cypher": cypher_query,
-            "params": self._params
-        }
+        return CompiledQuery("\n".join(self._clauses), self._params)
     
     def _compile_traversal_where_clause(
         self, 
@@ -326,11 +525,13 @@ class QueryCompiler:
         if not conditions:
             return ""
         
-        where_parts = []
+        # Collect predicate prefixes and values first; the values are bound
+        # in one pass at the end
+        prefixes = []
+        values = []
         for condition in conditions:
             field = condition.get("field", "")
             op = condition.get("op", "eq")
-            value = condition.get("value")
             
             if not field:
                 continue
@@ -365,50 +566,16 @@ class QueryCompiler:
                 alias = to_alias
                 field = prop
             
-            # Handle parameterized values (skip for NULL operations)
-            if op not in ("exists", "is_null", "not_null"):
-                if isinstance(value, (str, int, float, bool)):
-                    param_name = self._add_param(value)
-                    cypher_value = f"${param_name}"
-                elif isinstance(value, list):
-                    param_name = self._add_param(value)
-                    cypher_value = f"${param_name}"
-                else:
-                    cypher_value = f"${self._add_param(value)}"
-            else:
-                cypher_value = ""
-            
-            # Map Python-style ops to Cypher
-            op_mapping = {
-                "eq": "=",
-                "ne": "<>",
-                "lt": "<",
-                "lte": "<=",
-                "gt": ">",
-                "gte": ">=",
-                "in": "IN",
-                "not_in": "NOT IN",
-                "contains": "CONTAINS",
-                "startswith": "STARTS WITH",
-                "endswith": "ENDS WITH",
-                "regex": "=~",
-                "exists": "IS NOT NULL",
-                "is_null": "IS NULL",
-                "not_null": "IS NOT NULL"
-            }
-            
-            cypher_op = op_mapping.get(op, "=")
-            
-            if op in ("exists", "is_null", "not_null"):
-                where_parts.append(f"{alias}.{field} {cypher_op}")
-            elif op in ("in", "not_in"):
-                where_parts.append(f"{alias}.{field} {cypher_op} {cypher_value}")
-            elif op == "contains":
-                where_parts.append(f"{alias}.{field} {cypher_op} {cypher_value}")
-            elif op == "regex":
-                where_parts.append(f"{alias}.{field} {cypher_op} {cypher_value}")
-            else:
-                where_parts.append(f"{alias}.{field} {cypher_op} {cypher_value}")
+            # Map Python-style ops to Cypher; NULL operations take no parameter
+            has_param = op not in _NULL_OPS
+            prefixes.append((_predicate_prefix(alias, field, op), has_param))
+            if has_param:
+                # Values are only ever bound as parameters, never inspected or
+                # spliced into the Cypher text
+                values.append(condition.get("value"))
+        
+        refs = self._bind_params(values)
+        where_parts = [prefix + next(refs) if has_param else prefix for prefix, has_param in prefixes]
         
         if where_parts:
             return f"WHERE {' AND '.join(where_parts)}"
@@ -468,9 +635,7 @@ class QueryCompiler:
         
         order_parts = []
         for field, direction in order_by:
-            direction = direction.upper() if direction else "ASC"
-            if direction not in ("ASC", "DESC"):
-                direction = "ASC"
+            direction = _sort_direction(direction)
             
             # Handle namespaced fields
             alias = from_alias
@@ -519,36 +684,52 @@ class QueryCompiler:
         back_order_by: Optional[List[Tuple[str, str]]] = None,
         back_limit: Optional[int] = None,
         back_offset: Optional[int] = None
-    ) -> Dict[str, Any]:
+    ) -> CompiledQuery:
         """Compile a back() query that returns to originating nodes after filtering."""
-        self._clauses = []
+        back_conditions = back_conditions or []
+        cypher = _traversal_query_template(
+            from_label, from_alias, rel_type, rel_alias, to_label, to_alias, direction,
+            _condition_shape(back_conditions),
+            tuple(back_fields or ()),
+            tuple(tuple(item) for item in back_order_by or ()),
+            back_limit,
+            back_offset,
+            True
+        )
+        self._params = _condition_params(back_conditions)
+        return CompiledQuery(cypher, self._params)
+    
+    def _build_back_query(
+        self,
+        from_label: str,
+        from_alias: str = "from",
+        rel_type: str = "",
+        rel_alias: str = "rel",
+        to_label: str = "",
+        to_alias: str = "to",
+        direction: str = "out",
+        back_conditions: Optional[List[Dict[str, Any]]] = None,
+        back_fields: Optional[List[str]] = None,
+        back_order_by: Optional[List[Tuple[str, str]]] = None,
+        back_limit: Optional[int] = None,
+        back_offset: Optional[int] = None
+    ) -> CompiledQuery:
+        """Build a complete back() query clause by clause (uncached)."""
         self._params = {}
         self._param_counter = 0
         
-        # Determine relationship direction pattern
-        direction_patterns = {
-            "out": f"-{rel_alias}:{rel_type}->",
-            "in": f"<-{rel_alias}:{rel_type}-",
-            "both": f"-{rel_alias}:{rel_type}-"
-        }
-        
-        dir_pattern = direction_patterns.get(direction, "->")
+        parts: List[Optional[str]] = [None] * 7
         
         # MATCH clause with relationship pattern and path
-        if to_label:
-            match_clause = f"MATCH path = ({from_alias}:{from_label}){dir_pattern}({to_alias}:{to_label})"
-        else:
-            match_clause = f"MATCH path = ({from_alias}:{from_label}){dir_pattern}({to_alias})"
-        
-        self._add_clause(match_clause)
-        
-        # WHERE clause for traversal conditions
-        where_clause = self._compile_traversal_where_clause(back_conditions or [], from_alias, rel_alias, to_alias)
-        if where_clause:
-            self._add_clause(where_clause)
-        
+        parts[0] = _match_skeleton(
+            from_alias, from_label, rel_alias, rel_type, to_alias, to_label, direction, True
+        )
+        # WHERE clause for traversal conditions: the same fragment the traversal itself uses
+        if back_conditions:
+            parts[1] = _traversal_where(_condition_shape(back_conditions), from_alias, rel_alias, to_alias)
+            self._params = _condition_params(back_conditions)
         # WITH clause to filter the path
-        self._add_clause("WITH from")
+        parts[2] = "WITH from"
         
         # RETURN clause for originating nodes - handle namespaced fields from traversal
         if back_fields:
@@ -567,21 +748,16 @@ class QueryCompiler:
                 else:
                     # Default to from alias
                     compiled_fields.append(f"from.{field}")
-            select_clause = ", ".join(compiled_fields)
+            parts[3] = f"RETURN {', '.join(compiled_fields)}"
         else:
             # Return the from node by default
-            select_clause = "from"
-        
-        return_clause = f"RETURN {select_clause}"
-        self._add_clause(return_clause)
+            parts[3] = _BACK_DEFAULT_RETURN
         
         # ORDER BY clause - handle namespaced fields
         if back_order_by:
             order_parts = []
             for field, direction in back_order_by:
-                direction = direction.upper() if direction else "ASC"
-                if direction not in ("ASC", "DESC"):
-                    direction = "ASC"
+                direction = _sort_direction(direction)
                 
                 # Handle namespaced fields in order by
                 if field.startswith("from__"):
@@ -597,90 +773,154 @@ class QueryCompiler:
                     # Default to from alias
                     order_parts.append(f"from.{field} {direction}")
             
-            if order_parts:
-                order_by_clause = f"ORDER BY {' , '.join(order_parts)}"
-                self._add_clause(order_by_clause)
+            parts[4] = f"ORDER BY {' , '.join(order_parts)}"
         
-        # OFFSET clause (SKIP in Cypher)
-        offset_clause = self._compile_offset_clause(back_offset)
-        if offset_clause:
-            self._add_clause(offset_clause)
+        # OFFSET is SKIP in Cypher
+        if back_offset is not None:
+            parts[5] = self._compile_offset_clause(back_offset)
+        if back_limit is not None:
+            parts[6] = self._compile_limit_clause(back_limit)
         
-        # LIMIT clause
-        limit_clause = self._compile_limit_clause(back_limit)
-        if limit_clause:
-            self._add_clause(limit_clause)
+        self._clauses = [part for part in parts if part]
         
-        # Combine all clauses
-        cypher_query = "\n".join(self._clauses)
-        
-        return {
-            "cypher": cypher_query,
-            "params": self._params
-        }
+        return CompiledQuery("\n".join(self._clauses), self._params)
     
     def parse_filter_kwargs(self, kwargs: Dict[str, Any]) -> List[Dict[str, Any]]:
-        """Parse filter kwargs into conditions."""
-        conditions = []
-        
-        for key, value in kwargs.items():
-            if "__" in key:
-                # Handle field__op syntax
-                field_parts = key.split("__")
-                
-                # Check if this is a namespaced field with operation
-                # Namespaced fields can be:
-                # - Standard: from__prop, rel__prop, to__prop
-                # - With operation: from__prop__op, rel__prop__op, to__prop__op
-                # - Custom aliases: p__prop, r__prop, c__prop (when using custom aliases)
-                
-                if len(field_parts) >= 2:
-                    # Check if this looks like a namespaced field
-                    # A namespaced field has at least 2 parts and the operation (if present) is a known operation
-                    potential_op = field_parts[-1] if len(field_parts) > 2 else None
-                    known_ops = ["eq", "ne", "lt", "lte", "gt", "gte", "in", "not_in", "contains", "startswith", "endswith", "regex", "exists", "is_null", "not_null"]
-                    
-                    if len(field_parts) == 2:
-                        # This could be either namespaced field (namespace__prop) or field__op
-                        # If the second part is a known operation, it's field__op
-                        if field_parts[1] in known_ops:
-                            field = field_parts[0]
-                            op = field_parts[1]
-                        else:
-                            # This is namespaced field
-                            field = key
-                            op = "eq"
-                    elif len(field_parts) >= 3:
-                        # Check if the last part is a known operation
-                        if potential_op in known_ops:
-                            # This is namespaced field with operation: namespace__prop__op
-                            namespace_parts = field_parts[:-1]
-                            field = "__".join(namespace_parts)
-                            op = potential_op
-                        else:
-                            # This is field__op syntax where op contains underscores
-                            field = field_parts[0]
-                            op = "__".join(field_parts[1:])
-                    else:
-                        # This is just the field itself
-                        field = field_parts[0]
-                        op = "eq"
-                else:
-                    # Simple field
-                    field = field_parts[0]
-                    op = "eq"
-                
-                conditions.append({
-                    "field": field,
-                    "op": op,
-                    "value": value
-                })
-            else:
-                # Simple equality
-                conditions.append({
-                    "field": key,
-                    "op": "eq",
-                    "value": value
-                })
-        
-        return conditions
+        """
+        Parse filter kwargs into conditions.
+        
+        The (field, op) split of each key only depends on the key names, so it
+        is cached per key tuple and the values are zipped in afterwards.
+        """
+        return [
+            {"field": field, "op": op, "value": value}
+            for (field, op), value in zip(_parse_shape(tuple(kwargs)), kwargs.values())
+        ]
+
+
+@lru_cache(maxsize=1024)
+def _match_skeleton(
+    from_alias: str,
+    from_label: str,
+    rel_alias: str,
+    rel_type: str,
+    to_alias: str,
+    to_label: str,
+    direction: str,
+    path: bool
+) -> str:
+    """MATCH clause of a traversal (or, with ``path``, a back()) query."""
+    arrow = _ARROW.get(direction)
+    # Unknown directions degrade to a bare arrow without the relationship
+    dir_pattern = f"{arrow[0]}{rel_alias}:{rel_type}{arrow[1]}" if arrow else "->"
+    to_node = f"({to_alias}:{to_label})" if to_label else f"({to_alias})"
+    prefix = "MATCH path = " if path else "MATCH "
+    return f"{prefix}({from_alias}:{from_label}){dir_pattern}{to_node}"
+
+
+def _check_shape_fields(fields: Tuple[str, ...], order_by: Tuple[Tuple[str, str], ...]) -> None:
+    """Validate the selected and ORDER BY fields of a query shape."""
+    for field in fields:
+        _check_field(field, star=True)
+    for field, _ in order_by:
+        _check_field(field)
+
+
+@lru_cache(maxsize=1024)
+def _node_query_template(
+    label: str,
+    alias: str,
+    condition_shape: Tuple[Tuple[str, str], ...],
+    fields: Tuple[str, ...],
+    order_by: Tuple[Tuple[str, str], ...],
+    limit: Optional[int],
+    offset: Optional[int]
+) -> str:
+    """Cypher for a node query shape; values never affect the generated text."""
+    _check_identifier(label, "label")
+    for field, _ in condition_shape:
+        _check_identifier(field, "property")
+    _check_shape_fields(fields, order_by)
+    conditions = [{"field": field, "op": op, "value": None} for field, op in condition_shape]
+    return QueryCompiler()._build_node_query(
+        label, alias, conditions, list(fields), list(order_by), limit, offset
+    ).cypher
+
+
+@lru_cache(maxsize=1024)
+def _traversal_where(
+    condition_shape: Tuple[Tuple[str, str], ...],
+    from_alias: str,
+    rel_alias: str,
+    to_alias: str
+) -> str:
+    """
+    WHERE fragment for traversal conditions of the given shape.
+    
+    Shared by traversal and back() queries, so a back() over an already
+    compiled traversal reuses its fragment instead of formatting the
+    predicates again.
+    """
+    for field, _ in condition_shape:
+        _check_field(field)
+    conditions = [{"field": field, "op": op, "value": None} for field, op in condition_shape]
+    return QueryCompiler()._compile_traversal_where_clause(conditions, from_alias, rel_alias, to_alias)
+
+
+@lru_cache(maxsize=4096)
+def _traversal_query_template(
+    from_label: str,
+    from_alias: str,
+    rel_type: str,
+    rel_alias: str,
+    to_label: str,
+    to_alias: str,
+    direction: str,
+    condition_shape: Tuple[Tuple[str, str], ...],
+    fields: Tuple[str, ...],
+    order_by: Tuple[Tuple[str, str], ...],
+    limit: Optional[int],
+    offset: Optional[int],
+    back: bool
+) -> str:
+    """Cypher for a traversal (or, with ``back``, a back()) query shape."""
+    _check_identifier(from_label, "label")
+    _check_identifier(rel_type, "relationship type", optional=True)
+    _check_identifier(to_label, "label", optional=True)
+    _check_shape_fields(fields, order_by)
+    conditions = [{"field": field, "op": op, "value": None} for field, op in condition_shape]
+    build = QueryCompiler()._build_back_query if back else QueryCompiler()._build_traversal_query
+    return build(
+        from_label, from_alias, rel_type, rel_alias, to_label, to_alias, direction,
+        conditions, list(fields), list(order_by), limit, offset
+    ).cypher
+
+
+@lru_cache(maxsize=1024)
+def _parse_shape(keys: Tuple[str, ...]) -> Tuple[Tuple[str, str], ...]:
+    """Split filter kwarg names into (field, op) pairs, in the given order."""
+    return tuple(_parse_key(key) for key in keys)
+
+
+def _parse_key(key: str) -> Tuple[str, str]:
+    """Split one filter kwarg name into (field, op).
+    
+    Namespaced fields can be standard (from__prop, rel__prop, to__prop) or
+    use custom aliases (p__prop, r__prop, c__prop), optionally followed by
+    an operation suffix. The suffix is recognised by a set lookup on the
+    last ``__`` segment.
+    """
+    if "__" not in key:
+        # Simple equality
+        return key, "eq"
+    
+    parts = key.split("__")
+    op = parts[-1]
+    if op in _FILTER_OPS:
+        # field__op or namespace__prop__op
+        return key[:-len(op) - 2], op
+    if len(parts) == 2:
+        # Namespaced field without an operation
+        return key, "eq"
+    # field__op where op contains underscores
+    return parts[0], key[len(parts[0]) + 2:]
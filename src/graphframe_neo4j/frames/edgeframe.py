@@ -14,6 +14,8 @@ class EdgeFrame(BaseFrame):
         rel_type: Relationship type to query
     """
     
+    __slots__ = ("_alias", "_compiler", "_rel_type")
+    
     def __init__(self, graph: 'Graph', rel_type: str):
         super().__init__(graph, rel_type)
         self._rel_type = rel_type
@@ -70,7 +72,7 @@ class EdgeFrame(BaseFrame):
         """Upsert relationships (create or update)."""
         from ..write.writeplan import WritePlan
         # Use relationship_upsert operation type
-        return WritePlan(self._graph, "relationship_upsert", self._rel_type, data, src, dst, rel_key, kwargs)
+        return WritePlan(self._graph, "relationship_upsert", self._rel_type, data, src, dst, rel_key, **kwargs)
     
     def patch(self, **updates: Any) -> 'WritePlan':
         """Patch/update existing relationships."""
@@ -79,7 +81,7 @@ class EdgeFrame(BaseFrame):
         return WritePlan(
             self._graph, "relationship_update", self._rel_type, updates,
             where_kwargs={},
-            where_conditions=self._filters
+            where_conditions=list(self._filters)
         )
     
     def delete(self) -> 'WritePlan':
@@ -89,5 +91,5 @@ class EdgeFrame(BaseFrame):
         return WritePlan(
             self._graph, "relationship_delete", self._rel_type,
             where_kwargs={},
-            where_conditions=self._filters
+            where_conditions=list(self._filters)
         )
@@ -4,7 +4,7 @@ NodeFrame: DataFrame-like interface for querying Neo4j nodes.
 
 from typing import Any, Dict, List, Optional, Union, Tuple
 from .baseframe import BaseFrame
-from .compiler import QueryCompiler
+from .compiler import QueryCompiler, _parse_order_field
 
 class NodeFrame(BaseFrame):
     """
@@ -15,6 +15,8 @@ class NodeFrame(BaseFrame):
         label: Node label to query
     """
     
+    __slots__ = ("_alias", "_compiler", "_traversal_info")
+    
     def __init__(self, graph: 'Graph', label: str):
         super().__init__(graph, label)
         self._label = label
@@ -46,16 +48,8 @@ class NodeFrame(BaseFrame):
     
     def order_by(self, *fields: str) -> 'NodeFrame':
         """Order results by fields."""
-        for field in fields:
-            # Parse field[__desc] or field[__asc] syntax
-            direction = "ASC"
-            if field.endswith("__desc"):
-                field = field[:-6]
-                direction = "DESC"
-            elif field.endswith("__asc"):
-                field = field[:-5]
-            
-            self._order_by.append((field, direction))
+        # Parse field[__desc] or field[__asc] syntax
+        self._order_by.extend(map(_parse_order_field, fields))
         return self
     
     def to_records(self) -> List[Dict[str, Any]]:
@@ -121,179 +115,36 @@ class NodeFrame(BaseFrame):
         return WritePlan(
             self._graph, "patch", self._label, updates,
             where_kwargs={},
-            where_conditions=self._filters
+            where_conditions=list(self._filters)
         )
     
-    def inc(self, field: str, value: Union[int, float]) -> 'WritePlan':
-        """Increment a numeric field."""
-        from ..write.advanced import AdvancedUpdateCompiler
+    def _advanced(self, kind: str, field: str, *value: Any) -> 'WritePlan':
+        """Plan an advanced update of one property on the filtered nodes."""
         from ..write.writeplan import WritePlan
-        
-        compiler = AdvancedUpdateCompiler(self._graph)
-        compiled = compiler.compile_inc_update(
-            label=self._label,
-            field=field,
-            value=value,
-            where_conditions=self._filters
+        return WritePlan(
+            self._graph, kind, self._label, field, *value,
+            where_conditions=list(self._filters)
         )
-        
-        # Create a WritePlan that uses the pre-compiled advanced operation
-        class AdvancedWritePlan(WritePlan):
-            def __init__(self, graph, compiled_result):
-                self._graph = graph
-                self._operation_type = "advanced"
-                self._target = "unknown"
-                self._args = ()
-                self._kwargs = {}
-                self._upsert_compiler = None
-                self._compiled = compiled_result
-                self._stats = None
-                self._operation_type = "advanced"
-                self._target = "unknown"
-                
-            def compile(self):
-                return self._compiled
-                
-            def preview(self):
-                return self.compile()
-        
-        return AdvancedWritePlan(self._graph, compiled)
+    
+    def inc(self, field: str, value: Union[int, float]) -> 'WritePlan':
+        """Increment a numeric field."""
+        return self._advanced("inc", field, value)
     
     def unset(self, field: str) -> 'WritePlan':
         """Remove/unset a property."""
-        from ..write.advanced import AdvancedUpdateCompiler
-        from ..write.writeplan import WritePlan
-        
-        compiler = AdvancedUpdateCompiler(self._graph)
-        compiled = compiler.compile_unset_update(
-            label=self._label,
-            field=field,
-            where_conditions=self._filters
-        )
-        
-        # Create a WritePlan that uses the pre-compiled advanced operation
-        class AdvancedWritePlan(WritePlan):
-            def __init__(self, graph, compiled_result):
-                self._graph = graph
-                self._operation_type = "advanced"
-                self._target = "unknown"
-                self._args = ()
-                self._kwargs = {}
-                self._upsert_compiler = None
-                self._compiled = compiled_result
-                self._stats = None
-                self._operation_type = "advanced"
-                self._target = "unknown"
-                self._args = ()
-                self._kwargs = {}
-                self._upsert_compiler = None
-                
-            def compile(self):
-                return self._compiled
-                
-            def preview(self):
-                return self.compile()
-        
-        return AdvancedWritePlan(self._graph, compiled)
+        return self._advanced("unset", field)
     
     def list_append(self, field: str, value: Any) -> 'WritePlan':
         """Append a value to a list property."""
-        from ..write.advanced import AdvancedUpdateCompiler
-        from ..write.writeplan import WritePlan
-        
-        compiler = AdvancedUpdateCompiler(self._graph)
-        compiled = compiler.compile_list_append(
-            label=self._label,
-            field=field,
-            value=value,
-            where_conditions=self._filters
-        )
-        
-        # Create a WritePlan that uses the pre-compiled advanced operation
-        class AdvancedWritePlan(WritePlan):
-            def __init__(self, graph, compiled_result):
-                self._graph = graph
-                self._operation_type = "advanced"
-                self._target = "unknown"
-                self._args = ()
-                self._kwargs = {}
-                self._upsert_compiler = None
-                self._compiled = compiled_result
-                self._stats = None
-                
-            def compile(self):
-                return self._compiled
-                
-            def preview(self):
-                return self.compile()
-        
-        return AdvancedWritePlan(self._graph, compiled)
+        return self._advanced("list_append", field, value)
     
     def list_remove(self, field: str, value: Any) -> 'WritePlan':
         """Remove a value from a list property."""
-        from ..write.advanced import AdvancedUpdateCompiler
-        from ..write.writeplan import WritePlan
-        
-        compiler = AdvancedUpdateCompiler(self._graph)
-        compiled = compiler.compile_list_remove(
-            label=self._label,
-            field=field,
-            value=value,
-            where_conditions=self._filters
-        )
-        
-        # Create a WritePlan that uses the pre-compiled advanced operation
-        class AdvancedWritePlan(WritePlan):
-            def __init__(self, graph, compiled_result):
-                self._graph = graph
-                self._operation_type = "advanced"
-                self._target = "unknown"
-                self._args = ()
-                self._kwargs = {}
-                self._upsert_compiler = None
-                self._compiled = compiled_result
-                self._stats = None
-                
-            def compile(self):
-                return self._compiled
-                
-            def preview(self):
-                return self.compile()
-        
-        return AdvancedWritePlan(self._graph, compiled)
+        return self._advanced("list_remove", field, value)
     
     def map_merge(self, field: str, map_data: Dict[str, Any]) -> 'WritePlan':
         """Merge a dictionary into a map property."""
-        from ..write.advanced import AdvancedUpdateCompiler
-        from ..write.writeplan import WritePlan
-        
-        compiler = AdvancedUpdateCompiler(self._graph)
-        compiled = compiler.compile_map_merge(
-            label=self._label,
-            field=field,
-            map_data=map_data,
-            where_conditions=self._filters
-        )
-        
-        # Create a WritePlan that uses the pre-compiled advanced operation
-        class AdvancedWritePlan(WritePlan):
-            def __init__(self, graph, compiled_result):
-                self._graph = graph
-                self._operation_type = "advanced"
-                self._target = "unknown"
-                self._args = ()
-                self._kwargs = {}
-                self._upsert_compiler = None
-                self._compiled = compiled_result
-                self._stats = None
-                
-            def compile(self):
-                return self._compiled
-                
-            def preview(self):
-                return self.compile()
-        
-        return AdvancedWritePlan(self._graph, compiled)
+        return self._advanced("map_merge", field, map_data)
     
     def delete(self, detach: bool = False) -> 'WritePlan':
         """Delete nodes."""
@@ -302,6 +153,6 @@ class NodeFrame(BaseFrame):
         return WritePlan(
             self._graph, "delete", self._label,
             where_kwargs={},
-            where_conditions=self._filters,
+            where_conditions=list(self._filters),
             detach=detach
         )
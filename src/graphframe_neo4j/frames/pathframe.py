@@ -4,7 +4,7 @@ PathFrame: DataFrame-like interface for querying Neo4j paths.
 
 from typing import Any, Dict, List, Optional, Tuple
 from .baseframe import BaseFrame
-from .compiler import QueryCompiler
+from .compiler import QueryCompiler, _parse_order_field
 
 class PathFrame(BaseFrame):
     """
@@ -18,6 +18,17 @@ class PathFrame(BaseFrame):
         alias: Optional aliases for from/rel/to nodes
     """
     
+    __slots__ = (
+        "_compiler",
+        "_direction",
+        "_from_alias",
+        "_from_label",
+        "_rel_alias",
+        "_rel_type",
+        "_to_alias",
+        "_to_label",
+    )
+    
     def __init__(self, graph: 'Graph', rel_type: str, to_label: str, direction: str = "out", alias: Optional[Tuple[str, str, str]] = None, from_label: str = ""):
         super().__init__(graph, rel_type)
         self._rel_type = rel_type
@@ -41,16 +52,8 @@ class PathFrame(BaseFrame):
     
     def order_by(self, *fields: str) -> 'PathFrame':
         """Order results by fields."""
-        for field in fields:
-            # Parse field[__desc] or field[__asc] syntax
-            direction = "ASC"
-            if field.endswith("__desc"):
-                field = field[:-6]
-                direction = "DESC"
-            elif field.endswith("__asc"):
-                field = field[:-5]
-            
-            self._order_by.append((field, direction))
+        # Parse field[__desc] or field[__asc] syntax
+        self._order_by.extend(map(_parse_order_field, fields))
         return self
     
     def limit(self, limit: int) -> 'PathFrame':
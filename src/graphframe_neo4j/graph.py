@@ -2,17 +2,51 @@
 Core Graph class for connecting to Neo4j and managing sessions.
 """
 
-from typing import Optional, Tuple, Any, Dict, List
-from neo4j import GraphDatabase, Driver, Session
+import asyncio
+import importlib
+import sys
+import threading
+from contextlib import contextmanager
+from typing import TYPE_CHECKING, Optional, Tuple, Any, Dict, Iterable, Iterator, List
 from .util.errors import ConnectionError
 
-# Optional networkx integration
-try:
+# The neo4j driver package is imported when the first driver is created, so
+# building Graphs and compiling queries never pays for it
+if TYPE_CHECKING:
     import networkx as nx
-    HAS_NETWORKX = True
-except ImportError:
-    HAS_NETWORKX = False
-    nx = None
+    from neo4j import AsyncDriver, AsyncSession, Driver, Session, Transaction
+    from .frames.edgeframe import EdgeFrame
+    from .frames.nodeframe import NodeFrame
+    from .schema.manager import SchemaManager
+    from .write.upsert import UpsertCompiler
+    from .write.writeplan import WriteBatch, WritePlan
+
+
+# Sync drivers shared by Graphs with identical connection settings:
+# (uri, auth, driver kwargs) -> [driver, number of Graphs holding it]
+_DEFAULT_DRIVER_CACHE: Dict[Tuple[Any, ...], List[Any]] = {}
+_DRIVER_CACHE_LOCK = threading.Lock()
+
+
+def _driver_key(uri: str, auth: Any, kwargs: Dict[str, Any]) -> Optional[Tuple[Any, ...]]:
+    """Cache key for a driver configuration, or None if it is not hashable."""
+    if isinstance(auth, list):
+        # auth=["user", "password"] connects the same way as the tuple form
+        auth = tuple(auth)
+    key = (uri, auth, tuple(sorted(kwargs.items())))
+    try:
+        hash(key)
+    except TypeError:
+        return None
+    return key
+
+
+def _require(name: str) -> Any:
+    """Import an optional dependency on first use, reusing it once loaded."""
+    module = sys.modules.get(name)
+    if module is None:
+        module = importlib.import_module(name)
+    return module
 
 class Graph:
     """
@@ -22,17 +56,24 @@ class Graph:
         uri: Neo4j connection URI (e.g., "bolt://localhost:7687")
         auth: Tuple of (username, password)
         database: Database name (default: "neo4j")
-        **kwargs: Additional driver configuration
+        **kwargs: Additional driver configuration; ``rel_uniqueness_policy``
+            is taken out and kept on the Graph rather than passed to the driver
     """
     
     def __init__(self, uri: str, auth: Tuple[str, str], database: str = "neo4j", **kwargs: Any):
         self.uri = uri
         self.auth = auth
         self.database = database
+        # Relationship uniqueness policy: "require_rel_key", "single_edge_per_pair", or "allow_multiple"
+        self.rel_uniqueness_policy = kwargs.pop("rel_uniqueness_policy", "single_edge_per_pair")
         self.driver_kwargs = kwargs
         self._driver: Optional[Driver] = None
-        # Relationship uniqueness policy: "require_rel_key", "single_edge_per_pair", or "allow_multiple"
-        self.rel_uniqueness_policy = kwargs.get("rel_uniqueness_policy", "single_edge_per_pair")
+        self._driver_key: Optional[Tuple[Any, ...]] = None
+        self._async_driver: Optional[AsyncDriver] = None
+        # Event loop the async driver was created on (its connections belong to it)
+        self._async_loop: Optional[asyncio.AbstractEventLoop] = None
+        self._upsert_compiler: Optional[UpsertCompiler] = None
+        self._schema_manager: Optional[SchemaManager] = None
     
     @classmethod
     def connect(cls, uri: str, auth: Tuple[str, str], database: str = "neo4j", **kwargs: Any) -> 'Graph':
@@ -48,29 +89,129 @@ class Graph:
         """Context manager exit - close the driver."""
         self.close()
     
-    def _ensure_driver(self) -> Driver:
-        """Ensure we have a driver instance, creating one if needed."""
+    def _ensure_driver(self) -> 'Driver':
+        """
+        Ensure we have a driver instance, creating one if needed.
+        
+        Graphs with the same uri, auth and driver options share one driver
+        (the driver is thread-safe and expensive to create); it is closed
+        when the last of them is closed.
+        """
         if self._driver is None:
+            key = _driver_key(self.uri, self.auth, self.driver_kwargs)
+            with _DRIVER_CACHE_LOCK:
+                entry = _DEFAULT_DRIVER_CACHE.get(key) if key is not None else None
+                if entry is None:
+                    from neo4j import GraphDatabase
+                    try:
+                        driver = GraphDatabase.driver(
+                            self.uri, 
+                            auth=self.auth, 
+                            **self.driver_kwargs
+                        )
+                    except Exception as e:
+                        raise ConnectionError(f"Failed to connect to Neo4j at {self.uri}: {e}") from e
+                    entry = [driver, 0]
+                    if key is not None:
+                        _DEFAULT_DRIVER_CACHE[key] = entry
+                entry[1] += 1
+                self._driver = entry[0]
+                self._driver_key = key
+        return self._driver
+    
+    def session(self) -> 'Session':
+        """Create a new session."""
+        driver = self._ensure_driver()
+        return driver.session(database=self.database)
+    
+    def _ensure_async_driver(self) -> 'AsyncDriver':
+        """
+        Ensure we have an async driver for the running event loop.
+        
+        An AsyncDriver is bound to the loop it was created on, so a driver
+        left over from another loop (e.g. a previous ``asyncio.run()``) is
+        dropped and a new one created. Call ``close_async()`` before a loop
+        ends to release its connections cleanly.
+        """
+        loop = asyncio.get_running_loop()
+        if self._async_loop is not loop:
+            self._async_driver = None
+        if self._async_driver is None:
+            from neo4j import AsyncGraphDatabase
             try:
-                self._driver = GraphDatabase.driver(
-                    self.uri, 
-                    auth=self.auth, 
+                self._async_driver = AsyncGraphDatabase.driver(
+                    self.uri,
+                    auth=self.auth,
                     **self.driver_kwargs
                 )
             except Exception as e:
                 raise ConnectionError(f"Failed to connect to Neo4j at {self.uri}: {e}") from e
-        return self._driver
+            self._async_loop = loop
+        return self._async_driver
     
-    def session(self) -> Session:
-        """Create a new session."""
-        driver = self._ensure_driver()
+    def async_session(self) -> 'AsyncSession':
+        """Create a new async session."""
+        driver = self._ensure_async_driver()
         return driver.session(database=self.database)
     
+    @contextmanager
+    def write_session(self) -> Iterator['Transaction']:
+        """
+        Open one session and one explicit transaction for a group of writes.
+        
+        Pass the yielded transaction to ``WritePlan.commit(tx=...)``; it is
+        committed when the block exits normally and rolled back on error.
+        """
+        with self.session() as session, session.begin_transaction() as tx:
+            yield tx
+            tx.commit()
+    
+    @contextmanager
+    def batch(self) -> Iterator['WriteBatch']:
+        """
+        Collect WritePlans and commit them together when the block exits.
+        
+        Add plans with ``batch.add(plan)`` instead of calling
+        ``plan.commit()``; upserts of the same shape are merged into one
+        UNWIND and everything runs in a single transaction. Per-group stats
+        are available as ``batch.stats`` afterwards. Nothing is written if
+        the block raises.
+        """
+        from .write.writeplan import WriteBatch
+        batch = WriteBatch(self)
+        yield batch
+        batch.commit()
+    
     def close(self):
-        """Close the driver connection."""
-        if self._driver is not None:
-            self._driver.close()
-            self._driver = None
+        """Release the driver; it is closed once no other Graph shares it."""
+        if self._driver is None:
+            return
+        driver, self._driver = self._driver, None
+        with _DRIVER_CACHE_LOCK:
+            entry = _DEFAULT_DRIVER_CACHE.get(self._driver_key) if self._driver_key is not None else None
+            if entry is not None and entry[0] is driver:
+                entry[1] -= 1
+                if entry[1] > 0:
+                    return
+                del _DEFAULT_DRIVER_CACHE[self._driver_key]
+        driver.close()
+    
+    async def close_async(self):
+        """Close the async driver of the running loop (if any) and release the sync driver."""
+        driver, self._async_driver = self._async_driver, None
+        loop, self._async_loop = self._async_loop, None
+        # A driver from another loop cannot be awaited here; it is only dropped
+        if driver is not None and loop is asyncio.get_running_loop():
+            await driver.close()
+        self.close()
+    
+    @property
+    def upsert_compiler(self) -> 'UpsertCompiler':
+        """The write compiler shared by every WritePlan of this graph (created lazily)."""
+        if self._upsert_compiler is None:
+            from .write.upsert import UpsertCompiler
+            self._upsert_compiler = UpsertCompiler(self)
+        return self._upsert_compiler
     
     def nodes(self, label: str) -> 'NodeFrame':
         """Get a NodeFrame for querying nodes with the given label."""
@@ -83,9 +224,11 @@ class Graph:
         return EdgeFrame(self, rel_type)
     
     def schema(self) -> 'SchemaManager':
-        """Get the SchemaManager for this graph."""
-        from .schema.manager import SchemaManager
-        return SchemaManager(self)
+        """Get the SchemaManager for this graph (created once, then reused)."""
+        if self._schema_manager is None:
+            from .schema.manager import SchemaManager
+            self._schema_manager = SchemaManager(self)
+        return self._schema_manager
     
     def cypher(self, query: str, **params: Any) -> Any:
         """Execute raw Cypher query with parameters."""
@@ -96,6 +239,45 @@ class Graph:
         with self.session() as session:
             return session.execute_write(work)
 
+    def cypher_write(self, query: str, **params: Any) -> Any:
+        """
+        Execute a write-only Cypher query and return its summary counters.
+        
+        Unlike cypher(), no records are materialized; the result is consumed
+        and its ``SummaryCounters`` (nodes_created, properties_set, ...) returned.
+        """
+        def work(tx):  # type: ignore
+            return tx.run(query, **params).consume().counters
+        
+        with self.session() as session:
+            return session.execute_write(work)
+
+    async def cypher_write_async(self, query: str, **params: Any) -> Any:
+        """Async variant of cypher_write() using the driver's AsyncSession."""
+        async def work(tx):  # type: ignore
+            result = await tx.run(query, **params)
+            summary = await result.consume()
+            return summary.counters
+        
+        async with self.async_session() as session:
+            return await session.execute_write(work)
+    
+    async def commit_many(self, plans: Iterable['WritePlan'], concurrency: int = 16) -> List[Dict[str, Any]]:
+        """
+        Commit independent WritePlans concurrently.
+        
+        At most ``concurrency`` plans are in flight at once, each in its own
+        async session from the driver's pool. Returns the stats of each plan
+        in input order.
+        """
+        semaphore = asyncio.Semaphore(concurrency)
+        
+        async def run(plan: 'WritePlan') -> Dict[str, Any]:
+            async with semaphore:
+                return await plan.commit_async()
+        
+        return list(await asyncio.gather(*(run(plan) for plan in plans)))
+
     def to_networkx(
         self, 
         node_labels: Optional[List[str]] = None, 
@@ -118,10 +300,12 @@ class Graph:
         Raises:
             ImportError: If networkx is not installed
         """
-        if not HAS_NETWORKX:
+        try:
+            nx = _require("networkx")
+        except ImportError as exc:
             raise ImportError(
                 "networkx is required for to_networkx(). Install with: uv add networkx"
-            )
+            ) from exc
         
         # Create a new NetworkX graph
         graph = nx.Graph()
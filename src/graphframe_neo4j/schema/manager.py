@@ -2,8 +2,27 @@
 SchemaManager: Manage Neo4j schema (constraints, indexes).
 """
 
-from typing import Any, Dict, List, Union
+from typing import Any, Dict, Iterable, List, Union
 from ..graph import Graph
+from ..write.writeplan import WriteBatch, WritePlan
+
+
+class SchemaBatch(WriteBatch):
+    """
+    Several schema operations compiled and committed together.
+    
+    Obtained from ``SchemaManager.batch()``. ``compile()`` returns the DDL
+    statements joined by ``;``; ``commit()`` runs them one by one in a single
+    transaction (Bolt takes one statement per run), so the whole migration
+    needs one commit instead of one per statement.
+    """
+    
+    __slots__ = ()
+    
+    def compile(self) -> Dict[str, Any]:
+        """Compile the queued operations to one multi-statement DDL script."""
+        statements = [plan.compiled["cypher"] for plan in self._plans if not plan._skip]
+        return {"cypher": ";\n".join(statements), "params": {}}
 
 class SchemaManager:
     """
@@ -13,6 +32,8 @@ class SchemaManager:
         graph: Graph instance
     """
     
+    __slots__ = ("_graph",)
+    
     def __init__(self, graph: Graph):
         self._graph = graph
     
@@ -34,6 +55,13 @@ class SchemaManager:
         # TODO: Implement index creation
         return WritePlan(self._graph, "ensure_index", label, property, kwargs)
     
+    def batch(self, plans: Iterable[WritePlan] = ()) -> SchemaBatch:
+        """Collect schema operations to compile and commit together."""
+        batch = SchemaBatch(self._graph)
+        for plan in plans:
+            batch.add(plan)
+        return batch
+    
     def describe(self) -> Dict[str, Any]:
         """Describe current schema (constraints and indexes)."""
         # TODO: Implement schema description
@@ -2,7 +2,8 @@
 Type definitions and utilities for GraphFrame-Neo4j.
 """
 
-from typing import Any, Dict, List, TypeVar, Tuple
+from dataclasses import asdict, dataclass
+from typing import Any, Dict, List, Optional, TypeVar, Tuple, cast
 from enum import Enum
 
 # Basic types
@@ -23,8 +24,60 @@ FilterCondition = Tuple[str, FilterOp, Any]
 Direction = str  # "out", "in", "both"
 TraversalAlias = Tuple[str, str, str]  # (from_alias, rel_alias, to_alias)
 
+# Compiler output
+class CompiledQuery(dict):
+    """
+    A compiled query: a ``{"cypher": ..., "params": ...}`` dict that also
+    exposes both entries as attributes.
+    """
+    __slots__ = ()
+    
+    def __init__(self, cypher: str, params: QueryParams):
+        super().__init__(cypher=cypher, params=params)
+    
+    @property
+    def cypher(self) -> str:
+        return cast(str, self["cypher"])
+    
+    @property
+    def params(self) -> QueryParams:
+        return cast(QueryParams, self["params"])
+
+class CompiledPlan(CompiledQuery):
+    """
+    A compiled write: a CompiledQuery that may also carry planning ``stats``
+    (rows and batches of an upsert); the key is only present when given.
+    """
+    __slots__ = ()
+    
+    def __init__(self, cypher: str, params: QueryParams, stats: Optional[Dict[str, Any]] = None):
+        super().__init__(cypher, params)
+        if stats is not None:
+            self["stats"] = stats
+    
+    @property
+    def stats(self) -> Optional[Dict[str, Any]]:
+        return self.get("stats")
+
 # For write operations
-WriteStats = Dict[str, int]
+@dataclass(slots=True)
+class WriteStats:
+    """Counters reported by WritePlan.commit()."""
+    operation_type: str
+    target: str
+    nodes_created: int = 0
+    nodes_updated: int = 0
+    nodes_deleted: int = 0
+    relationships_created: int = 0
+    relationships_deleted: int = 0
+    properties_set: int = 0
+    rows_affected: Optional[int] = None  # None when the counters cannot tell
+    batches: int = 0
+    status: str = "committed"  # "skipped" for comment-only plans
+    
+    def as_dict(self) -> Dict[str, Any]:
+        """Return the counters as a plain dict (the shape commit() returns)."""
+        return asdict(self)
 
 class WriteOperationType(Enum):
     CREATE = "create"
@@ -2,20 +2,93 @@
 Advanced update operations for GraphFrame-Neo4j.
 """
 
+from functools import lru_cache
 from typing import Any, Dict, List, Optional, Union, Tuple
-from .upsert import UpsertCompiler
+from .upsert import _NULL_OPS, _where_bind, _where_template
 from ..util.errors import WriteError
-from ..frames.compiler import QueryCompiler
+from ..frames.compiler import _PARAM_POOL_SIZE, _check_identifier
+
+
+# Advanced update kind -> (value parameter prefix, SET/REMOVE clause template);
+# {field} is the property, {param} the value parameter name
+_ADVANCED_CLAUSES = {
+    "inc": ("inc", "SET n.{field} = coalesce(n.{field}, 0) + ${param}"),
+    "unset": (None, "REMOVE n.{field}"),
+    "list_append": ("list", "SET n.{field} = coalesce(n.{field}, []) + ${param}"),
+    "list_remove": ("list", "SET n.{field} = [x IN coalesce(n.{field}, []) WHERE x <> ${param}]"),
+    "map_merge": ("map", "SET n.{field} += ${param}"),
+}
+
+
+# Interned <prefix>_<i> value parameter names, like the where_<i> pool
+_VALUE_NAMES = {
+    prefix: tuple(f"{prefix}_{i}" for i in range(_PARAM_POOL_SIZE))
+    for prefix, _ in _ADVANCED_CLAUSES.values() if prefix is not None
+}
+
+
+def _value_param(kind: str, index: int) -> Optional[str]:
+    """Name of the value parameter that follows `index` WHERE parameters."""
+    prefix = _ADVANCED_CLAUSES[kind][0]
+    if prefix is None:
+        return None
+    return _VALUE_NAMES[prefix][index] if index < _PARAM_POOL_SIZE else f"{prefix}_{index}"
+
+
+@lru_cache(maxsize=1024)
+def _advanced_template(
+    kind: str,
+    label: str,
+    field: str,
+    where_shape: Tuple[Tuple[str, str], ...]
+) -> str:
+    """
+    Cypher for an advanced update shape.
+    
+    Like the upsert templates, the text only depends on the label, the
+    updated property and the WHERE fields and operators; values are bound
+    per call.
+    """
+    _check_identifier(label, "label", error=WriteError)
+    _check_identifier(field, "property", error=WriteError)
+    where_clause = _where_template("n", where_shape)
+    param = _value_param(kind, sum(op not in _NULL_OPS for _, op in where_shape))
+    update_clause = _ADVANCED_CLAUSES[kind][1].format(field=field, param=param)
+    
+    # One clause per line; an empty WHERE is left out
+    return "\n".join([clause for clause in (f"MATCH (n:{label})", where_clause, update_clause) if clause])
+
+
+def _compile_advanced(
+    kind: str,
+    label: str,
+    field: str,
+    value: Any,
+    where_conditions: Optional[List[Dict[str, Any]]]
+) -> Dict[str, Any]:
+    """Look up the template for the update shape and bind the WHERE and value parameters."""
+    where_shape, params = _where_bind(where_conditions)
+    # One where_<i> parameter per non-NULL predicate, so the value comes next
+    param = _value_param(kind, len(params))
+    if param is not None:
+        params[param] = value
+    
+    return {
+        "cypher": _advanced_template(kind, label, field, where_shape),
+        "params": params
+    }
 
 
 class AdvancedUpdateCompiler:
     """
     Compiles advanced update operations into Cypher queries.
+    
+    The compiler holds no state; ``graph`` is accepted for symmetry with
+    UpsertCompiler and is not used.
     """
     
     def __init__(self, graph: Optional[Any] = None):
-        self._compiler = QueryCompiler()
-        self._graph = graph
+        pass
     
     def compile_inc_update(
         self,
@@ -33,68 +106,7 @@ class AdvancedUpdateCompiler:
             value: Amount to increment by
             where_conditions: Conditions for which nodes to update
         """
-        # Build WHERE clause
-        where_clause = ""
-        params = {}
-        
-        if where_conditions:
-            where_parts = []
-            for condition in where_conditions:
-                field_name = condition.get("field", "")
-                op = condition.get("op", "eq")
-                cond_value = condition.get("value")
-                
-                if field_name:
-                    # Map operation
-                    op_mapping = {
-                        "eq": "=",
-                        "ne": "<>",
-                        "lt": "<",
-                        "lte": "<=",
-                        "gt": ">",
-                        "gte": ">=",
-                        "in": "IN",
-                        "not_in": "NOT IN",
-                        "contains": "CONTAINS",
-                        "startswith": "STARTS WITH",
-                        "endswith": "ENDS WITH",
-                        "regex": "=~",
-                        "exists": "IS NOT NULL",
-                        "is_null": "IS NULL",
-                        "not_null": "IS NOT NULL"
-                    }
-                    cypher_op = op_mapping.get(op, "=")
-                    
-                    if op in ("exists", "is_null", "not_null"):
-                        where_parts.append(f"n.{field_name} {cypher_op}")
-                    elif op in ("in", "not_in"):
-                        param_name = f"where_{len(where_parts)}"
-                        params[param_name] = cond_value
-                        where_parts.append(f"n.{field_name} {cypher_op} ${param_name}")
-                    else:
-                        param_name = f"where_{len(where_parts)}"
-                        params[param_name] = cond_value
-                        where_parts.append(f"n.{field_name} {cypher_op} ${param_name}")
-            
-            if where_parts:
-                where_clause = "WHERE " + " AND ".join(where_parts)
-        
-        # Build SET clause with coalesce for increment
-        inc_param = f"inc_{len(params)}"
-        params[inc_param] = value
-        set_clause = f"SET n.{field} = coalesce(n.{field}, 0) + ${inc_param}"
-        
-        # Build Cypher query
-        cypher = f"""
-        MATCH (n:{label})
-        {where_clause}
-        {set_clause}
-        """
-        
-        return {
-            "cypher": cypher.strip(),
-            "params": params
-        }
+        return _compile_advanced("inc", label, field, value, where_conditions)
     
     def compile_unset_update(
         self,
@@ -110,66 +122,7 @@ class AdvancedUpdateCompiler:
             field: Field to unset/remove
             where_conditions: Conditions for which nodes to update
         """
-        # Build WHERE clause
-        where_clause = ""
-        params = {}
-        
-        if where_conditions:
-            where_parts = []
-            for condition in where_conditions:
-                field_name = condition.get("field", "")
-                op = condition.get("op", "eq")
-                cond_value = condition.get("value")
-                
-                if field_name:
-                    # Map operation
-                    op_mapping = {
-                        "eq": "=",
-                        "ne": "<>",
-                        "lt": "<",
-                        "lte": "<=",
-                        "gt": ">",
-                        "gte": ">=",
-                        "in": "IN",
-                        "not_in": "NOT IN",
-                        "contains": "CONTAINS",
-                        "startswith": "STARTS WITH",
-                        "endswith": "ENDS WITH",
-                        "regex": "=~",
-                        "exists": "IS NOT NULL",
-                        "is_null": "IS NULL",
-                        "not_null": "IS NOT NULL"
-                    }
-                    cypher_op = op_mapping.get(op, "=")
-                    
-                    if op in ("exists", "is_null", "not_null"):
-                        where_parts.append(f"n.{field_name} {cypher_op}")
-                    elif op in ("in", "not_in"):
-                        param_name = f"where_{len(where_parts)}"
-                        params[param_name] = cond_value
-                        where_parts.append(f"n.{field_name} {cypher_op} ${param_name}")
-                    else:
-                        param_name = f"where_{len(where_parts)}"
-                        params[param_name] = cond_value
-                        where_parts.append(f"n.{field_name} {cypher_op} ${param_name}")
-            
-            if where_parts:
-                where_clause = "WHERE " + " AND ".join(where_parts)
-        
-        # Build REMOVE clause
-        remove_clause = f"REMOVE n.{field}"
-        
-        # Build Cypher query
-        cypher = f"""
-        MATCH (n:{label})
-        {where_clause}
-        {remove_clause}
-        """
-        
-        return {
-            "cypher": cypher.strip(),
-            "params": params
-        }
+        return _compile_advanced("unset", label, field, None, where_conditions)
     
     def compile_list_append(
         self,
@@ -187,68 +140,7 @@ class AdvancedUpdateCompiler:
             value: Value to append
             where_conditions: Conditions for which nodes to update
         """
-        # Build WHERE clause
-        where_clause = ""
-        params = {}
-        
-        if where_conditions:
-            where_parts = []
-            for condition in where_conditions:
-                field_name = condition.get("field", "")
-                op = condition.get("op", "eq")
-                cond_value = condition.get("value")
-                
-                if field_name:
-                    # Map operation
-                    op_mapping = {
-                        "eq": "=",
-                        "ne": "<>",
-                        "lt": "<",
-                        "lte": "<=",
-                        "gt": ">",
-                        "gte": ">=",
-                        "in": "IN",
-                        "not_in": "NOT IN",
-                        "contains": "CONTAINS",
-                        "startswith": "STARTS WITH",
-                        "endswith": "ENDS WITH",
-                        "regex": "=~",
-                        "exists": "IS NOT NULL",
-                        "is_null": "IS NULL",
-                        "not_null": "IS NOT NULL"
-                    }
-                    cypher_op = op_mapping.get(op, "=")
-                    
-                    if op in ("exists", "is_null", "not_null"):
-                        where_parts.append(f"n.{field_name} {cypher_op}")
-                    elif op in ("in", "not_in"):
-                        param_name = f"where_{len(where_parts)}"
-                        params[param_name] = cond_value
-                        where_parts.append(f"n.{field_name} {cypher_op} ${param_name}")
-                    else:
-                        param_name = f"where_{len(where_parts)}"
-                        params[param_name] = cond_value
-                        where_parts.append(f"n.{field_name} {cypher_op} ${param_name}")
-            
-            if where_parts:
-                where_clause = "WHERE " + " AND ".join(where_parts)
-        
-        # Build SET clause with list append
-        list_param = f"list_{len(params)}"
-        params[list_param] = value
-        set_clause = f"SET n.{field} = coalesce(n.{field}, []) + ${list_param}"
-        
-        # Build Cypher query
-        cypher = f"""
-        MATCH (n:{label})
-        {where_clause}
-        {set_clause}
-        """
-        
-        return {
-            "cypher": cypher.strip(),
-            "params": params
-        }
+        return _compile_advanced("list_append", label, field, value, where_conditions)
     
     def compile_list_remove(
         self,
@@ -266,68 +158,7 @@ class AdvancedUpdateCompiler:
             value: Value to remove
             where_conditions: Conditions for which nodes to update
         """
-        # Build WHERE clause
-        where_clause = ""
-        params = {}
-        
-        if where_conditions:
-            where_parts = []
-            for condition in where_conditions:
-                field_name = condition.get("field", "")
-                op = condition.get("op", "eq")
-                cond_value = condition.get("value")
-                
-                if field_name:
-                    # Map operation
-                    op_mapping = {
-                        "eq": "=",
-                        "ne": "<>",
-                        "lt": "<",
-                        "lte": "<=",
-                        "gt": ">",
-                        "gte": ">=",
-                        "in": "IN",
-                        "not_in": "NOT IN",
-                        "contains": "CONTAINS",
-                        "startswith": "STARTS WITH",
-                        "endswith": "ENDS WITH",
-                        "regex": "=~",
-                        "exists": "IS NOT NULL",
-                        "is_null": "IS NULL",
-                        "not_null": "IS NOT NULL"
-                    }
-                    cypher_op = op_mapping.get(op, "=")
-                    
-                    if op in ("exists", "is_null", "not_null"):
-                        where_parts.append(f"n.{field_name} {cypher_op}")
-                    elif op in ("in", "not_in"):
-                        param_name = f"where_{len(where_parts)}"
-                        params[param_name] = cond_value
-                        where_parts.append(f"n.{field_name} {cypher_op} ${param_name}")
-                    else:
-                        param_name = f"where_{len(where_parts)}"
-                        params[param_name] = cond_value
-                        where_parts.append(f"n.{field_name} {cypher_op} ${param_name}")
-            
-            if where_parts:
-                where_clause = "WHERE " + " AND ".join(where_parts)
-        
-        # Build SET clause with list remove
-        list_param = f"list_{len(params)}"
-        params[list_param] = value
-        set_clause = f"SET n.{field} = [x IN coalesce(n.{field}, []) WHERE x <> ${list_param}]"
-        
-        # Build Cypher query
-        cypher = f"""
-        MATCH (n:{label})
-        {where_clause}
-        {set_clause}
-        """
-        
-        return {
-            "cypher": cypher.strip(),
-            "params": params
-        }
+        return _compile_advanced("list_remove", label, field, value, where_conditions)
     
     def compile_map_merge(
         self,
@@ -345,65 +176,4 @@ class AdvancedUpdateCompiler:
             map_data: Dictionary to merge
             where_conditions: Conditions for which nodes to update
         """
-        # Build WHERE clause
-        where_clause = ""
-        params = {}
-        
-        if where_conditions:
-            where_parts = []
-            for condition in where_conditions:
-                field_name = condition.get("field", "")
-                op = condition.get("op", "eq")
-                cond_value = condition.get("value")
-                
-                if field_name:
-                    # Map operation
-                    op_mapping = {
-                        "eq": "=",
-                        "ne": "<>",
-                        "lt": "<",
-                        "lte": "<=",
-                        "gt": ">",
-                        "gte": ">=",
-                        "in": "IN",
-                        "not_in": "NOT IN",
-                        "contains": "CONTAINS",
-                        "startswith": "STARTS WITH",
-                        "endswith": "ENDS WITH",
-                        "regex": "=~",
-                        "exists": "IS NOT NULL",
-                        "is_null": "IS NULL",
-                        "not_null": "IS NOT NULL"
-                    }
-                    cypher_op = op_mapping.get(op, "=")
-                    
-                    if op in ("exists", "is_null", "not_null"):
-                        where_parts.append(f"n.{field_name} {cypher_op}")
-                    elif op in ("in", "not_in"):
-                        param_name = f"where_{len(where_parts)}"
-                        params[param_name] = cond_value
-                        where_parts.append(f"n.{field_name} {cypher_op} ${param_name}")
-                    else:
-                        param_name = f"where_{len(where_parts)}"
-                        params[param_name] = cond_value
-                        where_parts.append(f"n.{field_name} {cypher_op} ${param_name}")
-            
-            if where_parts:
-                where_clause = "WHERE " + " AND ".join(where_parts)
-        
-        # Build SET clause with map merge
-        map_param = f"map_{len(params)}"
-        params[map_param] = map_data
-        set_clause = f"SET n.{field} += ${map_param}"
-        
-        # Build Cypher query
-        cypher = f"""
-        MATCH (n:{label})
-        {where_clause}
-        {set_clause}
-        """
-        
-        return {
-            "cypher": cypher.strip(),
-            "params": params
-        }
+        return _compile_advanced("map_merge", label, field, map_data, where_conditions)
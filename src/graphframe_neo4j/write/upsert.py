@@ -2,11 +2,372 @@
 Upsert functionality for nodes and relationships.
 """
 
-from typing import Any, Dict, List, Optional, Union, Tuple
+from collections.abc import Mapping
+from functools import lru_cache
+from operator import itemgetter
+from typing import Any, Callable, Dict, List, Optional, Set, Union, Tuple
 from ..util.errors import WriteError
-from ..frames.compiler import QueryCompiler
+from ..frames.compiler import QueryCompiler, _PARAM_POOL_SIZE, _check_identifier, _param_names, _quote
 from ..graph import Graph
 
+
+# How a template reads one row: "aos" unwinds a list of row maps ($batch),
+# "soa" indexes into one list per column ($columns) sharing a row count
+_UNWIND_HEADERS = {
+    "aos": "UNWIND $batch AS item",
+    "soa": "UNWIND range(0, $count - 1) AS i",
+}
+_ROW_ACCESSORS = {
+    "aos": "item.{}",
+    "soa": "$columns.{}[i]",
+}
+
+
+# One SET line per property, by null policy ({a}: alias, {p}: property, {v}: row value).
+# Patch mode needs no lines of its own: it only changes the default policy.
+_SET_LINE_TEMPLATES = {
+    "ignore_nulls": "SET {a}.{p} = case when {v} IS NOT NULL then {v} else {a}.{p} end",
+    "set_nulls": "SET {a}.{p} = {v}",
+}
+
+
+def _set_lines(alias: str, set_properties: Tuple[str, ...], null_policy: str, row: Callable[[str], str]) -> str:
+    """SET lines of an upsert template; nulls are skipped under ignore_nulls."""
+    line = _SET_LINE_TEMPLATES.get(null_policy, _SET_LINE_TEMPLATES["set_nulls"]).format
+    quoted = map(_quote, set_properties)
+    return "\n        ".join([line(a=alias, p=prop, v=row(prop)) for prop in quoted])
+
+
+def _key_map(key: Tuple[str, ...], row: Callable[[str], str]) -> str:
+    """MERGE key map of an upsert template, e.g. ``email: item.email``."""
+    return ", ".join([f"{prop}: {row(prop)}" for prop in map(_quote, key)])
+
+
+def _node_upsert_template(
+    label: str,
+    key: Tuple[str, ...],
+    set_properties: Tuple[str, ...],
+    null_policy: str,
+    layout: str
+) -> str:
+    """Build the UNWIND/MERGE Cypher for a node upsert shape."""
+    _check_identifier(label, "label", error=WriteError)
+    row = _ROW_ACCESSORS[layout].format
+    # Build key properties access (use map projection syntax)
+    key_props = _key_map(key, row)
+    
+    # Build SET clause (use direct property access)
+    set_clause = _set_lines("n", set_properties, null_policy, row)
+    
+    # Build Cypher query
+    cypher = f"""
+        {_UNWIND_HEADERS[layout]}
+        MERGE (n:{label} {{{key_props}}})
+        {set_clause}
+        """
+    return cypher.strip()
+
+
+def _relationship_upsert_template(
+    rel_type: str,
+    src_label: str,
+    src_key: Tuple[str, ...],
+    dst_label: str,
+    dst_key: Tuple[str, ...],
+    rel_key: Tuple[str, ...],
+    set_properties: Tuple[str, ...],
+    null_policy: str,
+    layout: str
+) -> str:
+    """Build the UNWIND/MERGE Cypher for a relationship upsert shape."""
+    _check_identifier(rel_type, "relationship type", error=WriteError)
+    _check_identifier(src_label, "label", error=WriteError)
+    _check_identifier(dst_label, "label", error=WriteError)
+    row = _ROW_ACCESSORS[layout].format
+    # Build source and destination key properties (use map projection syntax)
+    src_key_props = _key_map(src_key, row)
+    dst_key_props = _key_map(dst_key, row)
+    
+    # Build relationship key if provided (use map projection syntax)
+    if rel_key:
+        rel_key_props = _key_map(rel_key, row)
+        rel_match = f"{{{rel_key_props}}}"
+    else:
+        rel_match = ""
+    
+    # Build SET clause
+    set_clause = _set_lines("r", set_properties, null_policy, row)
+    
+    # Build Cypher query
+    if rel_key:
+        cypher = f"""
+            {_UNWIND_HEADERS[layout]}
+            MERGE (a:{src_label} {{{src_key_props}}})
+            MERGE (b:{dst_label} {{{dst_key_props}}})
+            MERGE (a)-[r:{rel_type} {rel_match}]->(b)
+            {set_clause}
+            """
+    else:
+        cypher = f"""
+            {_UNWIND_HEADERS[layout]}
+            MERGE (a:{src_label} {{{src_key_props}}})
+            MERGE (b:{dst_label} {{{dst_key_props}}})
+            MERGE (a)-[r:{rel_type}]->(b)
+            {set_clause}
+            """
+    return cypher.strip()
+
+
+def _is_columnar(data: Any) -> bool:
+    """Whether data is a columnar batch (pyarrow RecordBatch/Table or alike)."""
+    return hasattr(data, "column_names") and hasattr(data, "to_pylist")
+
+
+def _empty_upsert(processed: str) -> Dict[str, Any]:
+    """Compiled result of an upsert with no rows: nothing to template or bind."""
+    return {"cypher": "// No data to upsert", "params": {}, "stats": {processed: 0, "batches": 0}}
+
+
+def _normalize_rows(
+    data: Any,
+    layout: str
+) -> Tuple[List[Dict[str, Any]], Optional[Dict[str, List[Any]]], int]:
+    """
+    Normalize upsert input to (rows, columns, row_count).
+    
+    Row input (a mapping, or an iterable of mappings such as a generator)
+    comes back as a list of rows. Columnar input (anything exposing
+    ``column_names``/``column()``/``to_pylist()``, such as a pyarrow
+    RecordBatch or Table) is read column by column for the "soa" layout, so
+    no per-row dicts are built (the rows come back empty), and as rows
+    otherwise.
+    """
+    if _is_columnar(data):
+        if layout == "soa":
+            columns = {name: data.column(name).to_pylist() for name in data.column_names}
+            return [], columns, data.num_rows
+        data = data.to_pylist()
+    elif isinstance(data, Mapping):
+        data = [data]
+    elif not isinstance(data, list):
+        data = list(data)
+    return data, None, len(data)
+
+
+def _layout_params(
+    data: List[Dict[str, Any]],
+    columns: Tuple[str, ...],
+    layout: str,
+    column_data: Optional[Dict[str, List[Any]]] = None,
+    row_count: int = 0
+) -> Dict[str, Any]:
+    """Bind upsert rows in the parameter layout the template expects."""
+    if column_data is not None:
+        # Already columnar: pass the value lists through
+        return {"columns": {column: column_data[column] for column in columns}, "count": row_count}
+    if layout == "soa":
+        # Transpose once: one list per column instead of one map per row
+        return {"columns": _column_builder(columns)(data), "count": len(data)}
+    return {"batch": data}
+
+
+@lru_cache(maxsize=2048)
+def _column_builder(columns: Tuple[str, ...]) -> Callable[[List[Dict[str, Any]]], Dict[str, List[Any]]]:
+    """
+    Return a row -> column transposer specialized for one column tuple.
+    
+    Each column is read with a prebuilt itemgetter mapped over the rows,
+    which runs in C; if any row is missing a column the transposer falls
+    back to .get() so absent values become None.
+    """
+    getters = tuple((column, itemgetter(column)) for column in columns)
+    
+    def build(data: List[Dict[str, Any]]) -> Dict[str, List[Any]]:
+        try:
+            return {column: list(map(getter, data)) for column, getter in getters}
+        except KeyError:
+            return {column: [item.get(column) for item in data] for column in columns}
+    
+    return build
+
+
+def _validate_key_fields(data: List[Dict[str, Any]], *sides: Tuple[str, List[str]]) -> None:
+    """
+    Raise WriteError for the first row missing a key field.
+    
+    Each row is checked with a single key-view superset test against all
+    required fields; rows are only walked field by field to build the error.
+    """
+    required: Set[str] = set().union(*(keys for _, keys in sides))
+    if all(item.keys() >= required for item in data):
+        return
+    for item in data:
+        for side, keys in sides:
+            for key_field in keys:
+                if key_field not in item:
+                    raise WriteError(f"{side} field '{key_field}' not found in data item: {item}")
+
+
+# WHERE operators for write operations; null checks take no parameter
+_WRITE_OP_MAPPING = {
+    "eq": "=",
+    "ne": "<>",
+    "lt": "<",
+    "lte": "<=",
+    "gt": ">",
+    "gte": ">=",
+    "in": "IN",
+    "not_in": "NOT IN",
+    "contains": "CONTAINS",
+    "startswith": "STARTS WITH",
+    "endswith": "ENDS WITH",
+    "regex": "=~",
+    "exists": "IS NOT NULL",
+    "is_null": "IS NULL",
+    "not_null": "IS NOT NULL"
+}
+_NULL_OPS = frozenset({"exists", "is_null", "not_null"})
+
+
+# Interned where_<i> names, like the param_<i> pool of the read compiler
+_WHERE_NAMES: Tuple[str, ...] = tuple(f"where_{i}" for i in range(_PARAM_POOL_SIZE))
+
+
+def _where_bind(
+    where_conditions: Optional[List[Dict[str, Any]]]
+) -> Tuple[Tuple[Tuple[str, str], ...], Dict[str, Any]]:
+    """
+    Split WHERE conditions into their shape and where_<i> parameters.
+    
+    One pass over the conditions yields both the (field, op) pairs that key
+    the template and the values, numbered the way _where_template numbers
+    its predicates. NULL checks keep their position but bind no value.
+    """
+    if not where_conditions:
+        return (), {}
+    shape: List[Tuple[str, str]] = []
+    params: Dict[str, Any] = {}
+    for condition in where_conditions:
+        field = condition.get("field", "")
+        if not field:
+            continue
+        op = condition.get("op", "eq")
+        if op not in _NULL_OPS:
+            index = len(shape)
+            name = _WHERE_NAMES[index] if index < _PARAM_POOL_SIZE else f"where_{index}"
+            params[name] = condition.get("value")
+        shape.append((field, op))
+    return tuple(shape), params
+
+
+def _where_template(alias: str, where_shape: Tuple[Tuple[str, str], ...]) -> str:
+    """
+    Build the WHERE clause for a where shape ("" when there is none).
+    
+    Shared by every write that filters (updates, deletes and the advanced
+    updates); predicate <i> binds $where_<i>, NULL checks take no parameter.
+    """
+    for field, _ in where_shape:
+        _check_identifier(field, "property", error=WriteError)
+    where_parts = [
+        f"{alias}.{field} {_WRITE_OP_MAPPING[op]}" if op in _NULL_OPS
+        else f"{alias}.{field} {_WRITE_OP_MAPPING.get(op, '=')} $where_{i}"
+        for i, (field, op) in enumerate(where_shape)
+    ]
+    
+    if where_parts:
+        return "WHERE " + " AND ".join(where_parts)
+    return ""
+
+
+def _set_params(updates: Dict[str, Any], null_policy: str) -> Tuple[Tuple[str, ...], Dict[str, Any]]:
+    """
+    Split updates into the SET property tuple and its param_<i> values.
+    
+    Under ignore_nulls, None values are dropped here, before the template is
+    looked up, so they neither reach the Cypher nor change the shape key;
+    the updates are only copied when there is a None to drop.
+    """
+    if null_policy == "ignore_nulls" and any(value is None for value in updates.values()):
+        updates = {prop: value for prop, value in updates.items() if value is not None}
+    params = dict(zip(_param_names(0, len(updates)), updates.values()))
+    return tuple(updates), params
+
+
+# MATCH clause of updates and deletes by alias: (what the name is, pattern)
+_MATCH_PATTERNS = {
+    "n": ("label", "MATCH (n:{})"),
+    "r": ("relationship type", "MATCH ()-[r:{}]->()"),
+}
+
+
+def _match_clause(name: str, alias: str) -> str:
+    """MATCH clause of an update or delete of the label (n) or relationship type (r) name."""
+    kind, pattern = _MATCH_PATTERNS[alias]
+    _check_identifier(name, kind, error=WriteError)
+    return pattern.format(name)
+
+
+def _update_template(
+    name: str,
+    alias: str,
+    set_properties: Tuple[str, ...],
+    where_shape: Tuple[Tuple[str, str], ...]
+) -> str:
+    """Build the MATCH/WHERE/SET Cypher for a node or relationship update shape."""
+    match = _match_clause(name, alias)
+    where_clause = _where_template(alias, where_shape)
+    for prop in set_properties:
+        _check_identifier(prop, "property", error=WriteError)
+    set_clause = "SET " + ", ".join(
+        [f"{alias}.{prop} = $param_{i}" for i, prop in enumerate(set_properties)]
+    )
+    
+    # One clause per line; an empty WHERE is left out
+    return "\n".join([clause for clause in (match, where_clause, set_clause) if clause])
+
+
+def _delete_template(
+    name: str,
+    alias: str,
+    delete_clause: str,
+    where_shape: Tuple[Tuple[str, str], ...]
+) -> str:
+    """Build the MATCH/WHERE/DELETE Cypher for a node or relationship delete shape."""
+    match = _match_clause(name, alias)
+    where_clause = _where_template(alias, where_shape)
+    
+    # One clause per line; an empty WHERE is left out
+    return "\n".join([clause for clause in (match, where_clause, delete_clause) if clause])
+
+
+# DELETE clause of node deletes, by detach flag
+_NODE_DELETE_CLAUSES = {True: "DETACH DELETE n", False: "DELETE n"}
+
+
+# Template builders by operation type; the first element of a shape signature
+_TEMPLATE_BUILDERS: Dict[str, Callable[..., str]] = {
+    "upsert": _node_upsert_template,
+    "relationship_upsert": _relationship_upsert_template,
+    "update": _update_template,
+    "delete": _delete_template,
+}
+
+
+@lru_cache(maxsize=2048)
+def _compile_shape(signature: Tuple[Any, ...]) -> str:
+    """
+    Return the Cypher template for a write shape.
+    
+    The Cypher only depends on the shape of the write (labels, key columns,
+    value columns, WHERE fields and operators and null policy),
+    never on the values, so writes that repeat a shape skip all string
+    formatting after the first call. Parameters are always bound per call.
+    """
+    operation_type, *shape = signature
+    return _TEMPLATE_BUILDERS[operation_type](*shape)
+
+
 class UpsertCompiler:
     """
     Compiles upsert operations into Cypher queries.
@@ -16,124 +377,126 @@ class UpsertCompiler:
         self._compiler = QueryCompiler()
         self._graph = graph
     
+    @staticmethod
+    def cache_info() -> Any:
+        """Return hit/miss statistics of the shared Cypher template cache."""
+        return _compile_shape.cache_info()
+    
     def compile_node_upsert(
         self,
         label: str,
-        data: Union[List[Dict[str, Any]], Dict[str, Any]],
+        data: Union[List[Dict[str, Any]], Dict[str, Any], Any],
         key: Union[str, List[str]],
         patch: bool = False,
         null_policy: str = "ignore_nulls",
-        batch_size: int = 1000
+        batch_size: int = 1000,
+        layout: str = "aos"
     ) -> Dict[str, Any]:
         """
         Compile a node upsert operation.
         
         Args:
             label: Node label
-            data: Data to upsert (list of dicts or single dict)
+            data: Data to upsert (list of dicts, single dict, or a columnar
+                batch such as a pyarrow RecordBatch/Table)
             key: Key field(s) for uniqueness
-            patch: Whether to patch existing nodes
+            patch: Whether to patch existing nodes (the Cypher only depends on
+                null_policy; WritePlan derives the default policy from it)
             null_policy: How to handle null values
             batch_size: Batch size for UNWIND
+            layout: "aos" to send a list of row maps, or "soa" to send one
+                list per column (no repeated keys on the wire)
         """
-        # Normalize data to list
-        if isinstance(data, dict):
-            data = [data]
+        if layout not in _UNWIND_HEADERS:
+            raise WriteError(f"Unknown upsert layout '{layout}', expected one of: {', '.join(_UNWIND_HEADERS)}")
+        
+        # An empty row list skips normalization, key checks and templating; an
+        # empty mapping is a (malformed) single row and still gets validated
+        if isinstance(data, list) and not data:
+            return _empty_upsert("nodes_processed")
+        
+        # Normalize data to rows (or columns for columnar input)
+        data, column_data, row_count = _normalize_rows(data, layout)
         
-        if not data:
-            return {"cypher": "// No data to upsert", "params": {}}
+        if not row_count:
+            return _empty_upsert("nodes_processed")
         
         # Normalize key to list
         if isinstance(key, str):
             key = [key]
         
-        # Validate key fields exist in data
-        for item in data:
+        if column_data is not None:
+            # Validate key columns exist
             for key_field in key:
-                if key_field not in item:
-                    raise WriteError(f"Key field '{key_field}' not found in data item: {item}")
-        
-        # Prepare parameters
-        params = {"batch": data}
-        
-        # Build key properties access (use map projection syntax)
-        key_props = ", ".join([f"{field}: item.{field}" for field in key])
-        
-        # Build property assignments
-        all_properties = set()
-        for item in data:
-            all_properties.update(item.keys())
+                if key_field not in column_data:
+                    raise WriteError(f"Key field '{key_field}' not found in data columns: {list(column_data)}")
+            all_properties: Set[str] = set(column_data)
+        else:
+            # Validate key fields exist in data
+            _validate_key_fields(data, ("Key", key))
+            
+            # Union of every row's keys, in one C-level pass
+            all_properties = set().union(*data)
         
         # Filter out key properties for SET clause and sort for consistent ordering
-        set_properties = sorted([prop for prop in all_properties if prop not in key])
-        
-        # Build SET clause based on null policy (use direct property access)
-        if patch:
-            # For patch operations, use CASE WHEN
-            set_clauses = []
-            for prop in set_properties:
-                if null_policy == "ignore_nulls":
-                    set_clauses.append(f"SET n.{prop} = case when item.{prop} IS NOT NULL then item.{prop} else n.{prop} end")
-                else:  # set_nulls
-                    set_clauses.append(f"SET n.{prop} = item.{prop}")
-            set_clause = "\n        ".join(set_clauses)
-        elif null_policy == "ignore_nulls":
-            # When ignoring nulls (but not patching), use CASE WHEN
-            set_clauses = []
-            for prop in set_properties:
-                set_clauses.append(f"SET n.{prop} = case when item.{prop} IS NOT NULL then item.{prop} else n.{prop} end")
-            set_clause = "\n        ".join(set_clauses)
-        else:
-            # For full upsert, set all non-key properties
-            set_clauses = [f"SET n.{prop} = item.{prop}" for prop in set_properties]
-            set_clause = "\n        ".join(set_clauses)
+        set_properties = tuple(sorted(all_properties.difference(key)))
         
-        # Build Cypher query
-        cypher = f"""
-        UNWIND $batch AS item
-        MERGE (n:{label} {{{key_props}}})
-        {set_clause}
-        """
+        # Cypher only depends on the shape of the write, so it is shared across calls
+        cypher = _compile_shape(("upsert", label, tuple(key), set_properties, null_policy, layout))
+        
+        # Prepare parameters
+        params = _layout_params(data, tuple(key) + set_properties, layout, column_data, row_count)
         
         return {
-            "cypher": cypher.strip(),
+            "cypher": cypher,
             "params": params,
             "stats": {
-                "nodes_processed": len(data),
-                "batches": (len(data) + batch_size - 1) // batch_size
+                "nodes_processed": row_count,
+                "batches": (row_count + batch_size - 1) // batch_size
             }
         }
     
     def compile_relationship_upsert(
         self,
         rel_type: str,
-        data: Union[List[Dict[str, Any]], Dict[str, Any]],
+        data: Union[List[Dict[str, Any]], Dict[str, Any], Any],
         src: Tuple[str, Union[str, List[str]]],
         dst: Tuple[str, Union[str, List[str]]],
         rel_key: Optional[Union[str, List[str]]] = None,
         patch: bool = False,
         null_policy: str = "ignore_nulls",
-        batch_size: int = 1000
+        batch_size: int = 1000,
+        layout: str = "aos"
     ) -> Dict[str, Any]:
         """
         Compile a relationship upsert operation.
         
         Args:
             rel_type: Relationship type
-            data: Relationship data to upsert
+            data: Relationship data to upsert (rows or a columnar batch)
             src: (label, key) for source nodes
             dst: (label, key) for destination nodes
             rel_key: Optional key for relationship uniqueness
-            patch: Whether to patch existing relationships
+            patch: Whether to patch existing relationships (the Cypher only
+                depends on null_policy)
             null_policy: How to handle null values
             batch_size: Batch size for UNWIND
+            layout: "aos" to send a list of row maps, or "soa" to send one
+                list per column (no repeated keys on the wire)
         """
-        # Normalize data to list
-        if isinstance(data, dict):
-            data = [data]
+        if layout not in _UNWIND_HEADERS:
+            raise WriteError(f"Unknown upsert layout '{layout}', expected one of: {', '.join(_UNWIND_HEADERS)}")
+        
+        # An empty row list skips normalization, key checks and templating; an
+        # empty mapping is a (malformed) single row and still gets validated
+        if isinstance(data, list) and not data:
+            return _empty_upsert("relationships_processed")
         
-        if not data:
-            return {"cypher": "// No data to upsert", "params": {}}
+        # Normalize data to rows (or columns for columnar input)
+        data, column_data, row_count = _normalize_rows(data, layout)
+        
+        if not row_count:
+            return _empty_upsert("relationships_processed")
         
         # Apply relationship uniqueness policy
         if not rel_key and self._graph:
@@ -157,89 +520,44 @@ class UpsertCompiler:
         if rel_key and isinstance(rel_key, str):
             rel_key = [rel_key]
         
-        # Validate required fields
-        for item in data:
-            # Check source key fields
-            for key_field in src_key:
-                if key_field not in item:
-                    raise WriteError(f"Source key field '{key_field}' not found in data item: {item}")
-            
-            # Check destination key fields
-            for key_field in dst_key:
-                if key_field not in item:
-                    raise WriteError(f"Destination key field '{key_field}' not found in data item: {item}")
-        
-        # Prepare parameters
-        params = {"batch": data}
-        
-        # Build source and destination key properties (use map projection syntax)
-        src_key_props = ", ".join([f"{field}: item.{field}" for field in src_key])
-        dst_key_props = ", ".join([f"{field}: item.{field}" for field in dst_key])
-        
-        # Build relationship key if provided (use map projection syntax)
-        if rel_key:
-            rel_key_props = ", ".join([f"{field}: item.{field}" for field in rel_key])
-            rel_match = f"{{{rel_key_props}}}"
-            rel_identifiers = ", ".join([f"item.{field}" for field in rel_key])
+        if column_data is not None:
+            # Validate required columns
+            for side, keys in (("Source", src_key), ("Destination", dst_key)):
+                for key_field in keys:
+                    if key_field not in column_data:
+                        raise WriteError(
+                            f"{side} key field '{key_field}' not found in data columns: {list(column_data)}"
+                        )
+            all_properties: Set[str] = set(column_data)
         else:
-            rel_match = ""
-            rel_identifiers = ""
-        
-        # Get all properties for SET clause
-        all_properties = set()
-        for item in data:
-            all_properties.update(item.keys())
+            # Validate required fields
+            _validate_key_fields(data, ("Source key", src_key), ("Destination key", dst_key))
+            
+            # Union of every row's keys, in one C-level pass
+            all_properties = set().union(*data)
         
         # Filter out key properties and sort for consistent ordering
-        key_properties = set(src_key + dst_key)
-        if rel_key:
-            key_properties.update(rel_key)
-        
-        set_properties = sorted([prop for prop in all_properties if prop not in key_properties])
-        
-        # Build SET clause
-        if patch:
-            set_clauses = []
-            for prop in set_properties:
-                if null_policy == "ignore_nulls":
-                    set_clauses.append(f"SET r.{prop} = case when item.{prop} IS NOT NULL then item.{prop} else r.{prop} end")
-                else:  # set_nulls
-                    set_clauses.append(f"SET r.{prop} = item.{prop}")
-            set_clause = "\n        ".join(set_clauses)
-        elif null_policy == "ignore_nulls":
-            # When ignoring nulls (but not patching), use CASE WHEN
-            set_clauses = []
-            for prop in set_properties:
-                set_clauses.append(f"SET r.{prop} = case when item.{prop} IS NOT NULL then item.{prop} else r.{prop} end")
-            set_clause = "\n        ".join(set_clauses)
-        else:
-            set_clauses = [f"SET r.{prop} = item.{prop}" for prop in set_properties]
-            set_clause = "\n        ".join(set_clauses)
+        set_properties = tuple(sorted(all_properties.difference(src_key, dst_key, rel_key or ())))
         
-        # Build Cypher query
-        if rel_key:
-            cypher = f"""
-            UNWIND $batch AS item
-            MERGE (a:{src_label} {{{src_key_props}}})
-            MERGE (b:{dst_label} {{{dst_key_props}}})
-            MERGE (a)-[r:{rel_type} {rel_match}]->(b)
-            {set_clause}
-            """
-        else:
-            cypher = f"""
-            UNWIND $batch AS item
-            MERGE (a:{src_label} {{{src_key_props}}})
-            MERGE (b:{dst_label} {{{dst_key_props}}})
-            MERGE (a)-[r:{rel_type}]->(b)
-            {set_clause}
-            """
+        # Cypher only depends on the shape of the write, so it is shared across calls
+        cypher = _compile_shape((
+            "relationship_upsert", rel_type,
+            src_label, tuple(src_key),
+            dst_label, tuple(dst_key),
+            tuple(rel_key or ()),
+            set_properties, null_policy, layout
+        ))
+        
+        # Prepare parameters
+        columns = tuple(dict.fromkeys([*src_key, *dst_key, *(rel_key or ())])) + set_properties
+        params = _layout_params(data, columns, layout, column_data, row_count)
         
         return {
-            "cypher": cypher.strip(),
+            "cypher": cypher,
             "params": params,
             "stats": {
-                "relationships_processed": len(data),
-                "batches": (len(data) + batch_size - 1) // batch_size
+                "relationships_processed": row_count,
+                "batches": (row_count + batch_size - 1) // batch_size
             }
         }
     
@@ -259,72 +577,17 @@ class UpsertCompiler:
             where_conditions: Conditions for which nodes to update
             null_policy: How to handle null values
         """
-        # Build SET clause
-        params = {}
-        if null_policy == "ignore_nulls":
-            set_clauses = []
-            for prop, value in updates.items():
-                if value is not None:
-                    param_name = f"param_{len(set_clauses)}"
-                    set_clauses.append(f"n.{prop} = ${param_name}")
-                    params[param_name] = value
-        else:
-            set_clauses = []
-            for prop, value in updates.items():
-                param_name = f"param_{len(set_clauses)}"
-                set_clauses.append(f"n.{prop} = ${param_name}")
-                params[param_name] = value
-        
-        set_clause = "SET " + ", ".join(set_clauses)
-        
-        # Build WHERE clause if conditions provided
-        where_clause = ""
-        if where_conditions:
-            where_parts = []
-            for condition in where_conditions:
-                field = condition.get("field", "")
-                op = condition.get("op", "eq")
-                value = condition.get("value")
-                
-                if field:
-                    # Map operation
-                    op_mapping = {
-                        "eq": "=",
-                        "ne": "<>",
-                        "lt": "<",
-                        "lte": "<=",
-                        "gt": ">",
-                        "gte": ">=",
-                        "in": "IN",
-                        "not_in": "NOT IN",
-                        "contains": "CONTAINS",
-                        "startswith": "STARTS WITH",
-                        "endswith": "ENDS WITH",
-                        "regex": "=~"
-                    }
-                    cypher_op = op_mapping.get(op, "=")
-                    
-                    if op in ("in", "not_in"):
-                        param_name = f"where_{len(where_parts)}"
-                        params[param_name] = value
-                        where_parts.append(f"n.{field} {cypher_op} ${param_name}")
-                    else:
-                        param_name = f"where_{len(where_parts)}"
-                        params[param_name] = value
-                        where_parts.append(f"n.{field} {cypher_op} ${param_name}")
-            
-            if where_parts:
-                where_clause = "WHERE " + " AND ".join(where_parts)
+        set_properties, params = _set_params(updates, null_policy)
+        where_shape, where_params = _where_bind(where_conditions)
+        params |= where_params
         
-        # Build Cypher query
-        cypher = f"""
-        MATCH (n:{label})
-        {where_clause}
-        {set_clause}
-        """
+        cypher = _compile_shape((
+            "update", label, "n",
+            set_properties, where_shape
+        ))
         
         return {
-            "cypher": cypher.strip(),
+            "cypher": cypher,
             "params": params
         }
     
@@ -344,77 +607,17 @@ class UpsertCompiler:
             where_conditions: Conditions for which relationships to update
             null_policy: How to handle null values
         """
-        # Build SET clause
-        params = {}
-        if null_policy == "ignore_nulls":
-            set_clauses = []
-            for prop, value in updates.items():
-                if value is not None:
-                    param_name = f"param_{len(set_clauses)}"
-                    set_clauses.append(f"r.{prop} = ${param_name}")
-                    params[param_name] = value
-        else:
-            set_clauses = []
-            for prop, value in updates.items():
-                param_name = f"param_{len(set_clauses)}"
-                set_clauses.append(f"r.{prop} = ${param_name}")
-                params[param_name] = value
-        
-        set_clause = "SET " + ", ".join(set_clauses)
-        
-        # Build WHERE clause if conditions provided
-        where_clause = ""
-        if where_conditions:
-            where_parts = []
-            for condition in where_conditions:
-                field = condition.get("field", "")
-                op = condition.get("op", "eq")
-                value = condition.get("value")
-                
-                if field:
-                    # Map operation
-                    op_mapping = {
-                        "eq": "=",
-                        "ne": "<>",
-                        "lt": "<",
-                        "lte": "<=",
-                        "gt": ">",
-                        "gte": ">=",
-                        "in": "IN",
-                        "not_in": "NOT IN",
-                        "contains": "CONTAINS",
-                        "startswith": "STARTS WITH",
-                        "endswith": "ENDS WITH",
-                        "regex": "=~",
-                        "exists": "IS NOT NULL",
-                        "is_null": "IS NULL",
-                        "not_null": "IS NOT NULL"
-                    }
-                    cypher_op = op_mapping.get(op, "=")
-                    
-                    if op in ("exists", "is_null", "not_null"):
-                        where_parts.append(f"r.{field} {cypher_op}")
-                    elif op in ("in", "not_in"):
-                        param_name = f"where_{len(where_parts)}"
-                        params[param_name] = value
-                        where_parts.append(f"r.{field} {cypher_op} ${param_name}")
-                    else:
-                        param_name = f"where_{len(where_parts)}"
-                        params[param_name] = value
-                        where_parts.append(f"r.{field} {cypher_op} ${param_name}")
-            
-            if where_parts:
-                where_clause = "WHERE " + " AND ".join(where_parts)
+        set_properties, params = _set_params(updates, null_policy)
+        where_shape, where_params = _where_bind(where_conditions)
+        params |= where_params
         
-        # Build Cypher query
-        cypher = f"""
-        MATCH ()-[r:{rel_type}]->()
-        {where_clause}
-        {set_clause}
-        """
+        cypher = _compile_shape((
+            "update", rel_type, "r",
+            set_properties, where_shape
+        ))
         
         return {
-            "cypher": cypher.strip(),
+            "cypher": cypher,
             "params": params
         }
     
@@ -430,61 +633,14 @@ class UpsertCompiler:
             rel_type: Relationship type
             where_conditions: Conditions for which relationships to delete
         """
-        # Build WHERE clause
-        where_clause = ""
-        params = {}
-        
-        if where_conditions:
-            where_parts = []
-            for condition in where_conditions:
-                field = condition.get("field", "")
-                op = condition.get("op", "eq")
-                value = condition.get("value")
-                
-                if field:
-                    # Map operation
-                    op_mapping = {
-                        "eq": "=",
-                        "ne": "<>",
-                        "lt": "<",
-                        "lte": "<=",
-                        "gt": ">",
-                        "gte": ">=",
-                        "in": "IN",
-                        "not_in": "NOT IN",
-                        "contains": "CONTAINS",
-                        "startswith": "STARTS WITH",
-                        "endswith": "ENDS WITH",
-                        "regex": "=~",
-                        "exists": "IS NOT NULL",
-                        "is_null": "IS NULL",
-                        "not_null": "IS NOT NULL"
-                    }
-                    cypher_op = op_mapping.get(op, "=")
-                    
-                    if op in ("exists", "is_null", "not_null"):
-                        where_parts.append(f"r.{field} {cypher_op}")
-                    elif op in ("in", "not_in"):
-                        param_name = f"where_{len(where_parts)}"
-                        params[param_name] = value
-                        where_parts.append(f"r.{field} {cypher_op} ${param_name}")
-                    else:
-                        param_name = f"where_{len(where_parts)}"
-                        params[param_name] = value
-                        where_parts.append(f"r.{field} {cypher_op} ${param_name}")
-            
-            if where_parts:
-                where_clause = "WHERE " + " AND ".join(where_parts)
-        
-        # Build Cypher query
-        cypher = f"""
-        MATCH ()-[r:{rel_type}]->()
-        {where_clause}
-        DELETE r
-        """
+        where_shape, params = _where_bind(where_conditions)
+        cypher = _compile_shape((
+            "delete", rel_type, "r",
+            "DELETE r", where_shape
+        ))
         
         return {
-            "cypher": cypher.strip(),
+            "cypher": cypher,
             "params": params
         }
     
@@ -502,63 +658,13 @@ class UpsertCompiler:
             where_conditions: Conditions for which nodes to delete
             detach: Whether to detach delete
         """
-        # Build WHERE clause
-        where_clause = ""
-        params = {}
-        
-        if where_conditions:
-            where_parts = []
-            for condition in where_conditions:
-                field = condition.get("field", "")
-                op = condition.get("op", "eq")
-                value = condition.get("value")
-                
-                if field:
-                    # Map operation
-                    op_mapping = {
-                        "eq": "=",
-                        "ne": "<>",
-                        "lt": "<",
-                        "lte": "<=",
-                        "gt": ">",
-                        "gte": ">=",
-                        "in": "IN",
-                        "not_in": "NOT IN",
-                        "contains": "CONTAINS",
-                        "startswith": "STARTS WITH",
-                        "endswith": "ENDS WITH",
-                        "regex": "=~",
-                        "exists": "IS NOT NULL",
-                        "is_null": "IS NULL",
-                        "not_null": "IS NOT NULL"
-                    }
-                    cypher_op = op_mapping.get(op, "=")
-                    
-                    if op in ("exists", "is_null", "not_null"):
-                        where_parts.append(f"n.{field} {cypher_op}")
-                    elif op in ("in", "not_in"):
-                        param_name = f"where_{len(where_parts)}"
-                        params[param_name] = value
-                        where_parts.append(f"n.{field} {cypher_op} ${param_name}")
-                    else:
-                        param_name = f"where_{len(where_parts)}"
-                        params[param_name] = value
-                        where_parts.append(f"n.{field} {cypher_op} ${param_name}")
-            
-            if where_parts:
-                where_clause = "WHERE " + " AND ".join(where_parts)
-        
-        # Build DELETE clause
-        delete_clause = "DETACH DELETE n" if detach else "DELETE n"
-        
-        # Build Cypher query
-        cypher = f"""
-        MATCH (n:{label})
-        {where_clause}
-        {delete_clause}
-        """
+        where_shape, params = _where_bind(where_conditions)
+        cypher = _compile_shape((
+            "delete", label, "n",
+            _NODE_DELETE_CLAUSES[bool(detach)], where_shape
+        ))
         
         return {
-            "cypher": cypher.strip(),
+            "cypher": cypher,
             "params": params
         }
@@ -2,11 +2,64 @@
 WritePlan: Represents a write operation that can be previewed and committed.
 """
 
-from typing import Any, Dict, Optional, Union, Tuple
+from contextlib import contextmanager
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Any, Dict, Iterator, List, Optional, Union, Tuple
 from ..graph import Graph
-from ..util.typing import WriteStats
+from ..util.typing import CompiledPlan, WriteStats
 from ..util.errors import WriteError
+from ..frames.compiler import _check_identifier, _quote, _unquote
 from .upsert import UpsertCompiler
+from .advanced import _ADVANCED_CLAUSES, _compile_advanced
+
+# Rows sent per transaction when committing UNWIND batches
+DEFAULT_BATCH_SIZE = 10_000
+
+# Stats returned for plans that compile to a comment and are skipped
+_SKIPPED_STATS = MappingProxyType(WriteStats(operation_type="", target="", rows_affected=0, status="skipped").as_dict())
+
+# Deletes affect one row per deleted entity; the counter that reports it, by operation
+_DELETED_ROWS = {"delete": "nodes_deleted", "relationship_delete": "relationships_deleted"}
+
+# Null policy when none is given, by patch mode: full upserts overwrite with
+# nulls, patches (and updates) keep the existing value
+_DEFAULT_NULL_POLICY = {False: "set_nulls", True: "ignore_nulls"}
+
+
+def _chunk_params(params: Dict[str, Any], batch_size: int) -> Tuple[List[Dict[str, Any]], Optional[int]]:
+    """
+    Split UNWIND parameters into per-transaction chunks of batch_size rows.
+    
+    Returns the chunks and the total row count, or None for writes that
+    are not row batches (those run as a single chunk). The compiled Cypher
+    is reused for every chunk; only the row parameter is swapped. A batch
+    that fits in one chunk is passed through without copying its rows.
+    """
+    rows = params.get("batch")
+    if isinstance(rows, list):
+        if len(rows) <= batch_size:
+            return [params], len(rows)
+        return [
+            {**params, "batch": rows[i:i + batch_size]}
+            for i in range(0, len(rows), batch_size)
+        ], len(rows)
+    
+    columns = params.get("columns")
+    if isinstance(columns, dict):
+        count = params["count"]
+        if count <= batch_size:
+            return [params], count
+        return [
+            {
+                **params,
+                "columns": {name: values[i:i + batch_size] for name, values in columns.items()},
+                "count": min(batch_size, count - i)
+            }
+            for i in range(0, count, batch_size)
+        ], count
+    
+    return [params], None
 
 class WritePlan:
     """
@@ -21,356 +74,180 @@ class WritePlan:
         **kwargs: Additional keyword arguments
     """
     
+    __slots__ = (
+        "_args",
+        "_compile",
+        "_compiled",
+        "_graph",
+        "_kwargs",
+        "_operation_type",
+        "_skip",
+        "_stats",
+        "_target",
+        "_upsert_compiler",
+        "_where_resolved"
+    )
+    
     def __init__(self, graph: Graph, operation_type: str, target: str, *args: Any, **kwargs: Any):
         self._graph = graph
         self._operation_type = operation_type
         self._target = target
         self._args = args
         self._kwargs = kwargs
-        self._compiled: Optional[Dict[str, Any]] = None
+        # _compiled stays unset until first access of the `compiled` property
+        self._skip = False
+        # The op's compile function is resolved once, so compiling needs no dispatch
+        self._compile = _OP_DISPATCH.get(operation_type, _compile_fallback)
+        if operation_type not in _KNOWN_OPS:
+            # Unknown operations compile to a comment and are never executed
+            self._compiled = CompiledPlan(**_compile_fallback(self))
+            self._skip = True
         self._stats: Optional[WriteStats] = None
-        self._upsert_compiler = UpsertCompiler(graph)
+        # Compilers are stateless, so plans of one graph share a single instance
+        self._upsert_compiler = graph.upsert_compiler if graph is not None else UpsertCompiler(graph)
+        self._where_resolved: Optional[List[Dict[str, Any]]] = None
     
     def __repr__(self) -> str:
         return f"<WritePlan {self._operation_type} {self._target}>"
     
-    def compile(self) -> Dict[str, Any]:
-        """Compile the write operation to Cypher and parameters."""
-        if self._compiled is None:
-            operation_type = self._operation_type
-            target = self._target
-            
-            if operation_type == "upsert":
-                # Node upsert: compile_node_upsert(label, data, key, **kwargs)
-                if len(self._args) >= 2:
-                    data = self._args[0]
-                    key = self._args[1]
-                    kwargs = self._kwargs
-                    patch = kwargs.get("patch", False)
-                    null_policy = kwargs.get("null_policy", "set_nulls" if not patch else "ignore_nulls")
-                    
-                    self._compiled = self._upsert_compiler.compile_node_upsert(
-                        label=target,
-                        data=data,
-                        key=key,
-                        patch=patch,
-                        null_policy=null_policy
-                    )
-                else:
-                    self._compiled = {
-                        "cypher": f"// Upsert {target} - insufficient arguments",
-                        "params": {}
-                    }
-            
-            elif operation_type == "relationship_upsert":
-                # Relationship upsert: compile_relationship_upsert(rel_type, data, src, dst, rel_key, **kwargs)
-                if len(self._args) >= 4:
-                    data = self._args[0]
-                    src = self._args[1]
-                    dst = self._args[2]
-                    rel_key = self._args[3] if len(self._args) > 3 else None
-                    kwargs = self._kwargs
-                    patch = kwargs.get("patch", False)
-                    null_policy = kwargs.get("null_policy", "set_nulls" if not patch else "ignore_nulls")
-                    
-                    self._compiled = self._upsert_compiler.compile_relationship_upsert(
-                        rel_type=target,
-                        data=data,
-                        src=src,
-                        dst=dst,
-                        rel_key=rel_key,
-                        patch=patch,
-                        null_policy=null_policy
-                    )
-                else:
-                    self._compiled = {
-                        "cypher": f"// Relationship upsert {target} - insufficient arguments",
-                        "params": {}
-                    }
-            
-            elif operation_type == "patch":
-                # Node patch: compile_node_update with patch semantics
-                if len(self._args) >= 1:
-                    updates = self._args[0]
-                    where_conditions = self._kwargs.get("where_conditions")
-                    null_policy = self._kwargs.get("null_policy", "ignore_nulls")
-                    
-                    # Parse where conditions if they're in kwargs format (only if where_kwargs is not empty)
-                    if "where_kwargs" in self._kwargs and self._kwargs["where_kwargs"]:
-                        where_kwargs = self._kwargs["where_kwargs"]
-                        where_conditions = self._upsert_compiler._compiler.parse_filter_kwargs(where_kwargs)
-                    
-                    # Ensure where_conditions is a list even if it's None
-                    if where_conditions is None:
-                        where_conditions = []
-                    
-                    self._compiled = self._upsert_compiler.compile_node_update(
-                        label=target,
-                        updates=updates,
-                        where_conditions=where_conditions,
-                        null_policy=null_policy
-                    )
-                else:
-                    self._compiled = {
-                        "cypher": f"// patch {target} - insufficient arguments",
-                        "params": {}
-                    }
-            elif operation_type == "update":
-                # Node update: compile_node_update(label, updates, where_conditions)
-                if len(self._args) >= 1:
-                    updates = self._args[0]
-                    where_conditions = self._kwargs.get("where_conditions")
-                    null_policy = self._kwargs.get("null_policy", "ignore_nulls")
-                    
-                    # Parse where conditions if they're in kwargs format (only if where_kwargs is not empty)
-                    if "where_kwargs" in self._kwargs and self._kwargs["where_kwargs"]:
-                        where_kwargs = self._kwargs["where_kwargs"]
-                        where_conditions = self._upsert_compiler._compiler.parse_filter_kwargs(where_kwargs)
-                    
-                    # Ensure where_conditions is a list even if it's None
-                    if where_conditions is None:
-                        where_conditions = []
-                    
-                    self._compiled = self._upsert_compiler.compile_node_update(
-                        label=target,
-                        updates=updates,
-                        where_conditions=where_conditions,
-                        null_policy=null_policy
-                    )
-                else:
-                    self._compiled = {
-                        "cypher": f"// Update {target} - insufficient arguments",
-                        "params": {}
-                    }
-            
-            elif operation_type == "relationship_update":
-                # Relationship update: compile_relationship_update(rel_type, updates, where_conditions)
-                if len(self._args) >= 1:
-                    updates = self._args[0]
-                    where_conditions = self._kwargs.get("where_conditions")
-                    null_policy = self._kwargs.get("null_policy", "ignore_nulls")
-                    
-                    # Parse where conditions if they're in kwargs format (only if where_kwargs is not empty)
-                    if "where_kwargs" in self._kwargs and self._kwargs["where_kwargs"]:
-                        where_kwargs = self._kwargs["where_kwargs"]
-                        where_conditions = self._upsert_compiler._compiler.parse_filter_kwargs(where_kwargs)
-                    
-                    self._compiled = self._upsert_compiler.compile_relationship_update(
-                        rel_type=target,
-                        updates=updates,
-                        where_conditions=where_conditions,
-                        null_policy=null_policy
-                    )
-                else:
-                    self._compiled = {
-                        "cypher": f"// Relationship update {target} - insufficient arguments",
-                        "params": {}
-                    }
-            elif operation_type == "relationship_delete":
-                # Relationship delete: compile_relationship_delete(rel_type, where_conditions)
-                where_conditions = self._kwargs.get("where_conditions")
-                
-                # Parse where conditions if they're in kwargs format (only if where_kwargs is not empty)
-                if "where_kwargs" in self._kwargs and self._kwargs["where_kwargs"]:
-                    where_kwargs = self._kwargs["where_kwargs"]
-                    where_conditions = self._upsert_compiler._compiler.parse_filter_kwargs(where_kwargs)
-                
-                self._compiled = self._upsert_compiler.compile_relationship_delete(
-                    rel_type=target,
-                    where_conditions=where_conditions
-                )
-            elif operation_type == "delete":
-                # Node delete: compile_node_delete(label, where_conditions, detach)
-                where_conditions = self._kwargs.get("where_conditions")
-                detach = self._kwargs.get("detach", False)
-                
-                # Parse where conditions if they're in kwargs format (only if where_kwargs is not empty)
-                if "where_kwargs" in self._kwargs and self._kwargs["where_kwargs"]:
-                    where_kwargs = self._kwargs["where_kwargs"]
-                    where_conditions = self._upsert_compiler._compiler.parse_filter_kwargs(where_kwargs)
-                
-                self._compiled = self._upsert_compiler.compile_node_delete(
-                    label=target,
-                    where_conditions=where_conditions,
-                    detach=detach
-                )
-            
-            elif operation_type == "ensure_unique":
-                # Ensure unique constraint: CREATE CONSTRAINT IF NOT EXISTS
-                if len(self._args) >= 1:
-                    property = self._args[0]
-                    label = target  # target is the label
-                    
-                    cypher = f"""
-                    CREATE CONSTRAINT IF NOT EXISTS constraint_{label}_{property} 
-                    FOR (n:{label}) REQUIRE n.{property} IS UNIQUE
-                    """
-                    
-                    self._compiled = {
-                        "cypher": cypher.strip(),
-                        "params": {}
-                    }
-                else:
-                    self._compiled = {
-                        "cypher": f"// ensure_unique {target} - insufficient arguments",
-                        "params": {}
-                    }
-            elif operation_type == "ensure_node_key":
-                # Ensure node key constraint: CREATE CONSTRAINT IF NOT EXISTS
-                if len(self._args) >= 1:
-                    properties = self._args[0]
-                    label = target  # target is the label
-                    
-                    # Normalize properties to list
-                    if isinstance(properties, str):
-                        properties = [properties]
-                    
-                    # Create constraint name
-                    prop_list = "_".join(properties)
-                    constraint_name = f"constraint_{label}_{prop_list}"
-                    
-                    # Build Cypher
-                    prop_list_cypher = ", ".join([f"n.{prop}" for prop in properties])
-                    cypher = f"""
-                    CREATE CONSTRAINT IF NOT EXISTS {constraint_name} 
-                    FOR (n:{label}) REQUIRE ({prop_list_cypher}) IS NODE KEY
-                    """
-                    
-                    self._compiled = {
-                        "cypher": cypher.strip(),
-                        "params": {}
-                    }
-                else:
-                    self._compiled = {
-                        "cypher": f"// ensure_node_key {target} - insufficient arguments",
-                        "params": {}
-                    }
-            elif operation_type == "ensure_index":
-                # Ensure index: CREATE INDEX IF NOT EXISTS
-                if len(self._args) >= 1:
-                    property = self._args[0]
-                    kwargs = self._args[1] if len(self._args) > 1 else {}
-                    label = target  # target is the label
-                    
-                    # Build index name
-                    index_name = f"index_{label}_{property}"
-                    
-                    cypher = f"""
-                    CREATE INDEX IF NOT EXISTS {index_name} 
-                    FOR (n:{label}) ON (n.{property})
-                    """
-                    
-                    self._compiled = {
-                        "cypher": cypher.strip(),
-                        "params": {}
-                    }
-                else:
-                    self._compiled = {
-                        "cypher": f"// ensure_index {target} - insufficient arguments",
-                        "params": {}
-                    }
-            elif operation_type == "drop_unique":
-                # Drop unique constraint: DROP CONSTRAINT IF EXISTS
-                if len(self._args) >= 1:
-                    property = self._args[0]
-                    label = target  # target is the label
-                    
-                    constraint_name = f"constraint_{label}_{property}"
-                    
-                    cypher = f"""
-                    DROP CONSTRAINT IF EXISTS {constraint_name}
-                    """
-                    
-                    self._compiled = {
-                        "cypher": cypher.strip(),
-                        "params": {}
-                    }
-                else:
-                    self._compiled = {
-                        "cypher": f"// drop_unique {target} - insufficient arguments",
-                        "params": {}
-                    }
-            elif operation_type == "drop_index":
-                # Drop index: DROP INDEX IF EXISTS
-                if len(self._args) >= 1:
-                    property = self._args[0]
-                    label = target  # target is the label
-                    
-                    index_name = f"index_{label}_{property}"
-                    
-                    cypher = f"""
-                    DROP INDEX IF EXISTS {index_name}
-                    """
-                    
-                    self._compiled = {
-                        "cypher": cypher.strip(),
-                        "params": {}
-                    }
-                else:
-                    self._compiled = {
-                        "cypher": f"// drop_index {target} - insufficient arguments",
-                        "params": {}
-                    }
-            else:
-                # Fallback for other operation types
-                self._compiled = {
-                    "cypher": f"// {operation_type} {target}",
-                    "params": {}
-                }
+    @staticmethod
+    def cache_info() -> Any:
+        """Return hit/miss statistics of the compiled Cypher template cache."""
+        return UpsertCompiler.cache_info()
+    
+    def _resolve_where(self) -> List[Dict[str, Any]]:
+        """
+        Resolve the plan's WHERE conditions once.
         
-        return self._compiled
+        Keyword filters (``where_kwargs``) take precedence over prebuilt
+        ``where_conditions``; the parsed list is cached on the plan.
+        """
+        if self._where_resolved is None:
+            kwargs = self._kwargs
+            where_conditions = kwargs.get("where_conditions")
+            where_kwargs = kwargs.get("where_kwargs")
+            if where_kwargs:
+                where_conditions = self._upsert_compiler._compiler.parse_filter_kwargs(where_kwargs)
+            self._where_resolved = where_conditions or []
+        return self._where_resolved
+    
+    def _resolve_policy(self, patch: bool) -> str:
+        """Return the explicit null_policy, or the default for the patch mode."""
+        return self._kwargs.get("null_policy") or _DEFAULT_NULL_POLICY[patch]
+    
+    @property
+    def compiled(self) -> CompiledPlan:
+        """
+        The compiled Cypher and parameters, computed on first access.
+        
+        The result is stored in the ``_compiled`` slot; until then reading the
+        slot raises AttributeError, so later accesses need no None check.
+        """
+        try:
+            return self._compiled
+        except AttributeError:
+            compiled = self._compiled = CompiledPlan(**self._compile(self))
+            # Comment-only results (missing arguments, no data) never execute
+            self._skip = compiled["cypher"].startswith("//")
+            return compiled
     
-    def preview(self) -> Dict[str, Any]:
+    def compile(self) -> CompiledPlan:
+        """Compile the write operation to Cypher and parameters."""
+        return self.compiled
+    
+    def preview(self) -> CompiledPlan:
         """Preview what would be executed (same as compile for now)."""
-        return self.compile()
+        return self.compiled
     
-    def commit(self) -> WriteStats:
-        """Execute the write operation and return statistics."""
-        self.compile()  # Ensure compilation happens
+    def _batch_size(self, batch_size: Optional[int] = None) -> int:
+        """Return the rows per chunk: ``batch_size``, else the plan's keyword, else DEFAULT_BATCH_SIZE."""
+        if batch_size is None:
+            batch_size = self._kwargs.get("batch_size", DEFAULT_BATCH_SIZE)
+        if batch_size <= 0:
+            raise WriteError(f"batch_size must be positive, got {batch_size}")
+        return batch_size
+    
+    def _prepare_commit(
+        self,
+        batch_size: Optional[int]
+    ) -> Optional[Tuple[str, List[Dict[str, Any]], Optional[int]]]:
+        """
+        Validate a commit and split it into (cypher, chunks, row count).
         
-        if self._compiled is None:
-            raise WriteError("WritePlan has not been compiled successfully")
+        Returns None for plans that compiled to a comment and are skipped.
+        """
+        compiled = self.compiled
         
         if not self._graph:
             raise WriteError("WritePlan is not associated with a Graph instance")
         
-        try:
-            # Execute the compiled Cypher query
-            cypher = self._compiled["cypher"]
-            params = self._compiled["params"]
-            
-            # Skip execution for comment-like queries (test/unsupported operations)
-            if cypher.strip().startswith("//"):
-                self._stats = {
-                    "nodes_created": 0,
-                    "nodes_updated": 0,
-                    "relationships_created": 0,
-                    "rows_affected": 0,
-                    "operation_type": self._operation_type,
-                    "target": self._target,
-                    "status": "skipped"  # Mark as skipped for test/unsupported operations
-                }
-                return self._stats
-            
-            # Use the graph's cypher method to execute the write operation
-            result = self._graph.cypher(cypher, **params)
-            
-            # Parse statistics from the result
-            # For now, return basic statistics - this will be enhanced with actual Neo4j summary counters
-            self._stats = {
-                "nodes_created": len(result) if result else 0,
-                "nodes_updated": 0,  # Will be enhanced with actual counters
-                "relationships_created": 0,  # Will be enhanced with actual counters
-                "rows_affected": len(result) if result else 0,
-                "operation_type": self._operation_type,
-                "target": self._target
-            }
-            
-            return self._stats
-            
-        except Exception as e:
-            # Wrap any execution errors with our custom exception
-            raise WriteError(f"Failed to execute write operation: {str(e)}") from e
+        # Skip execution for comment-like queries (test/unsupported operations)
+        if self._skip:
+            return None
+        
+        # Slice UNWIND batches into chunks; other writes run as a single chunk
+        chunks, rows = _chunk_params(compiled["params"], self._batch_size(batch_size))
+        return compiled["cypher"], chunks, rows
+    
+    def _skipped_stats(self) -> Dict[str, Any]:
+        """Stats for a plan that compiled to a comment and is not executed."""
+        stats = {**_SKIPPED_STATS, "operation_type": self._operation_type, "target": self._target}
+        self._stats = WriteStats(**stats)
+        return stats
+    
+    def _finish_commit(self, counters: List[Any], rows: Optional[int], batches: int) -> Dict[str, Any]:
+        """Build the stats from the chunks' summary counters, store them and return them as a dict."""
+        nodes_processed = self.compiled.get("stats", {}).get("nodes_processed", 0)
+        stats = self._stats = _write_stats(
+            self._operation_type, self._target, counters, nodes_processed, rows, batches
+        )
+        return stats.as_dict()
+    
+    def commit(self, batch_size: Optional[int] = None, tx: Optional[Any] = None) -> Dict[str, Any]:
+        """
+        Execute the write operation and return statistics.
+        
+        UNWIND batches are sliced into chunks of ``batch_size`` rows, each
+        committed in its own transaction, so very large upserts do not hold
+        the whole batch in one server-side transaction. Defaults to the
+        plan's ``batch_size`` keyword or DEFAULT_BATCH_SIZE.
+        
+        If ``tx`` is given (e.g. from ``Graph.write_session()``), all chunks
+        run inside that transaction and committing it is left to the caller.
+        """
+        prepared = self._prepare_commit(batch_size)
+        if prepared is None:
+            return self._skipped_stats()
+        cypher, chunks, rows = prepared
+        
+        # Run each chunk in its own transaction (or the caller's) and collect the summary counters
+        with _write_errors():
+            if tx is not None:
+                counters = [tx.run(cypher, **chunk).consume().counters for chunk in chunks]
+            else:
+                counters = [self._graph.cypher_write(cypher, **chunk) for chunk in chunks]
+        
+        return self._finish_commit(counters, rows, len(chunks))
+    
+    async def commit_async(self, batch_size: Optional[int] = None, tx: Optional[Any] = None) -> Dict[str, Any]:
+        """
+        Async variant of commit() running on the driver's AsyncSession.
+        
+        ``tx`` may be an ``AsyncTransaction`` to run inside; see
+        ``Graph.commit_many()`` for committing independent plans concurrently.
+        """
+        prepared = self._prepare_commit(batch_size)
+        if prepared is None:
+            return self._skipped_stats()
+        cypher, chunks, rows = prepared
+        
+        with _write_errors():
+            if tx is not None:
+                counters = [(await (await tx.run(cypher, **chunk)).consume()).counters for chunk in chunks]
+            else:
+                counters = [await self._graph.cypher_write_async(cypher, **chunk) for chunk in chunks]
+        
+        return self._finish_commit(counters, rows, len(chunks))
     
     def explain(self) -> Dict[str, Any]:
         """Get execution plan (best effort)."""
@@ -381,3 +258,333 @@ class WritePlan:
         """Get profiling information (best effort)."""
         # TODO: Implement profile functionality
         return {"profile": "Not implemented yet"}
+
+
+class WriteBatch:
+    """
+    Collects WritePlans and commits them together in one transaction.
+    
+    Obtained from ``Graph.batch()``. Row-batch plans (UNWIND over
+    ``$batch``) that compiled to the same Cypher and share a ``batch_size``
+    are merged and sent as one UNWIND, chunked by that size; every other
+    plan runs as is. All of them share a single transaction, so the batch
+    commits or rolls back as a whole. The queue is emptied either way.
+    """
+    
+    __slots__ = ("_graph", "_plans", "stats")
+    
+    def __init__(self, graph: Graph):
+        self._graph = graph
+        self._plans: List[WritePlan] = []
+        # Stats of each executed group, in the order the groups were first added
+        self.stats: List[Dict[str, Any]] = []
+    
+    def __len__(self) -> int:
+        return len(self._plans)
+    
+    def add(self, plan: WritePlan) -> WritePlan:
+        """Queue a plan for the batch commit and return it."""
+        self._plans.append(plan)
+        return plan
+    
+    def _groups(self) -> List[List[WritePlan]]:
+        """Queued plans, with mergeable row-batch plans grouped by their Cypher and batch size."""
+        groups: Dict[Any, List[WritePlan]] = {}
+        for plan in self._plans:
+            compiled = plan.compiled
+            params = compiled["params"]
+            if not plan._skip and len(params) == 1 and isinstance(params.get("batch"), list):
+                key: Any = (compiled["cypher"], plan._batch_size())
+            else:
+                key = id(plan)
+            groups.setdefault(key, []).append(plan)
+        return list(groups.values())
+    
+    def commit(self) -> List[Dict[str, Any]]:
+        """
+        Run every queued plan in one write transaction and return the stats per group.
+        
+        Each plan of a merged group gets the stats of the whole group, since
+        the server reports its counters per statement, not per plan.
+        """
+        results = []
+        try:
+            groups = self._groups()
+            with self._graph.write_session() as tx:
+                for plans in groups:
+                    first = plans[0]
+                    if len(plans) == 1:
+                        results.append(first.commit(tx=tx))
+                        continue
+                    
+                    rows = [row for plan in plans for row in plan.compiled["params"]["batch"]]
+                    chunks, _ = _chunk_params({"batch": rows}, first._batch_size())
+                    with _write_errors():
+                        counters = [
+                            tx.run(first.compiled["cypher"], **chunk_params).consume().counters
+                            for chunk_params in chunks
+                        ]
+                    
+                    nodes_processed = sum(plan.compiled.get("stats", {}).get("nodes_processed", 0) for plan in plans)
+                    stats = _write_stats(
+                        first._operation_type, first._target, counters, nodes_processed, len(rows), len(chunks)
+                    )
+                    for plan in plans:
+                        plan._stats = stats
+                    results.append(stats.as_dict())
+        finally:
+            # A failed batch is rolled back as a whole, so its plans are dropped too
+            self._plans = []
+        
+        self.stats = results
+        return results
+
+
+@contextmanager
+def _write_errors() -> Iterator[None]:
+    """Wrap any error raised while executing a write in a WriteError."""
+    try:
+        yield
+    except Exception as e:
+        raise WriteError(f"Failed to execute write operation: {str(e)}") from e
+
+
+def _write_stats(
+    operation_type: str,
+    target: str,
+    counters: List[Any],
+    nodes_processed: int,
+    rows: Optional[int],
+    batches: int
+) -> WriteStats:
+    """
+    Build the WriteStats of one executed write from its summary counters.
+    
+    ``counters`` holds the driver's SummaryCounters of every chunk that ran;
+    ``nodes_processed`` is the number of upserted rows (rows that did not
+    create a node matched an existing one and count as updated) and
+    ``rows`` the UNWIND row count, or None for writes that are not row batches.
+    
+    Without a row count, deletes report their deleted entities as affected
+    rows; for other writes (patches, advanced updates, DDL) the counters do
+    not tell how many rows matched, so rows_affected stays None.
+    """
+    stats = WriteStats(operation_type=operation_type, target=target, batches=batches)
+    for chunk in counters:
+        stats.nodes_created += chunk.nodes_created
+        stats.nodes_deleted += chunk.nodes_deleted
+        stats.relationships_created += chunk.relationships_created
+        stats.relationships_deleted += chunk.relationships_deleted
+        stats.properties_set += chunk.properties_set
+    
+    stats.nodes_updated = max(nodes_processed - stats.nodes_created, 0)
+    if rows is None and operation_type in _DELETED_ROWS:
+        rows = getattr(stats, _DELETED_ROWS[operation_type])
+    stats.rows_affected = rows
+    return stats
+
+
+def _compile_upsert(plan: WritePlan) -> Dict[str, Any]:
+    """Node upsert: compile_node_upsert(label, data, key, **kwargs)."""
+    args, kwargs, target = plan._args, plan._kwargs, plan._target
+    if len(args) < 2:
+        return {"cypher": f"// Upsert {target} - insufficient arguments", "params": {}}
+    
+    data, key = args[0], args[1]
+    patch = bool(kwargs.get("patch", False))
+    null_policy = plan._resolve_policy(patch)
+    
+    return plan._upsert_compiler.compile_node_upsert(
+        label=target,
+        data=data,
+        key=key,
+        patch=patch,
+        null_policy=null_policy,
+        batch_size=kwargs.get("batch_size", DEFAULT_BATCH_SIZE),
+        layout=kwargs.get("layout", "aos")
+    )
+
+
+def _compile_relationship_upsert(plan: WritePlan) -> Dict[str, Any]:
+    """Relationship upsert: compile_relationship_upsert(rel_type, data, src, dst, rel_key, **kwargs)."""
+    args, kwargs, target = plan._args, plan._kwargs, plan._target
+    if len(args) < 4:
+        return {"cypher": f"// Relationship upsert {target} - insufficient arguments", "params": {}}
+    
+    data, src, dst, rel_key = args[:4]
+    patch = bool(kwargs.get("patch", False))
+    null_policy = plan._resolve_policy(patch)
+    
+    return plan._upsert_compiler.compile_relationship_upsert(
+        rel_type=target,
+        data=data,
+        src=src,
+        dst=dst,
+        rel_key=rel_key,
+        patch=patch,
+        null_policy=null_policy,
+        batch_size=kwargs.get("batch_size", DEFAULT_BATCH_SIZE),
+        layout=kwargs.get("layout", "aos")
+    )
+
+
+def _compile_node_update(plan: WritePlan) -> Dict[str, Any]:
+    """Node patch/update: compile_node_update(label, updates, where_conditions)."""
+    args, target = plan._args, plan._target
+    if len(args) < 1:
+        # Keep the historical comment wording for each operation
+        name = "patch" if plan._operation_type == "patch" else "Update"
+        return {"cypher": f"// {name} {target} - insufficient arguments", "params": {}}
+    
+    return plan._upsert_compiler.compile_node_update(
+        label=target,
+        updates=args[0],
+        where_conditions=plan._resolve_where(),
+        null_policy=plan._resolve_policy(patch=True)
+    )
+
+
+def _compile_relationship_update(plan: WritePlan) -> Dict[str, Any]:
+    """Relationship update: compile_relationship_update(rel_type, updates, where_conditions)."""
+    args, target = plan._args, plan._target
+    if len(args) < 1:
+        return {"cypher": f"// Relationship update {target} - insufficient arguments", "params": {}}
+    
+    return plan._upsert_compiler.compile_relationship_update(
+        rel_type=target,
+        updates=args[0],
+        where_conditions=plan._resolve_where(),
+        null_policy=plan._resolve_policy(patch=True)
+    )
+
+
+def _compile_relationship_delete(plan: WritePlan) -> Dict[str, Any]:
+    """Relationship delete: compile_relationship_delete(rel_type, where_conditions)."""
+    return plan._upsert_compiler.compile_relationship_delete(
+        rel_type=plan._target,
+        where_conditions=plan._resolve_where()
+    )
+
+
+def _compile_node_delete(plan: WritePlan) -> Dict[str, Any]:
+    """Node delete: compile_node_delete(label, where_conditions, detach)."""
+    return plan._upsert_compiler.compile_node_delete(
+        label=plan._target,
+        where_conditions=plan._resolve_where(),
+        detach=plan._kwargs.get("detach", False)
+    )
+
+
+def _compile_advanced_update(plan: WritePlan) -> Dict[str, Any]:
+    """Advanced update (inc, unset, list_*, map_merge): one template per kind, see _ADVANCED_CLAUSES."""
+    args = plan._args
+    if len(args) < 1:
+        return {"cypher": f"// {plan._operation_type} {plan._target} - insufficient arguments", "params": {}}
+    
+    value = args[1] if len(args) > 1 else None
+    return _compile_advanced(plan._operation_type, plan._target, args[0], value, plan._resolve_where())
+
+
+# Schema DDL templates ({name}: constraint/index name, {label}, {property};
+# node keys take {properties} instead of {property})
+_CONSTRAINT_UNIQUE_TPL = "CREATE CONSTRAINT IF NOT EXISTS {name} FOR (n:{label}) REQUIRE n.{property} IS UNIQUE"
+_CONSTRAINT_NODE_KEY_TPL = "CREATE CONSTRAINT IF NOT EXISTS {name} FOR (n:{label}) REQUIRE ({properties}) IS NODE KEY"
+_INDEX_TPL = "CREATE INDEX IF NOT EXISTS {name} FOR (n:{label}) ON (n.{property})"
+_DROP_CONSTRAINT_TPL = "DROP CONSTRAINT IF EXISTS {name}"
+_DROP_INDEX_TPL = "DROP INDEX IF EXISTS {name}"
+
+
+def _ddl_name(prefix: str, label: str, properties: Tuple[str, ...]) -> str:
+    """
+    Constraint or index name, e.g. ``constraint_Person_email``.
+    
+    Label and properties are validated like any spliced name; backtick-quoted
+    ones contribute their raw text and the whole name is quoted instead.
+    """
+    _check_identifier(label, "label", error=WriteError)
+    for prop in properties:
+        _check_identifier(prop, "property", error=WriteError)
+    return _quote("_".join([prefix, _unquote(label), *map(_unquote, properties)]))
+
+
+@lru_cache(maxsize=2048)
+def _ddl(template: str, prefix: str, label: str, property: str) -> str:
+    """Fill a single-property DDL template for one (label, property) pair."""
+    return template.format_map({
+        "name": _ddl_name(prefix, label, (property,)),
+        "label": label,
+        "property": property,
+    })
+
+
+@lru_cache(maxsize=512)
+def _ddl_ensure_node_key(label: str, properties: Tuple[str, ...]) -> str:
+    """CREATE CONSTRAINT ... IS NODE KEY for a label and property tuple."""
+    return _CONSTRAINT_NODE_KEY_TPL.format_map({
+        "name": _ddl_name("constraint", label, properties),
+        "label": label,
+        "properties": ", ".join(map("n.{}".format, properties)),
+    })
+
+
+def _compile_ensure_unique(plan: WritePlan) -> Dict[str, Any]:
+    """Ensure unique constraint: CREATE CONSTRAINT IF NOT EXISTS."""
+    if len(plan._args) < 1:
+        return {"cypher": f"// ensure_unique {plan._target} - insufficient arguments", "params": {}}
+    return {"cypher": _ddl(_CONSTRAINT_UNIQUE_TPL, "constraint", plan._target, plan._args[0]), "params": {}}
+
+
+def _compile_ensure_node_key(plan: WritePlan) -> Dict[str, Any]:
+    """Ensure node key constraint: CREATE CONSTRAINT IF NOT EXISTS."""
+    if len(plan._args) < 1:
+        return {"cypher": f"// ensure_node_key {plan._target} - insufficient arguments", "params": {}}
+    
+    # Normalize properties to a tuple so the DDL can be memoized
+    properties = plan._args[0]
+    properties = (properties,) if isinstance(properties, str) else tuple(properties)
+    return {"cypher": _ddl_ensure_node_key(plan._target, properties), "params": {}}
+
+
+def _compile_ensure_index(plan: WritePlan) -> Dict[str, Any]:
+    """Ensure index: CREATE INDEX IF NOT EXISTS."""
+    if len(plan._args) < 1:
+        return {"cypher": f"// ensure_index {plan._target} - insufficient arguments", "params": {}}
+    return {"cypher": _ddl(_INDEX_TPL, "index", plan._target, plan._args[0]), "params": {}}
+
+
+def _compile_drop_unique(plan: WritePlan) -> Dict[str, Any]:
+    """Drop unique constraint: DROP CONSTRAINT IF EXISTS."""
+    if len(plan._args) < 1:
+        return {"cypher": f"// drop_unique {plan._target} - insufficient arguments", "params": {}}
+    return {"cypher": _ddl(_DROP_CONSTRAINT_TPL, "constraint", plan._target, plan._args[0]), "params": {}}
+
+
+def _compile_drop_index(plan: WritePlan) -> Dict[str, Any]:
+    """Drop index: DROP INDEX IF EXISTS."""
+    if len(plan._args) < 1:
+        return {"cypher": f"// drop_index {plan._target} - insufficient arguments", "params": {}}
+    return {"cypher": _ddl(_DROP_INDEX_TPL, "index", plan._target, plan._args[0]), "params": {}}
+
+
+def _compile_fallback(plan: WritePlan) -> Dict[str, Any]:
+    """Fallback for other operation types."""
+    return {"cypher": f"// {plan._operation_type} {plan._target}", "params": {}}
+
+
+# Operation type -> compile function, resolved with one dict lookup in compile()
+_OP_DISPATCH = {
+    "upsert": _compile_upsert,
+    "relationship_upsert": _compile_relationship_upsert,
+    "patch": _compile_node_update,
+    "update": _compile_node_update,
+    "relationship_update": _compile_relationship_update,
+    "relationship_delete": _compile_relationship_delete,
+    "delete": _compile_node_delete,
+    **dict.fromkeys(_ADVANCED_CLAUSES, _compile_advanced_update),
+    "ensure_unique": _compile_ensure_unique,
+    "ensure_node_key": _compile_ensure_node_key,
+    "ensure_index": _compile_ensure_index,
+    "drop_unique": _compile_drop_unique,
+    "drop_index": _compile_drop_index,
+}
+_KNOWN_OPS = frozenset(_OP_DISPATCH)
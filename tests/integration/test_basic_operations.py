@@ -76,8 +76,9 @@ def test_relationship_upsert_integration(neo4j_graph):
         {"domain": "company.com", "name": "Test Company"}
     ]
     
-    g.nodes("Person").upsert(people_data, key="email").commit()
-    g.nodes("Company").upsert(company_data, key="domain").commit()
+    with g.write_session() as tx:
+        g.nodes("Person").upsert(people_data, key="email").commit(tx=tx)
+        g.nodes("Company").upsert(company_data, key="domain").commit(tx=tx)
     
     # Create relationship data
     rel_data = [
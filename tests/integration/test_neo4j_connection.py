@@ -34,6 +34,18 @@ def test_neo4j_connection():
             record = result.single()
             assert record["greeting"] == "hello"
 
+def test_graph_context_manager():
+    """Test that Graph works as a context manager."""
+    uri = os.environ.get("NEO4J_URI", "bolt://localhost:7687")
+    user = os.environ.get("NEO4J_USER", "neo4j")
+    password = os.environ.get("NEO4J_PASSWORD", "password")
+
+    with Graph.connect(uri, auth=(user, password)) as g:
+        assert g is not None
+        # The driver should be created when entering context
+        assert g._driver is not None
+        assert hasattr(g._driver, 'session')
+
 def test_raw_cypher():
     """Test raw Cypher execution."""
     uri = os.environ.get("NEO4J_URI", "bolt://localhost:7687")
@@ -0,0 +1,78 @@
+"""
+Shared fixtures for unit tests.
+"""
+
+from contextlib import contextmanager
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from graphframe_neo4j import Graph
+
+
+@pytest.fixture(scope="session")
+def graph():
+    """A Graph for compile-only tests; its driver is only created if a test executes a query."""
+    g = Graph("bolt://localhost:7687", ("neo4j", "password"))
+    yield g
+    g.close()
+
+
+# (from_label, rel_type, to_label, direction, alias) -> expected MATCH and RETURN clauses
+_TRAVERSAL_SHAPES = [
+    (("Person", "WORKS_AT", "Company", "out", None),
+     "MATCH (from:Person)-rel:WORKS_AT->(to:Company)", "RETURN from, rel, to"),
+    (("Company", "WORKS_AT", "Person", "in", None),
+     "MATCH (from:Company)<-rel:WORKS_AT-(to:Person)", "RETURN from, rel, to"),
+    (("Person", "KNOWS", "Person", "both", None),
+     "MATCH (from:Person)-rel:KNOWS-(to:Person)", "RETURN from, rel, to"),
+    (("Person", "WORKS_AT", "Company", "out", ("p", "r", "c")),
+     "MATCH (p:Person)-r:WORKS_AT->(c:Company)", "RETURN p, r, c"),
+]
+
+
+@pytest.fixture(params=_TRAVERSAL_SHAPES, ids=["out", "in", "both", "aliased"])
+def traversal(request, graph):
+    """A base traversal of each shape on the shared graph, with its expected MATCH and RETURN clauses."""
+    (from_label, rel_type, to_label, direction, alias), match, return_clause = request.param
+    path = graph.nodes(from_label).traverse(rel_type, to=to_label, direction=direction, alias=alias)
+    return path, match, return_clause
+
+
+# Driver SummaryCounters fields read into WriteStats
+_COUNTER_FIELDS = ("nodes_created", "nodes_deleted", "relationships_created", "relationships_deleted", "properties_set")
+
+
+@pytest.fixture
+def fake_writes(graph, monkeypatch):
+    """
+    Stub out write execution on the shared graph for the duration of a test.
+
+    ``graph.write_session()`` yields ``fake_writes.tx`` (recording each opened
+    session in ``fake_writes.sessions``); ``graph.cypher_write`` and
+    ``graph.cypher_write_async`` are mocks. Every run reports
+    ``fake_writes.counters``, all zero until a test sets them.
+    """
+    counters = MagicMock(**dict.fromkeys(_COUNTER_FIELDS, 0))
+    tx = MagicMock()
+    tx.run.return_value.consume.return_value.counters = counters
+    sessions = []
+
+    @contextmanager
+    def write_session():
+        sessions.append(tx)
+        yield tx
+
+    fake = SimpleNamespace(
+        counters=counters,
+        tx=tx,
+        sessions=sessions,
+        cypher_write=MagicMock(return_value=counters),
+        cypher_write_async=AsyncMock(return_value=counters),
+    )
+    # Instance attributes shadow the Graph methods and are removed afterwards
+    monkeypatch.setitem(vars(graph), "write_session", write_session)
+    monkeypatch.setitem(vars(graph), "cypher_write", fake.cypher_write)
+    monkeypatch.setitem(vars(graph), "cypher_write_async", fake.cypher_write_async)
+    return fake
@@ -0,0 +1,75 @@
+"""
+Compile matrix: each query shape is built and compiled once, then checked
+against all of its expected Cypher fragments.
+"""
+
+import pytest
+
+_MATRIX = [
+    (
+        "node_filtered",
+        lambda g: g.nodes("Person").where(age__gte=21, country="US").select("name", "email")
+                   .order_by("name").limit(10).offset(5),
+        ["MATCH (n:Person)", "WHERE n.age >= $param_0 AND n.country = $param_1",
+         "RETURN n.name, n.email", "ORDER BY n.name ASC", "SKIP 5", "LIMIT 10"],
+        {"param_0": 21, "param_1": "US"},
+    ),
+    (
+        "node_null_ops",
+        lambda g: g.nodes("Person").where(email__exists=True, phone__is_null=True, name__startswith="A"),
+        ["WHERE n.email IS NOT NULL AND n.phone IS NULL AND n.name STARTS WITH $param_0"],
+        {"param_0": "A"},
+    ),
+    (
+        "traversal_filtered",
+        lambda g: g.nodes("Person").traverse("WORKS_AT", to="Company")
+                   .where(to__city="San Francisco", rel__since__gte=2020, rel__role__in=["Engineer"])
+                   .select("from__name", "to__name").order_by("rel__since__desc").limit(5),
+        ["MATCH (from:Person)-rel:WORKS_AT->(to:Company)",
+         "WHERE to.city = $param_0 AND rel.since >= $param_1 AND rel.role IN $param_2",
+         "RETURN from.name, to.name", "ORDER BY rel.since DESC", "LIMIT 5"],
+        {"param_0": "San Francisco", "param_1": 2020, "param_2": ["Engineer"]},
+    ),
+    (
+        "traversal_aliased",
+        lambda g: g.nodes("Person").traverse("KNOWS", to="Person", direction="both", alias=("p", "r", "q"))
+                   .where(q__age__lt=30),
+        ["MATCH (p:Person)-r:KNOWS-(q:Person)", "WHERE q.age < $param_0", "RETURN p, r, q"],
+        {"param_0": 30},
+    ),
+    (
+        "back",
+        lambda g: g.nodes("Person").traverse("WORKS_AT", to="Company").where(to__industry="Tech")
+                   .back().select("name"),
+        ["MATCH path = (from:Person)-rel:WORKS_AT->(to:Company)", "WHERE to.industry = $param_0",
+         "WITH from", "RETURN from.name"],
+        {"param_0": "Tech"},
+    ),
+    (
+        "back_default_return",
+        lambda g: g.nodes("Company").traverse("WORKS_AT", to="Person", direction="in").back(),
+        ["MATCH path = (from:Company)<-rel:WORKS_AT-(to:Person)", "WITH from", "RETURN from"],
+        {},
+    ),
+]
+
+
+@pytest.fixture(scope="module", params=_MATRIX, ids=[row[0] for row in _MATRIX])
+def compiled_shape(request, graph):
+    """Compile each shape once and share the result across its assertions."""
+    _, build, fragments, params = request.param
+    return build(graph).compile(), fragments, params
+
+
+def test_compiled_fragments(compiled_shape):
+    """Test that every expected fragment appears in the compiled Cypher."""
+    compiled, fragments, _ = compiled_shape
+    missing = [fragment for fragment in fragments if fragment not in compiled["cypher"]]
+    assert not missing, compiled["cypher"]
+
+
+def test_compiled_params(compiled_shape):
+    """Test that values are bound as parameters and never spliced into the Cypher."""
+    compiled, _, params = compiled_shape
+    assert compiled["params"] == params
+    assert "$param_" in compiled["cypher"] or not params
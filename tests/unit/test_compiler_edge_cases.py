@@ -2,7 +2,19 @@
 Test edge cases for the query compiler.
 """
 
-from graphframe_neo4j.frames.compiler import QueryCompiler
+import pytest
+
+from graphframe_neo4j.frames.compiler import QueryCompiler, _parse_shape
+from graphframe_neo4j.util.errors import QueryError
+
+
+def _as_set(conditions):
+    """Conditions as an order-independent set (values compared by repr)."""
+    return frozenset(
+        tuple(sorted((key, repr(value)) for key, value in condition.items()))
+        for condition in conditions
+    )
+
 
 def test_empty_conditions():
     """Test compilation with no conditions."""
@@ -109,7 +121,21 @@ def test_parse_filter_kwargs():
         {"field": "active", "op": "ne", "value": False}
     ]
     
-    assert conditions == expected
+    assert len(conditions) == len(expected)
+    assert _as_set(conditions) == _as_set(expected)
+
+def test_parse_filter_kwargs_reuses_key_shape():
+    """Test that repeated kwarg names are split once and keep their order."""
+    compiler = QueryCompiler()
+    compiler.parse_filter_kwargs({"from__age__gte": 1, "name": "a"})
+    hits = _parse_shape.cache_info().hits
+    conditions = compiler.parse_filter_kwargs({"from__age__gte": 2, "name": "b"})
+
+    assert _parse_shape.cache_info().hits == hits + 1
+    assert conditions == [
+        {"field": "from__age", "op": "gte", "value": 2},
+        {"field": "name", "op": "eq", "value": "b"}
+    ]
 
 def test_complex_label_names():
     """Test handling of complex label names."""
@@ -134,3 +160,102 @@ def test_negative_limit():
     result = compiler.compile_node_query("Person", limit=-1)
     
     assert "LIMIT" not in result["cypher"]
+
+def test_many_parameters_beyond_name_table():
+    """Test parameter names keep counting past the precomputed table."""
+    compiler = QueryCompiler()
+    conditions = [{"field": f"f{i}", "op": "eq", "value": i} for i in range(300)]
+
+    result = compiler.compile_node_query("Person", conditions=conditions)
+
+    assert "n.f299 = $param_299" in result["cypher"]
+    assert result["params"]["param_299"] == 299
+    assert len(result["params"]) == 300
+
+def test_bare_label_fast_path_matches_full_build():
+    """Test the label-only fast path emits the same Cypher as the full builder."""
+    compiler = QueryCompiler()
+
+    for alias in ("n", "p"):
+        result = compiler.compile_node_query("Person", alias=alias)
+        built = QueryCompiler()._build_node_query("Person", alias)
+
+        assert result["cypher"] == built["cypher"]
+        assert result["params"] == {}
+
+def test_compiled_query_attribute_access():
+    """Test compiled queries are dicts that also expose cypher/params attributes."""
+    compiler = QueryCompiler()
+
+    result = compiler.compile_node_query(
+        "Person", conditions=[{"field": "name", "op": "eq", "value": "John"}]
+    )
+
+    assert isinstance(result, dict)
+    assert result.cypher is result["cypher"]
+    assert result.params is result["params"]
+    assert result == {"cypher": result.cypher, "params": {"param_0": "John"}}
+
+@pytest.mark.parametrize("compile_query", [
+    lambda c: c.compile_node_query("Person) DETACH DELETE n //"),
+    lambda c: c.compile_node_query("Person", conditions=[{"field": "a b", "op": "eq", "value": 1}]),
+    lambda c: c.compile_edge_query("KNOWS]-() DELETE r //"),
+    lambda c: c.compile_edge_query("KNOWS", fields=["x} RETURN 1 //"]),
+    lambda c: c.compile_traversal_query("Person", rel_type="WORKS AT"),
+    lambda c: c.compile_back_query("Person", rel_type="WORKS_AT", to_label="Co-op"),
+])
+def test_unsafe_names_rejected(compile_query):
+    """Test that labels, types and filtered fields must be plain or quoted identifiers."""
+    with pytest.raises(QueryError, match="Invalid"):
+        compile_query(QueryCompiler())
+
+@pytest.mark.parametrize("build", [
+    lambda g: g.nodes("P").traverse("R", "Q").where(**{"x OR true //": 1}),
+    lambda g: g.nodes("P").traverse("R", "Q").where(**{"to__x OR true //": 1}).back(),
+    lambda g: g.rels("R").where(**{"x OR true //": 1}),
+    lambda g: g.nodes("P").order_by("x DETACH DELETE n //"),
+    lambda g: g.nodes("P").select("x} RETURN 1 //"),
+    lambda g: g.nodes("P").traverse("R", "Q").order_by("to__x DESC, from //"),
+    lambda g: g.nodes("P").traverse("R", "Q").select("to__x} //"),
+])
+def test_unsafe_fields_rejected(graph, build):
+    """Test that WHERE, ORDER BY and RETURN fields of every query kind are validated."""
+    with pytest.raises(QueryError, match="Invalid property"):
+        build(graph).compile()
+
+def test_dotted_and_star_fields_accepted(graph):
+    """Test that alias-qualified fields and a bare * selection still compile."""
+    assert "ORDER BY n.age ASC" in graph.nodes("P").order_by("n.age").compile().cypher
+    assert "RETURN n.*" in graph.nodes("P").select("*").compile().cypher
+    assert "from.x = $param_0" in graph.nodes("P").traverse("R", "Q").where(**{"from.x": 1}).compile().cypher
+
+@pytest.mark.parametrize("label", ["My-Label", "My Label", "`My`Label`", "``"])
+def test_unquoted_or_malformed_label_rejected(label):
+    """Test that a label needing quotes is rejected unless properly backtick-quoted."""
+    with pytest.raises(QueryError, match="Invalid label"):
+        QueryCompiler().compile_node_query(label, conditions=[{"field": "age", "op": "gt", "value": 1}])
+
+
+def test_quoted_names_accepted():
+    """Test that backtick-quoted labels, types and fields are spliced as given."""
+    compiler = QueryCompiler()
+    node = compiler.compile_node_query("`My Label`", conditions=[{"field": "`first name`", "op": "eq", "value": "A"}])
+    edge = compiler.compile_edge_query("`WORKS AT`")
+    path = compiler.compile_traversal_query("`My Label`", rel_type="`WORKS AT`", to_label="`Co-op`")
+
+    assert "MATCH (n:`My Label`)" in node["cypher"]
+    assert "n.`first name` = $param_0" in node["cypher"]
+    assert ":`WORKS AT`" in edge["cypher"]
+    assert "(from:`My Label`)" in path["cypher"] and "(to:`Co-op`)" in path["cypher"]
+
+def test_empty_params_are_fresh_dicts():
+    """Test that queries binding nothing still return their own mutable params dict."""
+    first = QueryCompiler().compile_node_query("Person")
+    second = QueryCompiler().compile_node_query(
+        "Person", conditions=[{"field": "email", "op": "is_null"}]
+    )
+
+    assert first["params"] == second["params"] == {}
+    assert first["params"] is not second["params"]
+    first["params"]["limit"] = 1
+    assert QueryCompiler().compile_node_query("Person")["params"] == {}
@@ -2,34 +2,43 @@
 Comprehensive scenario tests for NodeFrame functionality.
 """
 
-import pytest
-from graphframe_neo4j import Graph
+import re
 
-def test_chaining_order_independence():
+_CLAUSE_RE = re.compile(r"^(MATCH|WHERE|RETURN|ORDER BY|SKIP|LIMIT) (.*)$", re.MULTILINE)
+
+
+def _clauses(cypher):
+    """Parse compiled Cypher into a {keyword: body} dict in one pass."""
+    return dict(_CLAUSE_RE.findall(cypher))
+
+
+_CHAINED_CLAUSES = {
+    "MATCH": "(n:Person)",
+    "WHERE": "n.age >= $param_0",
+    "RETURN": "n.name",
+    "ORDER BY": "n.name ASC",
+    "LIMIT": "10",
+}
+
+def test_chaining_order_independence(graph):
     """Test that method chaining order doesn't affect results."""
-    g = Graph.connect("bolt://localhost:7687", auth=("neo4j", "password"))
+    g = graph
     
     # Different chaining orders should produce equivalent queries
     query1 = g.nodes("Person").where(age__gte=21).select("name").limit(10).order_by("name")
     query2 = g.nodes("Person").limit(10).where(age__gte=21).order_by("name").select("name")
     query3 = g.nodes("Person").order_by("name").select("name").where(age__gte=21).limit(10)
     
-    compiled1 = query1.compile()
-    compiled2 = query2.compile()
-    compiled3 = query3.compile()
+    compiled1, compiled2, compiled3 = (q.compile() for q in (query1, query2, query3))
     
-    # All should have the same components (order may vary)
-    for compiled in [compiled1, compiled2, compiled3]:
-        assert "MATCH (n:Person)" in compiled["cypher"]
-        assert "WHERE n.age >= $param_0" in compiled["cypher"]
-        assert "RETURN n.name" in compiled["cypher"]
-        assert "LIMIT 10" in compiled["cypher"]
-        assert "ORDER BY n.name ASC" in compiled["cypher"]
-        assert compiled["params"]["param_0"] == 21
+    # All chaining orders compile to the same query, so parse it once
+    assert compiled1 == compiled2 == compiled3
+    assert _clauses(compiled1["cypher"]) == _CHAINED_CLAUSES
+    assert compiled1["params"] == {"param_0": 21}
 
-def test_multiple_where_calls():
+def test_multiple_where_calls(graph):
     """Test multiple where() calls accumulate conditions."""
-    g = Graph.connect("bolt://localhost:7687", auth=("neo4j", "password"))
+    g = graph
     
     query = (g.nodes("Person")
             .where(age__gte=21)
@@ -44,9 +53,22 @@ def test_multiple_where_calls():
     assert compiled["params"]["param_1"] == "US"
     assert compiled["params"]["param_2"] == "J"
 
-def test_select_overwrites():
+def test_where_chaining_extends_in_place(graph):
+    """Test where() appends to the frame's own condition list without copying."""
+    g = graph
+
+    query = g.nodes("Person")
+    filters = query._filters
+
+    chained = query.where(age__gte=21).where(country="US").where(name__contains="J")
+
+    assert chained is query
+    assert query._filters is filters
+    assert [f["field"] for f in filters] == ["age", "country", "name"]
+
+def test_select_overwrites(graph):
     """Test that multiple select() calls overwrite previous selection."""
-    g = Graph.connect("bolt://localhost:7687", auth=("neo4j", "password"))
+    g = graph
     
     query = g.nodes("Person").select("name", "age").select("email")
     compiled = query.compile()
@@ -56,9 +78,9 @@ def test_select_overwrites():
     assert "n.name" not in compiled["cypher"]
     assert "n.age" not in compiled["cypher"]
 
-def test_empty_string_values():
+def test_empty_string_values(graph):
     """Test handling of empty string values."""
-    g = Graph.connect("bolt://localhost:7687", auth=("neo4j", "password"))
+    g = graph
     
     query = g.nodes("Person").where(name="", email="")
     compiled = query.compile()
@@ -67,9 +89,9 @@ def test_empty_string_values():
     assert compiled["params"]["param_0"] == ""
     assert compiled["params"]["param_1"] == ""
 
-def test_large_parameter_values():
+def test_large_parameter_values(graph):
     """Test handling of large parameter values."""
-    g = Graph.connect("bolt://localhost:7687", auth=("neo4j", "password"))
+    g = graph
     
     large_string = "A" * 10000
     large_list = list(range(1000))
@@ -82,9 +104,9 @@ def test_large_parameter_values():
     assert compiled["params"]["param_1"] == large_list
     assert large_string not in compiled["cypher"]
 
-def test_unicode_values():
+def test_unicode_values(graph):
     """Test handling of Unicode values."""
-    g = Graph.connect("bolt://localhost:7687", auth=("neo4j", "password"))
+    g = graph
     
     unicode_name = "José María"
     emoji_description = "User with 👍 and 🎉"
@@ -107,9 +129,9 @@ def test_unicode_values():
     assert emoji_description not in compiled["cypher"]
     assert chinese_name not in compiled["cypher"]
 
-def test_mixed_filter_types():
+def test_mixed_filter_types(graph):
     """Test mixing different filter types in one query."""
-    g = Graph.connect("bolt://localhost:7687", auth=("neo4j", "password"))
+    g = graph
     
     query = g.nodes("Person").where(
         age__gte=18,
@@ -122,17 +144,19 @@ def test_mixed_filter_types():
     compiled = query.compile()
     
     # Should have all filter types
-    assert "WHERE" in compiled["cypher"]
-    assert "n.age >= $param_0" in compiled["cypher"]
-    assert "n.age <= $param_1" in compiled["cypher"]
-    assert "n.country IN $param_2" in compiled["cypher"]
-    assert "n.status <> $param_3" in compiled["cypher"]
-    assert "n.email CONTAINS $param_4" in compiled["cypher"]
-    assert "n.verified IS NOT NULL" in compiled["cypher"]
-
-def test_compiler_reusability():
+    conditions = _clauses(compiled["cypher"])["WHERE"].split(" AND ")
+    assert conditions == [
+        "n.age >= $param_0",
+        "n.age <= $param_1",
+        "n.country IN $param_2",
+        "n.status <> $param_3",
+        "n.email CONTAINS $param_4",
+        "n.verified IS NOT NULL",
+    ]
+
+def test_compiler_reusability(graph):
     """Test that compiler can be reused for multiple queries."""
-    g = Graph.connect("bolt://localhost:7687", auth=("neo4j", "password"))
+    g = graph
     
     # Create multiple queries and ensure they don't interfere
     query1 = g.nodes("Person").where(name="Alice")
@@ -153,9 +177,9 @@ def test_compiler_reusability():
     assert "MATCH (n:Company)" in compiled2["cypher"]
     assert "MATCH (n:Product)" in compiled3["cypher"]
 
-def test_query_with_no_results():
+def test_query_with_no_results(graph):
     """Test query that should return no results."""
-    g = Graph.connect("bolt://localhost:7687", auth=("neo4j", "password"))
+    g = graph
     
     # Impossible condition
     query = g.nodes("Person").where(age__lt=0)
@@ -168,18 +192,18 @@ def test_query_with_no_results():
     results = query.to_records()
     assert isinstance(results, list)  # May be empty list
 
-def test_very_large_limit():
+def test_very_large_limit(graph):
     """Test with very large limit values."""
-    g = Graph.connect("bolt://localhost:7687", auth=("neo4j", "password"))
+    g = graph
     
     query = g.nodes("Person").limit(1000000)
     compiled = query.compile()
     
     assert "LIMIT 1000000" in compiled["cypher"]
 
-def test_compound_conditions_same_field():
+def test_compound_conditions_same_field(graph):
     """Test multiple conditions on the same field."""
-    g = Graph.connect("bolt://localhost:7687", auth=("neo4j", "password"))
+    g = graph
     
     # This should work - multiple conditions on same field
     query = g.nodes("Person").where(age__gte=18, age__lte=65)
@@ -2,9 +2,18 @@
 Test basic Graph functionality.
 """
 
-import pytest
+import asyncio
+import os
+import subprocess
+import sys
+from unittest.mock import AsyncMock, Mock
+
+import neo4j
+
+import graphframe_neo4j
 from graphframe_neo4j import Graph
 
+
 def test_graph_creation():
     """Test that we can create a Graph instance."""
     # Note: We're not actually connecting, just testing instantiation
@@ -14,17 +23,9 @@ def test_graph_creation():
     assert g.auth == ("neo4j", "password")
     assert g.database == "neo4j"
 
-def test_graph_context_manager():
-    """Test that Graph works as a context manager."""
-    with Graph.connect("bolt://localhost:7687", auth=("neo4j", "password")) as g:
-        assert g is not None
-        # The driver should be created when entering context
-        assert g._driver is not None
-        assert hasattr(g._driver, 'session')
-
-def test_graph_frames():
+def test_graph_frames(graph):
     """Test that we can get frame instances from Graph."""
-    g = Graph.connect("bolt://localhost:7687", auth=("neo4j", "password"))
+    g = graph
     
     # Test nodes frame
     people = g.nodes("Person")
@@ -39,3 +40,65 @@ def test_graph_frames():
     # Test schema manager
     schema = g.schema()
     assert schema is not None
+    assert g.schema() is schema
+
+def test_graphs_share_driver_per_connection_settings(monkeypatch):
+    """Test that Graphs with identical settings share one driver until the last closes."""
+    factory = Mock(side_effect=lambda *args, **kwargs: Mock())
+    monkeypatch.setattr(neo4j.GraphDatabase, "driver", factory)
+
+    g1 = Graph.connect("bolt://shared:7687", auth=("neo4j", "password"))
+    g2 = Graph.connect("bolt://shared:7687", auth=("neo4j", "password"))
+    g3 = Graph.connect("bolt://other:7687", auth=("neo4j", "password"))
+    g4 = Graph.connect("bolt://shared:7687", auth=["neo4j", "password"])
+
+    driver = g1._ensure_driver()
+    assert g2._ensure_driver() is driver
+    assert g4._ensure_driver() is driver
+    g4.close()
+    assert g3._ensure_driver() is not driver
+    assert factory.call_count == 2
+
+    g1.close()
+    driver.close.assert_not_called()
+    g2.close()
+    driver.close.assert_called_once()
+    g3.close()
+
+def test_graph_does_not_import_driver_or_forward_policy():
+    """Test that rel_uniqueness_policy stays on the Graph and neo4j is imported lazily."""
+    g = Graph.connect("bolt://localhost:7687", auth=("neo4j", "password"), rel_uniqueness_policy="require_rel_key")
+    assert g.rel_uniqueness_policy == "require_rel_key"
+    assert "rel_uniqueness_policy" not in g.driver_kwargs
+
+    code = (
+        "import sys; from graphframe_neo4j import Graph; "
+        "Graph('bolt://localhost:7687', ('neo4j', 'password')).nodes('Person').compile(); "
+        "print('neo4j' in sys.modules)"
+    )
+    src = os.path.dirname(os.path.dirname(graphframe_neo4j.__file__))
+    env = {**os.environ, "PYTHONPATH": src}
+    out = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True, env=env)
+    assert out.stdout.strip() == "False"
+
+def test_async_driver_is_bound_to_its_event_loop(monkeypatch):
+    """Test that each event loop gets its own async driver and close_async closes it."""
+    factory = Mock(side_effect=lambda *args, **kwargs: Mock(close=AsyncMock()))
+    monkeypatch.setattr(neo4j.AsyncGraphDatabase, "driver", factory)
+    g = Graph.connect("bolt://localhost:7687", auth=("neo4j", "password"))
+
+    async def drivers(close):
+        first, second = g._ensure_async_driver(), g._ensure_async_driver()
+        if close:
+            await g.close_async()
+        return first, second
+
+    first, reused = asyncio.run(drivers(close=False))
+    second, _ = asyncio.run(drivers(close=True))
+
+    assert reused is first
+    assert second is not first
+    assert factory.call_count == 2
+    first.close.assert_not_awaited()
+    second.close.assert_awaited_once()
+    assert g._async_driver is None
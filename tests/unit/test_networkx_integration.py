@@ -2,25 +2,28 @@
 Test networkx integration for GraphFrame-Neo4j.
 """
 
+from unittest.mock import Mock
+
 import pytest
-from unittest.mock import Mock, patch, MagicMock
+
 from graphframe_neo4j import Graph
+from graphframe_neo4j import graph as graph_module
+
 
+def _missing(name):
+    raise ImportError(f"No module named {name!r}")
 
-def test_to_networkx_requires_networkx():
+
+def test_to_networkx_requires_networkx(monkeypatch):
     """Test that to_networkx() raises ImportError when networkx is not installed."""
-    # Temporarily hide networkx to test the ImportError
-    with patch.dict('sys.modules', {'networkx': None}):
-        # Reload the module to pick up the networkx absence
-        import importlib
-        import graphframe_neo4j.graph
-        importlib.reload(graphframe_neo4j.graph)
-        
-        # Create a real Graph instance to test the actual method
-        graph = Graph("bolt://localhost:7687", ("neo4j", "test"))
-        
-        with pytest.raises(ImportError, match="networkx is required for to_networkx"):
-            graph.to_networkx()
+    # Hide networkx from the optional-import hook
+    monkeypatch.setattr(graph_module, "_require", _missing)
+
+    # Create a real Graph instance to test the actual method
+    graph = Graph("bolt://localhost:7687", ("neo4j", "test"))
+
+    with pytest.raises(ImportError, match="networkx is required for to_networkx"):
+        graph.to_networkx()
 
 
 @pytest.mark.skipif(True, reason="networkx not required for basic functionality")
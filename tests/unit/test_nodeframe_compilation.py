@@ -2,12 +2,21 @@
 Test NodeFrame compilation functionality.
 """
 
+import re
+
 import pytest
-from graphframe_neo4j import Graph
 
-def test_simple_match_compilation():
+_CLAUSE_RE = re.compile(r"^(MATCH|WHERE|RETURN|ORDER BY|SKIP|LIMIT) (.*)$", re.MULTILINE)
+
+
+def _clauses(cypher):
+    """Parse compiled Cypher into a {keyword: body} dict in one pass."""
+    return dict(_CLAUSE_RE.findall(cypher))
+
+
+def test_simple_match_compilation(graph):
     """Test basic MATCH compilation."""
-    g = Graph.connect("bolt://localhost:7687", auth=("neo4j", "password"))
+    g = graph
     
     # Simple node query
     query = g.nodes("Person")
@@ -17,54 +26,36 @@ def test_simple_match_compilation():
     assert "RETURN n" in compiled["cypher"]
     assert compiled["params"] == {}
 
-def test_where_compilation():
-    """Test WHERE clause compilation."""
-    g = Graph.connect("bolt://localhost:7687", auth=("neo4j", "password"))
-    
+@pytest.mark.parametrize("kwargs,expected,params", [
     # Simple equality
-    query = g.nodes("Person").where(name="John")
-    compiled = query.compile()
-    
-    assert "WHERE n.name = $param_0" in compiled["cypher"]
-    assert compiled["params"]["param_0"] == "John"
-    
+    ({"name": "John"}, "n.name = $param_0", {"param_0": "John"}),
     # Multiple conditions
-    query = g.nodes("Person").where(name="John", age=30)
-    compiled = query.compile()
+    ({"name": "John", "age": 30}, "n.name = $param_0 AND n.age = $param_1",
+     {"param_0": "John", "param_1": 30}),
+])
+def test_where_compilation(graph, kwargs, expected, params):
+    """Test WHERE clause compilation."""
+    compiled = graph.nodes("Person").where(**kwargs).compile()
     
-    assert "WHERE n.name = $param_0 AND n.age = $param_1" in compiled["cypher"]
-    assert compiled["params"]["param_0"] == "John"
-    assert compiled["params"]["param_1"] == 30
+    assert f"WHERE {expected}" in compiled["cypher"]
+    assert compiled["params"] == params
 
-def test_filter_operations():
+@pytest.mark.parametrize("kwargs,expected", [
+    ({"age__gte": 21}, "n.age >= $param_0"),
+    ({"age__lt": 30}, "n.age < $param_0"),
+    ({"country__in": ["US", "CA", "UK"]}, "n.country IN $param_0"),
+    ({"name__contains": "ohn"}, "n.name CONTAINS $param_0"),
+])
+def test_filter_operations(graph, kwargs, expected):
     """Test various filter operations."""
-    g = Graph.connect("bolt://localhost:7687", auth=("neo4j", "password"))
-    
-    # Greater than
-    query = g.nodes("Person").where(age__gte=21)
-    compiled = query.compile()
-    assert "WHERE n.age >= $param_0" in compiled["cypher"]
-    assert compiled["params"]["param_0"] == 21
-    
-    # Less than
-    query = g.nodes("Person").where(age__lt=30)
-    compiled = query.compile()
-    assert "WHERE n.age < $param_0" in compiled["cypher"]
-    
-    # IN operation
-    query = g.nodes("Person").where(country__in=["US", "CA", "UK"])
-    compiled = query.compile()
-    assert "WHERE n.country IN $param_0" in compiled["cypher"]
-    assert compiled["params"]["param_0"] == ["US", "CA", "UK"]
+    compiled = graph.nodes("Person").where(**kwargs).compile()
     
-    # Contains
-    query = g.nodes("Person").where(name__contains="ohn")
-    compiled = query.compile()
-    assert "WHERE n.name CONTAINS $param_0" in compiled["cypher"]
+    assert f"WHERE {expected}" in compiled["cypher"]
+    assert compiled["params"] == {"param_0": next(iter(kwargs.values()))}
 
-def test_select_compilation():
+def test_select_compilation(graph):
     """Test SELECT clause compilation."""
-    g = Graph.connect("bolt://localhost:7687", auth=("neo4j", "password"))
+    g = graph
     
     # Select specific fields
     query = g.nodes("Person").select("name", "email", "age")
@@ -79,48 +70,43 @@ def test_select_compilation():
     assert "WHERE n.age >= $param_0" in compiled["cypher"]
     assert "RETURN n.name, n.email" in compiled["cypher"]
 
-def test_limit_offset_compilation():
-    """Test LIMIT and OFFSET compilation."""
-    g = Graph.connect("bolt://localhost:7687", auth=("neo4j", "password"))
-    
+@pytest.mark.parametrize("limit,offset,expected", [
     # Limit only
-    query = g.nodes("Person").limit(10)
-    compiled = query.compile()
-    assert "LIMIT 10" in compiled["cypher"]
-    
+    (10, None, ["LIMIT 10"]),
     # Offset only
-    query = g.nodes("Person").offset(20)
-    compiled = query.compile()
-    assert "SKIP 20" in compiled["cypher"]
-    
+    (None, 20, ["SKIP 20"]),
     # Both limit and offset
-    query = g.nodes("Person").offset(20).limit(10)
+    (10, 20, ["SKIP 20", "LIMIT 10"]),
+])
+def test_limit_offset_compilation(graph, limit, offset, expected):
+    """Test LIMIT and OFFSET compilation."""
+    query = graph.nodes("Person")
+    if offset is not None:
+        query = query.offset(offset)
+    if limit is not None:
+        query = query.limit(limit)
     compiled = query.compile()
-    assert "SKIP 20" in compiled["cypher"]
-    assert "LIMIT 10" in compiled["cypher"]
-
-def test_order_by_compilation():
-    """Test ORDER BY compilation."""
-    g = Graph.connect("bolt://localhost:7687", auth=("neo4j", "password"))
     
+    for fragment in expected:
+        assert fragment in compiled["cypher"]
+
+@pytest.mark.parametrize("fields,expected", [
     # Simple order by
-    query = g.nodes("Person").order_by("name")
-    compiled = query.compile()
-    assert "ORDER BY n.name ASC" in compiled["cypher"]
-    
+    (("name",), "ORDER BY n.name ASC"),
     # Descending order
-    query = g.nodes("Person").order_by("age__desc")
-    compiled = query.compile()
-    assert "ORDER BY n.age DESC" in compiled["cypher"]
-    
+    (("age__desc",), "ORDER BY n.age DESC"),
     # Multiple fields
-    query = g.nodes("Person").order_by("country", "name__desc")
-    compiled = query.compile()
-    assert "ORDER BY n.country ASC , n.name DESC" in compiled["cypher"]
+    (("country", "name__desc"), "ORDER BY n.country ASC , n.name DESC"),
+])
+def test_order_by_compilation(graph, fields, expected):
+    """Test ORDER BY compilation."""
+    compiled = graph.nodes("Person").order_by(*fields).compile()
 
-def test_complete_query_compilation():
+    assert expected in compiled["cypher"]
+
+def test_complete_query_compilation(graph):
     """Test complete query with all components."""
-    g = Graph.connect("bolt://localhost:7687", auth=("neo4j", "password"))
+    g = graph
     
     # Complete query
     query = (g.nodes("Person")
@@ -133,19 +119,20 @@ def test_complete_query_compilation():
     compiled = query.compile()
     
     # Check all components are present
-    assert "MATCH (n:Person)" in compiled["cypher"]
-    assert "WHERE n.age >= $param_0 AND n.country = $param_1" in compiled["cypher"]
-    assert "RETURN n.name, n.email, n.age" in compiled["cypher"]
-    assert "ORDER BY n.name ASC" in compiled["cypher"]
-    assert "LIMIT 10" in compiled["cypher"]
+    clauses = _clauses(compiled["cypher"])
+    assert clauses["MATCH"] == "(n:Person)"
+    assert clauses["WHERE"] == "n.age >= $param_0 AND n.country = $param_1"
+    assert clauses["RETURN"] == "n.name, n.email, n.age"
+    assert clauses["ORDER BY"] == "n.name ASC"
+    assert clauses["LIMIT"] == "10"
     
     # Check parameters
     assert compiled["params"]["param_0"] == 21
     assert compiled["params"]["param_1"] == "US"
 
-def test_parameter_safety():
+def test_parameter_safety(graph):
     """Test that parameters are properly escaped."""
-    g = Graph.connect("bolt://localhost:7687", auth=("neo4j", "password"))
+    g = graph
     
     # Test with potentially dangerous input
     dangerous_name = "Robert'); DROP TABLE Students;--"
@@ -156,3 +143,22 @@ def test_parameter_safety():
     assert "WHERE n.name = $param_0" in compiled["cypher"]
     assert dangerous_name not in compiled["cypher"]
     assert compiled["params"]["param_0"] == dangerous_name
+
+def test_same_shape_reuses_cypher(graph):
+    """Test that queries of the same shape share Cypher but bind their own values."""
+    g = graph
+
+    first = g.nodes("Person").where(age__gte=21, country="US").select("name").limit(5).compile()
+    second = g.nodes("Person").where(age__gte=65, country="UK").select("name").limit(5).compile()
+
+    assert second["cypher"] is first["cypher"]
+    assert first["params"] == {"param_0": 21, "param_1": "US"}
+    assert second["params"] == {"param_0": 65, "param_1": "UK"}
+
+def test_in_list_bound_without_copy(graph):
+    """Test that IN lists are bound into params by reference."""
+    countries = [f"C{i}" for i in range(1000)]
+    compiled = graph.nodes("Person").where(country__in=countries).compile()
+
+    assert "WHERE n.country IN $param_0" in compiled["cypher"]
+    assert compiled["params"]["param_0"] is countries
@@ -2,33 +2,37 @@
 Test pandas integration for GraphFrame-Neo4j.
 """
 
+from unittest.mock import MagicMock, Mock, patch
+
 import pytest
-from unittest.mock import Mock, patch, MagicMock
-from graphframe_neo4j import Graph
+
+from graphframe_neo4j.frames import baseframe
 from graphframe_neo4j.frames.nodeframe import NodeFrame
 
 
-def test_to_df_requires_pandas():
+def _missing(name):
+    raise ImportError(f"No module named {name!r}")
+
+
+def test_to_df_requires_pandas(monkeypatch):
     """Test that to_df() raises ImportError when pandas is not installed."""
     # Create a mock graph and node frame
     mock_graph = Mock()
     node_frame = NodeFrame(mock_graph, "Person")
     
-    # Mock the to_records method to return some data
-    node_frame.to_records = Mock(return_value=[
+    # Mock the to_records method to return some data (frames use __slots__,
+    # so patch the class rather than the instance)
+    records = Mock(return_value=[
         {"name": "Alice", "age": 30},
         {"name": "Bob", "age": 25}
     ])
     
-    # Temporarily hide pandas to test the ImportError
-    with patch.dict('sys.modules', {'pandas': None}):
-        # Reload the module to pick up the pandas absence
-        import importlib
-        import graphframe_neo4j.frames.baseframe
-        importlib.reload(graphframe_neo4j.frames.baseframe)
-        
-        with pytest.raises(ImportError, match="pandas is required for to_df"):
-            node_frame.to_df()
+    # Hide pandas from the optional-import hook
+    monkeypatch.setattr(baseframe, "_require", _missing)
+
+    with patch.object(NodeFrame, "to_records", records), \
+            pytest.raises(ImportError, match="pandas is required for to_df"):
+        node_frame.to_df()
 
 
 @pytest.mark.skipif(True, reason="pandas not required for basic functionality")
@@ -61,12 +65,13 @@ def test_to_records_basic():
     node_frame = NodeFrame(mock_graph, "Person")
     
     # Mock the compile method to return a simple query
-    node_frame.compile = Mock(return_value={
+    compile_mock = Mock(return_value={
         "cypher": "MATCH (n:Person) RETURN n",
         "params": {}
     })
     
-    records = node_frame.to_records()
+    with patch.object(NodeFrame, "compile", compile_mock):
+        records = node_frame.to_records()
     
     # Verify the results
     assert len(records) == 2
@@ -2,13 +2,11 @@
 Test that the examples from the README work.
 """
 
-import pytest
-from graphframe_neo4j import Graph
 
-def test_readme_basic_examples():
+def test_readme_basic_examples(graph):
     """Test the basic examples from the README."""
-    # Create a Graph instance (won't actually connect in tests)
-    g = Graph.connect("bolt://localhost:7687", auth=("neo4j", "password"), database="neo4j")
+    # Shared Graph instance (won't actually connect in tests)
+    g = graph
     
     # Test nodes frame creation
     People = g.nodes("Person")
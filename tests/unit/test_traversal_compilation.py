@@ -2,52 +2,18 @@
 Test traversal compilation functionality.
 """
 
-import pytest
-from graphframe_neo4j import Graph
 
-def test_basic_traversal_compilation():
-    """Test basic traversal query compilation."""
-    g = Graph.connect("bolt://localhost:7687", auth=("neo4j", "password"))
-    
-    # Basic outbound traversal
-    query = g.nodes("Person").traverse("WORKS_AT", to="Company")
+def test_basic_traversal_compilation(traversal):
+    """Test traversal compilation for each direction and alias shape."""
+    query, match, return_clause = traversal
     compiled = query.compile()
     
-    assert "MATCH (from:Person)-rel:WORKS_AT->(to:Company)" in compiled["cypher"]
-    assert "RETURN from, rel, to" in compiled["cypher"]
+    assert compiled["cypher"] == f"{match}\n{return_clause}"
     assert compiled["params"] == {}
 
-def test_inbound_traversal():
-    """Test inbound traversal."""
-    g = Graph.connect("bolt://localhost:7687", auth=("neo4j", "password"))
-    
-    query = g.nodes("Company").traverse("WORKS_AT", to="Person", direction="in")
-    compiled = query.compile()
-    
-    assert "MATCH (from:Company)<-rel:WORKS_AT-(to:Person)" in compiled["cypher"]
-
-def test_both_direction_traversal():
-    """Test both direction traversal."""
-    g = Graph.connect("bolt://localhost:7687", auth=("neo4j", "password"))
-    
-    query = g.nodes("Person").traverse("KNOWS", to="Person", direction="both")
-    compiled = query.compile()
-    
-    assert "MATCH (from:Person)-rel:KNOWS-(to:Person)" in compiled["cypher"]
-
-def test_custom_aliases():
-    """Test traversal with custom aliases."""
-    g = Graph.connect("bolt://localhost:7687", auth=("neo4j", "password"))
-    
-    query = g.nodes("Person").traverse("WORKS_AT", to="Company", alias=("p", "r", "c"))
-    compiled = query.compile()
-    
-    assert "MATCH (p:Person)-r:WORKS_AT->(c:Company)" in compiled["cypher"]
-    assert "RETURN p, r, c" in compiled["cypher"]
-
-def test_traversal_with_where():
+def test_traversal_with_where(graph):
     """Test traversal with WHERE conditions."""
-    g = Graph.connect("bolt://localhost:7687", auth=("neo4j", "password"))
+    g = graph
     
     query = (g.nodes("Person")
             .traverse("WORKS_AT", to="Company")
@@ -59,9 +25,9 @@ def test_traversal_with_where():
     assert compiled["params"]["param_0"] == "San Francisco"
     assert compiled["params"]["param_1"] == 2020
 
-def test_traversal_field_selection():
+def test_traversal_field_selection(graph):
     """Test traversal with field selection."""
-    g = Graph.connect("bolt://localhost:7687", auth=("neo4j", "password"))
+    g = graph
     
     query = (g.nodes("Person")
             .traverse("WORKS_AT", to="Company")
@@ -71,9 +37,9 @@ def test_traversal_field_selection():
     
     assert "RETURN from.name, rel.role, to.name" in compiled["cypher"]
 
-def test_traversal_with_order_by():
+def test_traversal_with_order_by(graph):
     """Test traversal with ORDER BY."""
-    g = Graph.connect("bolt://localhost:7687", auth=("neo4j", "password"))
+    g = graph
     
     query = (g.nodes("Person")
             .traverse("WORKS_AT", to="Company")
@@ -83,9 +49,9 @@ def test_traversal_with_order_by():
     
     assert "ORDER BY to.name ASC , rel.since DESC" in compiled["cypher"]
 
-def test_traversal_with_limit_offset():
+def test_traversal_with_limit_offset(graph):
     """Test traversal with LIMIT and OFFSET."""
-    g = Graph.connect("bolt://localhost:7687", auth=("neo4j", "password"))
+    g = graph
     
     query = (g.nodes("Person")
             .traverse("WORKS_AT", to="Company")
@@ -97,9 +63,9 @@ def test_traversal_with_limit_offset():
     assert "SKIP 20" in compiled["cypher"]
     assert "LIMIT 10" in compiled["cypher"]
 
-def test_back_query_compilation():
+def test_back_query_compilation(graph):
     """Test back() query compilation."""
-    g = Graph.connect("bolt://localhost:7687", auth=("neo4j", "password"))
+    g = graph
     
     # Create traversal and then back()
     traversal = (g.nodes("Person")
@@ -117,9 +83,9 @@ def test_back_query_compilation():
     assert "RETURN from" in compiled["cypher"]
     assert "LIMIT 10" in compiled["cypher"]
 
-def test_back_query_with_selection():
+def test_back_query_with_selection(graph):
     """Test back() query with field selection."""
-    g = Graph.connect("bolt://localhost:7687", auth=("neo4j", "password"))
+    g = graph
     
     traversal = (g.nodes("Person")
                 .traverse("WORKS_AT", to="Company")
@@ -131,9 +97,9 @@ def test_back_query_with_selection():
     
     assert "RETURN from.name, from.age" in compiled["cypher"]
 
-def test_back_query_with_filtering():
+def test_back_query_with_filtering(graph):
     """Test back() query with additional filtering."""
-    g = Graph.connect("bolt://localhost:7687", auth=("neo4j", "password"))
+    g = graph
     
     traversal = (g.nodes("Person")
                 .traverse("WORKS_AT", to="Company")
@@ -145,9 +111,10 @@ def test_back_query_with_filtering():
     # Should include both traversal conditions and back conditions
     assert "WHERE to.city = $param_0 AND from.age >= $param_1" in compiled["cypher"]
 
-def test_complex_traversal_pattern():
+def test_complex_traversal_pattern(graph):
     """Test complex traversal with multiple conditions."""
-    g = Graph.connect("bolt://localhost:7687", auth=("neo4j", "password"))
+    g = graph
+    roles = ["Engineer", "Manager"]
     
     query = (g.nodes("Person")
             .where(age__gte=21)
@@ -155,7 +122,7 @@ def test_complex_traversal_pattern():
             .where(
                 to__city="San Francisco",
                 rel__since__gte=2020,
-                rel__role__in=["Engineer", "Manager"]
+                rel__role__in=roles
             )
             .select("from__name", "to__name", "rel__role")
             .order_by("rel__since__desc")
@@ -169,10 +136,12 @@ def test_complex_traversal_pattern():
     assert "RETURN from.name, to.name, rel.role" in compiled["cypher"]
     assert "ORDER BY rel.since DESC" in compiled["cypher"]
     assert "LIMIT 5" in compiled["cypher"]
+    # IN lists are bound as is, not copied
+    assert compiled["params"]["param_2"] is roles
 
-def test_traversal_namespacing_variations():
+def test_traversal_namespacing_variations(graph):
     """Test different namespacing patterns."""
-    g = Graph.connect("bolt://localhost:7687", auth=("neo4j", "password"))
+    g = graph
     
     # Test default namespacing
     query1 = g.nodes("Person").traverse("WORKS_AT", to="Company").where(from__age__gte=21)
@@ -184,9 +153,9 @@ def test_traversal_namespacing_variations():
     compiled2 = query2.compile()
     assert "WHERE p.age >= $param_0" in compiled2["cypher"]
 
-def test_traversal_parameter_safety():
+def test_traversal_parameter_safety(graph):
     """Test parameter safety in traversal queries."""
-    g = Graph.connect("bolt://localhost:7687", auth=("neo4j", "password"))
+    g = graph
     
     dangerous_input = "'); DROP TABLE Users;--"
     query = g.nodes("Person").traverse("WORKS_AT", to="Company").where(to__name=dangerous_input)
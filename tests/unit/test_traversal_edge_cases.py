@@ -2,12 +2,12 @@
 Edge case tests for traversal functionality.
 """
 
-import pytest
-from graphframe_neo4j import Graph
+from graphframe_neo4j.frames.compiler import _traversal_query_template, _traversal_where
 
-def test_empty_traversal():
+
+def test_empty_traversal(graph):
     """Test traversal with no conditions or selections."""
-    g = Graph.connect("bolt://localhost:7687", auth=("neo4j", "password"))
+    g = graph
     
     query = g.nodes("Person").traverse("WORKS_AT", to="Company")
     compiled = query.compile()
@@ -16,18 +16,18 @@ def test_empty_traversal():
     assert "RETURN from, rel, to" in compiled["cypher"]
     assert compiled["params"] == {}
 
-def test_traversal_with_no_to_label():
+def test_traversal_with_no_to_label(graph):
     """Test traversal without specifying to label."""
-    g = Graph.connect("bolt://localhost:7687", auth=("neo4j", "password"))
+    g = graph
     
     query = g.nodes("Person").traverse("WORKS_AT", to="")
     compiled = query.compile()
     
     assert "MATCH (from:Person)-rel:WORKS_AT->(to)" in compiled["cypher"]
 
-def test_complex_namespacing_with_operations():
+def test_complex_namespacing_with_operations(graph):
     """Test complex namespacing with various operations."""
-    g = Graph.connect("bolt://localhost:7687", auth=("neo4j", "password"))
+    g = graph
     
     query = g.nodes("Person").traverse("WORKS_AT", to="Company").where(
         from__age__gte=21,
@@ -45,9 +45,9 @@ def test_complex_namespacing_with_operations():
     assert "rel.since < $param_4" in compiled["cypher"]
     assert "rel.role CONTAINS $param_5" in compiled["cypher"]
 
-def test_mixed_namespacing_and_regular_filters():
+def test_mixed_namespacing_and_regular_filters(graph):
     """Test mixing namespaced and regular filter syntax."""
-    g = Graph.connect("bolt://localhost:7687", auth=("neo4j", "password"))
+    g = graph
     
     # This should work - namespaced fields take precedence
     query = g.nodes("Person").traverse("WORKS_AT", to="Company").where(
@@ -61,9 +61,9 @@ def test_mixed_namespacing_and_regular_filters():
     # Should have all conditions
     assert "WHERE from.age >= $param_0 AND from.city = $param_1 AND from.since >= $param_2" in compiled["cypher"]
 
-def test_traversal_with_null_operations():
+def test_traversal_with_null_operations(graph):
     """Test traversal with NULL operations."""
-    g = Graph.connect("bolt://localhost:7687", auth=("neo4j", "password"))
+    g = graph
     
     query = g.nodes("Person").traverse("WORKS_AT", to="Company").where(
         to__website__is_null=True,
@@ -75,9 +75,9 @@ def test_traversal_with_null_operations():
     assert "WHERE to.website IS NULL AND rel.end_date IS NOT NULL" in compiled["cypher"]
     assert compiled["params"] == {}  # No parameters for NULL ops
 
-def test_back_query_with_complex_filtering():
+def test_back_query_with_complex_filtering(graph):
     """Test back() query with complex filtering."""
-    g = Graph.connect("bolt://localhost:7687", auth=("neo4j", "password"))
+    g = graph
     
     traversal = (g.nodes("Person")
                 .traverse("WORKS_AT", to="Company")
@@ -105,9 +105,9 @@ def test_back_query_with_complex_filtering():
     assert "ORDER BY from.age DESC" in compiled["cypher"]
     assert "LIMIT 10" in compiled["cypher"]
 
-def test_traversal_with_special_characters():
+def test_traversal_with_special_characters(graph):
     """Test traversal with special characters in values."""
-    g = Graph.connect("bolt://localhost:7687", auth=("neo4j", "password"))
+    g = graph
     
     special_values = {
         "to__name": "O'Reilly Media",
@@ -127,9 +127,9 @@ def test_traversal_with_special_characters():
     assert compiled["params"]["param_1"] == "test@example.com"
     assert compiled["params"]["param_2"] == "It's a great company!"
 
-def test_traversal_with_unicode():
+def test_traversal_with_unicode(graph):
     """Test traversal with Unicode values."""
-    g = Graph.connect("bolt://localhost:7687", auth=("neo4j", "password"))
+    g = graph
     
     unicode_values = {
         "to__name": "José's Company",
@@ -149,9 +149,9 @@ def test_traversal_with_unicode():
     assert "José's Company" not in compiled["cypher"]
     assert "👍" not in compiled["cypher"]
 
-def test_traversal_with_large_parameter_values():
+def test_traversal_with_large_parameter_values(graph):
     """Test traversal with large parameter values."""
-    g = Graph.connect("bolt://localhost:7687", auth=("neo4j", "password"))
+    g = graph
     
     large_string = "A" * 10000
     large_list = list(range(1000))
@@ -167,10 +167,13 @@ def test_traversal_with_large_parameter_values():
     assert compiled["params"]["param_0"] == large_string
     assert compiled["params"]["param_1"] == large_list
     assert large_string not in compiled["cypher"]
+    # Values are bound as is, without copying or sanitizing
+    assert compiled["params"]["param_0"] is large_string
+    assert compiled["params"]["param_1"] is large_list
 
-def test_traversal_chaining_complexity():
+def test_traversal_chaining_complexity(graph):
     """Test complex method chaining order."""
-    g = Graph.connect("bolt://localhost:7687", auth=("neo4j", "password"))
+    g = graph
     
     # Complex chaining in different orders should work
     query1 = (g.nodes("Person")
@@ -200,9 +203,9 @@ def test_traversal_chaining_complexity():
         assert "ORDER BY to.name ASC" in compiled["cypher"]
         assert "LIMIT 10" in compiled["cypher"]
 
-def test_back_query_with_no_traversal_filters():
+def test_back_query_with_no_traversal_filters(graph):
     """Test back() query when no traversal filters were applied."""
-    g = Graph.connect("bolt://localhost:7687", auth=("neo4j", "password"))
+    g = graph
     
     traversal = g.nodes("Person").traverse("WORKS_AT", to="Company")
     back_query = traversal.back().where(age__gte=21)
@@ -214,9 +217,9 @@ def test_back_query_with_no_traversal_filters():
     assert "WITH from" in compiled["cypher"]
     assert "RETURN from" in compiled["cypher"]
 
-def test_traversal_with_zero_and_negative_limits():
+def test_traversal_with_zero_and_negative_limits(graph):
     """Test traversal with edge case limit values."""
-    g = Graph.connect("bolt://localhost:7687", auth=("neo4j", "password"))
+    g = graph
     
     # Zero limit
     query1 = g.nodes("Person").traverse("WORKS_AT", to="Company").limit(0)
@@ -233,9 +236,9 @@ def test_traversal_with_zero_and_negative_limits():
     compiled3 = query3.compile()
     assert "LIMIT 1000000" in compiled3["cypher"]
 
-def test_traversal_compiler_reusability():
+def test_traversal_compiler_reusability(graph):
     """Test that traversal compiler can handle multiple queries."""
-    g = Graph.connect("bolt://localhost:7687", auth=("neo4j", "password"))
+    g = graph
     
     # Create multiple traversal queries
     queries = [
@@ -257,9 +260,9 @@ def test_traversal_compiler_reusability():
     assert "HAS_OFFICE" in compiled_queries[1]["cypher"]
     assert "KNOWS" in compiled_queries[2]["cypher"]
 
-def test_empty_selection_in_traversal():
+def test_empty_selection_in_traversal(graph):
     """Test traversal with empty field selection."""
-    g = Graph.connect("bolt://localhost:7687", auth=("neo4j", "password"))
+    g = graph
     
     query = g.nodes("Person").traverse("WORKS_AT", to="Company").select()
     compiled = query.compile()
@@ -267,12 +270,56 @@ def test_empty_selection_in_traversal():
     # Should return all aliases by default
     assert "RETURN from, rel, to" in compiled["cypher"]
 
-def test_traversal_with_wildcard_selection():
+def test_traversal_with_wildcard_selection(graph):
     """Test traversal with wildcard selection."""
-    g = Graph.connect("bolt://localhost:7687", auth=("neo4j", "password"))
+    g = graph
     
     query = g.nodes("Person").traverse("WORKS_AT", to="Company").select("*")
     compiled = query.compile()
     
     # Should return all aliases
     assert "RETURN from, rel, to" in compiled["cypher"]
+
+def test_traversal_shape_is_cached(graph):
+    """Test that repeated traversal shapes reuse the cached Cypher and only rebind values."""
+    g = graph
+    g.nodes("Person").traverse("WORKS_AT", to="Company").where(to__city="SF").compile()
+    g.nodes("Person").traverse("WORKS_AT", to="Company").where(to__city="SF").back().compile()
+    hits = _traversal_query_template.cache_info().hits
+
+    compiled = g.nodes("Person").traverse("WORKS_AT", to="Company").where(to__city="NYC").compile()
+    back = g.nodes("Person").traverse("WORKS_AT", to="Company").where(to__city="NYC").back().compile()
+
+    assert _traversal_query_template.cache_info().hits == hits + 2
+    assert compiled["cypher"].startswith("MATCH (from:Person)-rel:WORKS_AT->(to:Company)\n")
+    assert back["cypher"].startswith("MATCH path = (from:Person)-rel:WORKS_AT->(to:Company)\n")
+    assert compiled["params"] == back["params"] == {"param_0": "NYC"}
+
+def test_back_reuses_traversal_where_fragment(graph):
+    """Test that back() reuses the WHERE fragment built for the traversal."""
+    g = graph
+    path = g.nodes("Person").traverse("WORKS_AT", to="Company").where(
+        to__industry="Tech", rel__since__gte=2019, from__age__lt=40
+    )
+    compiled = path.compile()
+    hits = _traversal_where.cache_info().hits
+    back = path.back().compile()
+
+    assert _traversal_where.cache_info().hits == hits + 1
+    where = compiled["cypher"].split("\n")[1]
+    assert where.startswith("WHERE ")
+    assert back["cypher"].split("\n")[1] == where
+    assert back["params"] == compiled["params"]
+
+def test_traversal_chain_shares_one_frame(graph):
+    """Test that traversal chaining mutates one slotted frame and back() detaches from it."""
+    g = graph
+
+    path = g.nodes("Person").traverse("WORKS_AT", to="Company")
+    chained = path.where(to__city="SF").select("from__name").order_by("from__name").limit(5)
+    back = chained.back()
+    path.where(rel__since__gte=2020)
+
+    assert chained is path
+    assert not hasattr(path, "__dict__")
+    assert [f["field"] for f in back._filters] == ["to__city"]
@@ -2,11 +2,9 @@
 Test basic write operations.
 """
 
-from graphframe_neo4j import Graph
-
-def test_node_upsert():
+def test_node_upsert(graph):
     """Test node upsert operation."""
-    g = Graph.connect("bolt://localhost:7687", auth=("neo4j", "password"))
+    g = graph
     
     # Test upsert with single record
     data = [{"email": "john@example.com", "name": "John", "age": 30}]
@@ -24,9 +22,9 @@ def test_node_upsert():
     stats = plan.commit()
     assert isinstance(stats, dict)
 
-def test_node_patch():
+def test_node_patch(graph):
     """Test node patch operation."""
-    g = Graph.connect("bolt://localhost:7687", auth=("neo4j", "password"))
+    g = graph
     
     plan = g.nodes("Person").where(country="US").patch(active=True)
     
@@ -36,9 +34,9 @@ def test_node_patch():
     stats = plan.commit()
     assert isinstance(stats, dict)
 
-def test_node_delete():
+def test_node_delete(graph):
     """Test node delete operation."""
-    g = Graph.connect("bolt://localhost:7687", auth=("neo4j", "password"))
+    g = graph
     
     plan = g.nodes("Temp").where(obsolete=True).delete(detach=True)
     
@@ -48,9 +46,9 @@ def test_node_delete():
     stats = plan.commit()
     assert isinstance(stats, dict)
 
-def test_relationship_upsert():
+def test_relationship_upsert(graph):
     """Test relationship upsert operation."""
-    g = Graph.connect("bolt://localhost:7687", auth=("neo4j", "password"))
+    g = graph
     
     data = [{"email": "john@example.com", "domain": "company.com", "since": "2020-01-01", "role": "Engineer"}]
     plan = g.rels("WORKS_AT").upsert(
@@ -66,9 +64,9 @@ def test_relationship_upsert():
     stats = plan.commit()
     assert isinstance(stats, dict)
 
-def test_schema_operations():
+def test_schema_operations(graph):
     """Test schema operations."""
-    g = Graph.connect("bolt://localhost:7687", auth=("neo4j", "password"))
+    g = graph
     
     schema = g.schema()
     
@@ -2,17 +2,22 @@
 Test write operations compilation.
 """
 
+from types import MappingProxyType
+
 import pytest
+
 from graphframe_neo4j import Graph
 from graphframe_neo4j.util.errors import WriteError
+from graphframe_neo4j.write.advanced import AdvancedUpdateCompiler, _advanced_template
+from graphframe_neo4j.write.upsert import UpsertCompiler, _column_builder
+from graphframe_neo4j.write.writeplan import WritePlan
 
-def test_node_upsert_compilation():
+
+def test_node_upsert_compilation(graph):
     """Test node upsert compilation."""
-    g = Graph.connect("bolt://localhost:7687", auth=("neo4j", "password"))
-    
     # Simple upsert
     data = [{"email": "john@example.com", "name": "John", "age": 30}]
-    plan = g.nodes("Person").upsert(data, key="email")
+    plan = graph.nodes("Person").upsert(data, key="email")
     compiled = plan.compile()
     
     assert "UNWIND $batch AS item" in compiled["cypher"]
@@ -21,65 +26,137 @@ def test_node_upsert_compilation():
     assert "SET n.age = item.age" in compiled["cypher"]
     assert compiled["params"]["batch"] == data
 
-def test_node_upsert_with_patch():
+def test_node_upsert_with_patch(graph):
     """Test node upsert with patch mode."""
-    g = Graph.connect("bolt://localhost:7687", auth=("neo4j", "password"))
-    
     data = [{"email": "john@example.com", "name": "John", "age": 30}]
-    plan = g.nodes("Person").upsert(data, key="email", patch=True)
+    plan = graph.nodes("Person").upsert(data, key="email", patch=True)
     compiled = plan.compile()
     
     assert "case when item.name IS NOT NULL" in compiled["cypher"]
     assert "case when item.age IS NOT NULL" in compiled["cypher"]
     assert "SET n.age = case when item.age IS NOT NULL then item.age else n.age end" in compiled["cypher"]
 
-def test_node_upsert_composite_key():
+def test_node_upsert_composite_key(graph):
     """Test node upsert with composite key."""
-    g = Graph.connect("bolt://localhost:7687", auth=("neo4j", "password"))
-    
     data = [{"email": "john@example.com", "username": "john", "name": "John"}]
-    plan = g.nodes("Person").upsert(data, key=["email", "username"])
+    plan = graph.nodes("Person").upsert(data, key=["email", "username"])
     compiled = plan.compile()
     
     assert "MERGE (n:Person {email: item.email, username: item.username})" in compiled["cypher"]
 
-def test_node_upsert_multiple_records():
+def test_node_upsert_multiple_records(graph):
     """Test node upsert with multiple records."""
-    g = Graph.connect("bolt://localhost:7687", auth=("neo4j", "password"))
-    
     data = [
         {"email": "john@example.com", "name": "John", "age": 30},
         {"email": "jane@example.com", "name": "Jane", "age": 25}
     ]
-    plan = g.nodes("Person").upsert(data, key="email")
+    plan = graph.nodes("Person").upsert(data, key="email")
     compiled = plan.compile()
     
     assert compiled["params"]["batch"] == data
     assert len(compiled["params"]["batch"]) == 2
 
-def test_node_upsert_with_null_policy():
+def test_node_upsert_with_null_policy(graph):
     """Test node upsert with different null policies."""
-    g = Graph.connect("bolt://localhost:7687", auth=("neo4j", "password"))
-    
     data = [{"email": "john@example.com", "name": "John", "age": None}]
     
     # ignore_nulls (default)
-    plan1 = g.nodes("Person").upsert(data, key="email", null_policy="ignore_nulls")
+    plan1 = graph.nodes("Person").upsert(data, key="email", null_policy="ignore_nulls")
     compiled1 = plan1.compile()
     assert "case when item.age IS NOT NULL" in compiled1["cypher"]
     
     # set_nulls
-    plan2 = g.nodes("Person").upsert(data, key="email", null_policy="set_nulls")
+    plan2 = graph.nodes("Person").upsert(data, key="email", null_policy="set_nulls")
     compiled2 = plan2.compile()
     assert "n.age = item.age" in compiled2["cypher"]
     assert "case when" not in compiled2["cypher"]
 
-def test_relationship_upsert_compilation():
+def test_patch_mode_shares_upsert_template():
+    """Test that patch and full upserts with the same null policy share one template."""
+    compiler = UpsertCompiler()
+    rows = [{"email": "a@example.com", "name": "A"}]
+    full = compiler.compile_node_upsert("PatchPerson", rows, "email", patch=False, null_policy="ignore_nulls")
+    misses = UpsertCompiler.cache_info().misses
+    patched = compiler.compile_node_upsert("PatchPerson", rows, "email", patch=True, null_policy="ignore_nulls")
+
+    assert UpsertCompiler.cache_info().misses == misses
+    assert patched["cypher"] is full["cypher"]
+
+def test_node_upsert_reuses_cached_template(graph):
+    """Test that upserts of the same shape share one compiled Cypher template."""
+    first = graph.nodes("CachedPerson").upsert([{"email": "a@example.com", "name": "A"}], key="email").compile()
+    hits = WritePlan.cache_info().hits
+    second = graph.nodes("CachedPerson").upsert([{"email": "b@example.com", "name": "B"}], key="email").compile()
+
+    assert WritePlan.cache_info().hits == hits + 1
+    assert second["cypher"] is first["cypher"]
+    assert second["params"]["batch"] == [{"email": "b@example.com", "name": "B"}]
+
+    # A different shape compiles its own template
+    third = graph.nodes("CachedPerson").upsert([{"email": "c@example.com", "age": 3}], key="email").compile()
+    assert "SET n.age = item.age" in third["cypher"]
+    assert "SET n.name" not in third["cypher"]
+
+def test_node_upsert_soa_layout(graph):
+    """Test node upsert with column-oriented (SoA) parameters."""
+    data = [
+        {"email": "john@example.com", "name": "John", "age": 30},
+        {"email": "jane@example.com", "name": "Jane"}
+    ]
+    compiled = graph.nodes("Person").upsert(data, key="email", layout="soa").compile()
+
+    assert "UNWIND range(0, $count - 1) AS i" in compiled["cypher"]
+    assert "MERGE (n:Person {email: $columns.email[i]})" in compiled["cypher"]
+    assert "SET n.name = $columns.name[i]" in compiled["cypher"]
+    assert compiled["params"] == {
+        "columns": {
+            "email": ["john@example.com", "jane@example.com"],
+            "age": [30, None],
+            "name": ["John", "Jane"]
+        },
+        "count": 2
+    }
+
+def test_soa_column_builder():
+    """Test the per-shape row -> column transposer."""
+    rows = [{"email": "a", "age": 1}, {"email": "b", "age": 2}]
+    assert _column_builder(("email", "age"))(rows) == {"email": ["a", "b"], "age": [1, 2]}
+    assert _column_builder(("email",))(rows) == {"email": ["a", "b"]}
+    assert _column_builder(("email", "age")) is _column_builder(("email", "age"))
+
+    # Rows missing a column fall back to None
+    assert _column_builder(("email", "name"))(rows) == {"email": ["a", "b"], "name": [None, None]}
+
+def test_node_upsert_from_arrow_batch(graph):
+    """Test node upsert from a pyarrow RecordBatch in both layouts."""
+    pa = pytest.importorskip("pyarrow")
+    batch = pa.RecordBatch.from_pylist([
+        {"email": "john@example.com", "name": "John"},
+        {"email": "jane@example.com", "name": None}
+    ])
+
+    soa = graph.nodes("Person").upsert(batch, key="email", layout="soa").compile()
+    assert soa["params"] == {
+        "columns": {"email": ["john@example.com", "jane@example.com"], "name": ["John", None]},
+        "count": 2
+    }
+    assert soa["stats"]["nodes_processed"] == 2
+
+    aos = graph.nodes("Person").upsert(batch, key="email").compile()
+    assert aos["params"]["batch"] == batch.to_pylist()
+
+    with pytest.raises(WriteError, match="Key field 'id' not found in data columns"):
+        graph.nodes("Person").upsert(batch, key="id", layout="soa").compile()
+
+def test_upsert_unknown_layout(graph):
+    """Test that an unknown upsert layout is rejected."""
+    with pytest.raises(WriteError, match="Unknown upsert layout"):
+        graph.nodes("Person").upsert([{"email": "a@example.com"}], key="email", layout="columns").compile()
+
+def test_relationship_upsert_compilation(graph):
     """Test relationship upsert compilation."""
-    g = Graph.connect("bolt://localhost:7687", auth=("neo4j", "password"))
-    
     data = [{"email": "john@example.com", "domain": "company.com", "since": 2020, "role": "Engineer"}]
-    plan = g.rels("WORKS_AT").upsert(
+    plan = graph.rels("WORKS_AT").upsert(
         data, 
         src=("Person", "email"), 
         dst=("Company", "domain")
@@ -93,12 +170,10 @@ def test_relationship_upsert_compilation():
     assert "SET r.since = item.since" in compiled["cypher"]
     assert "SET r.role = item.role" in compiled["cypher"]
 
-def test_relationship_upsert_with_rel_key():
+def test_relationship_upsert_with_rel_key(graph):
     """Test relationship upsert with relationship key."""
-    g = Graph.connect("bolt://localhost:7687", auth=("neo4j", "password"))
-    
     data = [{"email": "john@example.com", "domain": "company.com", "since": 2020, "role": "Engineer"}]
-    plan = g.rels("WORKS_AT").upsert(
+    plan = graph.rels("WORKS_AT").upsert(
         data, 
         src=("Person", "email"), 
         dst=("Company", "domain"),
@@ -109,12 +184,10 @@ def test_relationship_upsert_with_rel_key():
     assert "MERGE (a)-[r:WORKS_AT {since: item.since, role: item.role}]->(b)" in compiled["cypher"]
 
 
-def test_relationship_update_compilation():
+def test_relationship_update_compilation(graph):
     """Test relationship update compilation."""
-    g = Graph.connect("bolt://localhost:7687", auth=("neo4j", "password"))
-    
     # Update with where conditions
-    query = g.rels("WORKS_AT").where(role="Engineer")
+    query = graph.rels("WORKS_AT").where(role="Engineer")
     plan = query.patch(active=True, salary=100000)
     compiled = plan.compile()
     
@@ -126,12 +199,18 @@ def test_relationship_update_compilation():
     assert compiled["params"]["param_1"] == 100000
 
 
-def test_relationship_delete_compilation():
-    """Test relationship delete compilation."""
-    g = Graph.connect("bolt://localhost:7687", auth=("neo4j", "password"))
+def test_update_reuses_cached_template(graph):
+    """Test that updates with the same shape share the Cypher and rebind values."""
+    first = graph.nodes("Person").where(age__gte=18).patch(status="active").compile()
+    second = graph.nodes("Person").where(age__gte=65).patch(status="retired").compile()
     
+    assert second["cypher"] is first["cypher"]
+    assert second["params"] == {"param_0": "retired", "where_0": 65}
+
+def test_relationship_delete_compilation(graph):
+    """Test relationship delete compilation."""
     # Delete with where conditions
-    query = g.rels("WORKS_AT").where(status="inactive")
+    query = graph.rels("WORKS_AT").where(status="inactive")
     plan = query.delete()
     compiled = plan.compile()
     
@@ -141,12 +220,10 @@ def test_relationship_delete_compilation():
     assert compiled["params"]["where_0"] == "inactive"
 
 
-def test_relationship_update_with_null_policy():
+def test_relationship_update_with_null_policy(graph):
     """Test relationship update with null policy."""
-    g = Graph.connect("bolt://localhost:7687", auth=("neo4j", "password"))
-    
     # ignore_nulls (default) - should ignore None values
-    query = g.rels("WORKS_AT").where(role="Engineer")
+    query = graph.rels("WORKS_AT").where(role="Engineer")
     plan = query.patch(active=True, last_updated=None)
     compiled = plan.compile()
     
@@ -155,11 +232,9 @@ def test_relationship_update_with_null_policy():
     assert "last_updated" not in compiled["cypher"]
 
 
-def test_advanced_inc_update():
+def test_advanced_inc_update(graph):
     """Test increment update operation."""
-    g = Graph.connect("bolt://localhost:7687", auth=("neo4j", "password"))
-    
-    query = g.nodes("Person").where(name="John")
+    query = graph.nodes("Person").where(name="John")
     plan = query.inc("score", 10)
     compiled = plan.compile()
     
@@ -170,11 +245,9 @@ def test_advanced_inc_update():
     assert compiled["params"]["inc_1"] == 10
 
 
-def test_advanced_unset_update():
+def test_advanced_unset_update(graph):
     """Test unset (remove property) operation."""
-    g = Graph.connect("bolt://localhost:7687", auth=("neo4j", "password"))
-    
-    query = g.nodes("Person").where(status="inactive")
+    query = graph.nodes("Person").where(status="inactive")
     plan = query.unset("temporary_field")
     compiled = plan.compile()
     
@@ -184,11 +257,9 @@ def test_advanced_unset_update():
     assert compiled["params"]["where_0"] == "inactive"
 
 
-def test_advanced_list_append():
+def test_advanced_list_append(graph):
     """Test list append operation."""
-    g = Graph.connect("bolt://localhost:7687", auth=("neo4j", "password"))
-    
-    query = g.nodes("Person").where(email="john@example.com")
+    query = graph.nodes("Person").where(email="john@example.com")
     plan = query.list_append("tags", "premium")
     compiled = plan.compile()
     
@@ -199,11 +270,9 @@ def test_advanced_list_append():
     assert compiled["params"]["list_1"] == "premium"
 
 
-def test_advanced_list_remove():
+def test_advanced_list_remove(graph):
     """Test list remove operation."""
-    g = Graph.connect("bolt://localhost:7687", auth=("neo4j", "password"))
-    
-    query = g.nodes("Person").where(role="Engineer")
+    query = graph.nodes("Person").where(role="Engineer")
     plan = query.list_remove("tags", "temp")
     compiled = plan.compile()
     
@@ -214,11 +283,9 @@ def test_advanced_list_remove():
     assert compiled["params"]["list_1"] == "temp"
 
 
-def test_advanced_map_merge():
+def test_advanced_map_merge(graph):
     """Test map merge operation."""
-    g = Graph.connect("bolt://localhost:7687", auth=("neo4j", "password"))
-    
-    query = g.nodes("Person").where(country="US")
+    query = graph.nodes("Person").where(country="US")
     metadata = {"last_updated": "2024-01-01", "source": "import"}
     plan = query.map_merge("metadata", metadata)
     compiled = plan.compile()
@@ -230,183 +297,195 @@ def test_advanced_map_merge():
     assert compiled["params"]["map_1"] == metadata
 
 
-def test_advanced_operations_without_where():
+def test_advanced_operations_without_where(graph):
     """Test advanced operations without where conditions."""
-    g = Graph.connect("bolt://localhost:7687", auth=("neo4j", "password"))
-    
     # Test inc without where
-    plan = g.nodes("Person").inc("views", 1)
+    plan = graph.nodes("Person").inc("views", 1)
     compiled = plan.compile()
     assert "MATCH (n:Person)" in compiled["cypher"]
     assert "WHERE" not in compiled["cypher"]  # No WHERE clause
     assert "SET n.views = coalesce(n.views, 0) + $inc_0" in compiled["cypher"]
 
 
-def test_schema_ensure_unique():
-    """Test schema ensure_unique operation."""
-    g = Graph.connect("bolt://localhost:7687", auth=("neo4j", "password"))
+def test_advanced_operations_are_write_plans(graph):
+    """Test that advanced updates dispatch through WritePlan like other writes."""
+    compiler = AdvancedUpdateCompiler(graph)
+    conditions = [{"field": "country", "op": "eq", "value": "US"}]
+
+    plans = {
+        "inc": (graph.nodes("Person").where(country="US").inc("views", 1),
+                compiler.compile_inc_update("Person", "views", 1, conditions)),
+        "unset": (graph.nodes("Person").where(country="US").unset("temp"),
+                  compiler.compile_unset_update("Person", "temp", conditions)),
+        "list_append": (graph.nodes("Person").where(country="US").list_append("tags", "a"),
+                        compiler.compile_list_append("Person", "tags", "a", conditions)),
+        "map_merge": (graph.nodes("Person").where(country="US").map_merge("meta", {"k": 1}),
+                      compiler.compile_map_merge("Person", "meta", {"k": 1}, conditions)),
+    }
+
+    for kind, (plan, expected) in plans.items():
+        assert repr(plan) == f"<WritePlan {kind} Person>"
+        assert plan.compile() == expected
+
+def test_write_plans_snapshot_frame_filters(graph):
+    """Test that filters added to a frame after planning a write do not leak into the plan."""
+    people = graph.nodes("Person").where(country="US")
+    works_at = graph.rels("WORKS_AT").where(role="engineer")
+    plans = [
+        people.patch(active=True), people.inc("views", 1), people.delete(),
+        works_at.patch(active=True), works_at.delete(),
+    ]
+
+    people.where(age__gt=30)
+    works_at.where(since__lt=2020)
     
-    plan = g.schema().ensure_unique("Person", "email")
+    for plan in plans:
+        compiled = plan.compile()
+        assert "age" not in compiled.cypher and "since" not in compiled.cypher
+        assert not {30, 2020} & set(compiled.params.values())
+
+
+def test_schema_ensure_unique(graph):
+    """Test schema ensure_unique operation."""
+    plan = graph.schema().ensure_unique("Person", "email")
     compiled = plan.compile()
     
     assert "CREATE CONSTRAINT IF NOT EXISTS constraint_Person_email" in compiled["cypher"]
     assert "FOR (n:Person) REQUIRE n.email IS UNIQUE" in compiled["cypher"]
 
 
-def test_schema_ensure_index():
+def test_schema_ensure_index(graph):
     """Test schema ensure_index operation."""
-    g = Graph.connect("bolt://localhost:7687", auth=("neo4j", "password"))
-    
-    plan = g.schema().ensure_index("Person", "name")
+    plan = graph.schema().ensure_index("Person", "name")
     compiled = plan.compile()
     
     assert "CREATE INDEX IF NOT EXISTS index_Person_name" in compiled["cypher"]
     assert "FOR (n:Person) ON (n.name)" in compiled["cypher"]
 
 
-def test_schema_ensure_node_key():
+def test_schema_ensure_node_key(graph):
     """Test schema ensure_node_key operation."""
-    g = Graph.connect("bolt://localhost:7687", auth=("neo4j", "password"))
-    
-    plan = g.schema().ensure_node_key("Person", ["email", "username"])
+    plan = graph.schema().ensure_node_key("Person", ["email", "username"])
     compiled = plan.compile()
     
     assert "CREATE CONSTRAINT IF NOT EXISTS constraint_Person_email_username" in compiled["cypher"]
     assert "FOR (n:Person) REQUIRE (n.email, n.username) IS NODE KEY" in compiled["cypher"]
 
 
-def test_schema_drop_unique():
+def test_schema_drop_unique(graph):
     """Test schema drop_unique operation."""
-    g = Graph.connect("bolt://localhost:7687", auth=("neo4j", "password"))
-    
-    plan = g.schema().drop_unique("Person", "email")
+    plan = graph.schema().drop_unique("Person", "email")
     compiled = plan.compile()
     
     assert "DROP CONSTRAINT IF EXISTS constraint_Person_email" in compiled["cypher"]
 
 
-def test_schema_drop_index():
+def test_schema_drop_index(graph):
     """Test schema drop_index operation."""
-    g = Graph.connect("bolt://localhost:7687", auth=("neo4j", "password"))
-    
-    plan = g.schema().drop_index("Person", "name")
+    plan = graph.schema().drop_index("Person", "name")
     compiled = plan.compile()
     
     assert "DROP INDEX IF EXISTS index_Person_name" in compiled["cypher"]
 
 
-def test_schema_ensure_unique():
+def test_schema_ensure_unique(graph):
     """Test schema ensure_unique operation."""
-    g = Graph.connect("bolt://localhost:7687", auth=("neo4j", "password"))
-    
-    plan = g.schema().ensure_unique("Person", "email")
+    plan = graph.schema().ensure_unique("Person", "email")
     compiled = plan.compile()
     
     assert "CREATE CONSTRAINT IF NOT EXISTS constraint_Person_email" in compiled["cypher"]
     assert "FOR (n:Person) REQUIRE n.email IS UNIQUE" in compiled["cypher"]
 
 
-def test_schema_ensure_index():
+def test_schema_ensure_index(graph):
     """Test schema ensure_index operation."""
-    g = Graph.connect("bolt://localhost:7687", auth=("neo4j", "password"))
-    
-    plan = g.schema().ensure_index("Person", "name")
+    plan = graph.schema().ensure_index("Person", "name")
     compiled = plan.compile()
     
     assert "CREATE INDEX IF NOT EXISTS index_Person_name" in compiled["cypher"]
     assert "FOR (n:Person) ON (n.name)" in compiled["cypher"]
 
 
-def test_schema_ensure_node_key():
+def test_schema_ensure_node_key(graph):
     """Test schema ensure_node_key operation."""
-    g = Graph.connect("bolt://localhost:7687", auth=("neo4j", "password"))
-    
-    plan = g.schema().ensure_node_key("Person", ["email", "username"])
+    plan = graph.schema().ensure_node_key("Person", ["email", "username"])
     compiled = plan.compile()
     
     assert "CREATE CONSTRAINT IF NOT EXISTS constraint_Person_email_username" in compiled["cypher"]
     assert "FOR (n:Person) REQUIRE (n.email, n.username) IS NODE KEY" in compiled["cypher"]
 
 
-def test_schema_drop_unique():
+def test_schema_drop_unique(graph):
     """Test schema drop_unique operation."""
-    g = Graph.connect("bolt://localhost:7687", auth=("neo4j", "password"))
-    
-    plan = g.schema().drop_unique("Person", "email")
+    plan = graph.schema().drop_unique("Person", "email")
     compiled = plan.compile()
     
     assert "DROP CONSTRAINT IF EXISTS constraint_Person_email" in compiled["cypher"]
 
 
-def test_schema_drop_index():
+def test_schema_drop_index(graph):
     """Test schema drop_index operation."""
-    g = Graph.connect("bolt://localhost:7687", auth=("neo4j", "password"))
-    
-    plan = g.schema().drop_index("Person", "name")
+    plan = graph.schema().drop_index("Person", "name")
     compiled = plan.compile()
     
     assert "DROP INDEX IF EXISTS index_Person_name" in compiled["cypher"]
 
 
-def test_schema_ensure_unique():
+def test_schema_ensure_unique(graph):
     """Test schema ensure_unique operation."""
-    g = Graph.connect("bolt://localhost:7687", auth=("neo4j", "password"))
-    
-    plan = g.schema().ensure_unique("Person", "email")
+    plan = graph.schema().ensure_unique("Person", "email")
     compiled = plan.compile()
     
     assert "CREATE CONSTRAINT IF NOT EXISTS constraint_Person_email" in compiled["cypher"]
     assert "FOR (n:Person) REQUIRE n.email IS UNIQUE" in compiled["cypher"]
 
 
-def test_schema_ensure_index():
+def test_schema_ensure_index(graph):
     """Test schema ensure_index operation."""
-    g = Graph.connect("bolt://localhost:7687", auth=("neo4j", "password"))
-    
-    plan = g.schema().ensure_index("Person", "name")
+    plan = graph.schema().ensure_index("Person", "name")
     compiled = plan.compile()
     
     assert "CREATE INDEX IF NOT EXISTS index_Person_name" in compiled["cypher"]
     assert "FOR (n:Person) ON (n.name)" in compiled["cypher"]
 
 
-def test_schema_ensure_node_key():
+def test_schema_ensure_node_key(graph):
     """Test schema ensure_node_key operation."""
-    g = Graph.connect("bolt://localhost:7687", auth=("neo4j", "password"))
-    
-    plan = g.schema().ensure_node_key("Person", ["email", "username"])
+    plan = graph.schema().ensure_node_key("Person", ["email", "username"])
     compiled = plan.compile()
     
     assert "CREATE CONSTRAINT IF NOT EXISTS constraint_Person_email_username" in compiled["cypher"]
     assert "FOR (n:Person) REQUIRE (n.email, n.username) IS NODE KEY" in compiled["cypher"]
 
 
-def test_schema_drop_unique():
+def test_schema_drop_unique(graph):
     """Test schema drop_unique operation."""
-    g = Graph.connect("bolt://localhost:7687", auth=("neo4j", "password"))
-    
-    plan = g.schema().drop_unique("Person", "email")
+    plan = graph.schema().drop_unique("Person", "email")
     compiled = plan.compile()
     
     assert "DROP CONSTRAINT IF EXISTS constraint_Person_email" in compiled["cypher"]
 
 
-def test_schema_drop_index():
+def test_schema_drop_index(graph):
     """Test schema drop_index operation."""
-    g = Graph.connect("bolt://localhost:7687", auth=("neo4j", "password"))
-    
-    plan = g.schema().drop_index("Person", "name")
+    plan = graph.schema().drop_index("Person", "name")
     compiled = plan.compile()
     
     assert "DROP INDEX IF EXISTS index_Person_name" in compiled["cypher"]
     assert compiled["params"] == {}
 
-def test_relationship_upsert_composite_keys():
-    """Test relationship upsert with composite keys."""
-    g = Graph.connect("bolt://localhost:7687", auth=("neo4j", "password"))
+
+def test_schema_ddl_is_memoized(graph):
+    """Test that repeated schema operations reuse the generated DDL."""
+    first = graph.schema().ensure_node_key("Person", ["email", "username"]).compile()
+    second = graph.schema().ensure_node_key("Person", ("email", "username")).compile()
     
+    assert second["cypher"] is first["cypher"]
+
+def test_relationship_upsert_composite_keys(graph):
+    """Test relationship upsert with composite keys."""
     data = [{"email": "john@example.com", "username": "john", "domain": "company.com", "name": "Acme"}]
-    plan = g.rels("WORKS_AT").upsert(
+    plan = graph.rels("WORKS_AT").upsert(
         data, 
         src=("Person", ["email", "username"]), 
         dst=("Company", ["domain", "name"])
@@ -416,12 +495,10 @@ def test_relationship_upsert_composite_keys():
     assert "MERGE (a:Person {email: item.email, username: item.username})" in compiled["cypher"]
     assert "MERGE (b:Company {domain: item.domain, name: item.name})" in compiled["cypher"]
 
-def test_node_update_compilation():
+def test_node_update_compilation(graph):
     """Test node update compilation."""
-    g = Graph.connect("bolt://localhost:7687", auth=("neo4j", "password"))
-    
     # Update with where conditions
-    query = g.nodes("Person").where(country="US")
+    query = graph.nodes("Person").where(country="US")
     plan = query.patch(active=True, last_updated="2024-01-01")
     compiled = plan.compile()
     
@@ -432,12 +509,10 @@ def test_node_update_compilation():
     assert compiled["params"]["param_0"] == True
     assert compiled["params"]["param_1"] == "2024-01-01"
 
-def test_node_update_with_null_policy():
+def test_node_update_with_null_policy(graph):
     """Test node update with null policy."""
-    g = Graph.connect("bolt://localhost:7687", auth=("neo4j", "password"))
-    
     # ignore_nulls (default) - should ignore None values
-    query = g.nodes("Person").where(country="US")
+    query = graph.nodes("Person").where(country="US")
     plan = query.patch(active=True, last_updated=None)
     compiled = plan.compile()
     
@@ -446,12 +521,10 @@ def test_node_update_with_null_policy():
     assert "last_updated" not in compiled["cypher"]
     assert "param_1" not in compiled["params"]
 
-def test_node_delete_compilation():
+def test_node_delete_compilation(graph):
     """Test node delete compilation."""
-    g = Graph.connect("bolt://localhost:7687", auth=("neo4j", "password"))
-    
     # Delete with where conditions
-    query = g.nodes("Person").where(country="US", status="inactive")
+    query = graph.nodes("Person").where(country="US", status="inactive")
     plan = query.delete()
     compiled = plan.compile()
     
@@ -461,69 +534,120 @@ def test_node_delete_compilation():
     assert compiled["params"]["where_0"] == "US"
     assert compiled["params"]["where_1"] == "inactive"
 
-def test_node_delete_with_detach():
+def test_node_delete_with_detach(graph):
     """Test node delete with detach."""
-    g = Graph.connect("bolt://localhost:7687", auth=("neo4j", "password"))
-    
-    query = g.nodes("Person").where(status="inactive")
+    query = graph.nodes("Person").where(status="inactive")
     plan = query.delete(detach=True)
     compiled = plan.compile()
     
     assert "DETACH DELETE n" in compiled["cypher"]
 
-def test_node_delete_with_null_operations():
+def test_node_delete_with_null_operations(graph):
     """Test node delete with NULL operations in where clause."""
-    g = Graph.connect("bolt://localhost:7687", auth=("neo4j", "password"))
-    
-    query = g.nodes("Person").where(email__is_null=True)
+    query = graph.nodes("Person").where(email__is_null=True)
     plan = query.delete()
     compiled = plan.compile()
     
     assert "WHERE n.email IS NULL" in compiled["cypher"]
     assert compiled["params"] == {}
 
-def test_write_plan_stats():
+def test_write_plan_stats(graph):
     """Test that write plans include statistics."""
-    g = Graph.connect("bolt://localhost:7687", auth=("neo4j", "password"))
-    
     data = [
         {"email": "john@example.com", "name": "John"},
         {"email": "jane@example.com", "name": "Jane"}
     ]
-    plan = g.nodes("Person").upsert(data, key="email")
+    plan = graph.nodes("Person").upsert(data, key="email")
     compiled = plan.compile()
     
     assert "stats" in compiled
     assert compiled["stats"]["nodes_processed"] == 2
     assert compiled["stats"]["batches"] == 1
 
-def test_empty_upsert():
+@pytest.mark.parametrize("build", [
+    lambda g, label: g.nodes(label).upsert([{"email": "a@example.com"}], key="email"),
+    lambda g, label: g.nodes(label).where(country="US").patch(active=True),
+    lambda g, label: g.nodes(label).where(country="US").delete(),
+    lambda g, label: g.nodes(label).inc("views", 1),
+    lambda g, label: g.schema().ensure_unique(label, "email"),
+    lambda g, label: g.rels("WORKS_AT").upsert(
+        [{"email": "a@example.com", "domain": "example.com"}], src=(label, "email"), dst=("Company", "domain")
+    ),
+], ids=["upsert", "patch", "delete", "inc", "ensure_unique", "relationship_upsert"])
+def test_write_label_validation(graph, build):
+    """Test that writes accept quoted labels and reject labels that need quoting, like reads."""
+    quoted = build(graph, "`My Label`").compile()
+    assert "My Label`" in quoted["cypher"]
+
+    with pytest.raises(WriteError, match="Invalid label"):
+        build(graph, "My-Label").compile()
+
+
+def test_quoted_names_in_ddl_and_upsert_keys(graph):
+    """Test that DDL names stay valid for quoted labels and odd data keys are quoted."""
+    unique = graph.schema().ensure_unique("`My Label`", "email").compile()
+    upsert = graph.nodes("Person").upsert([{"email": "a@example.com", "first name": "A"}], key="email").compile()
+
+    assert unique["cypher"] == (
+        "CREATE CONSTRAINT IF NOT EXISTS `constraint_My Label_email` FOR (n:`My Label`) REQUIRE n.email IS UNIQUE"
+    )
+    assert "SET n.`first name` = item.`first name`" in upsert["cypher"]
+    with pytest.raises(WriteError, match="Invalid relationship type"):
+        graph.rels("WORKS AT").where(role="x").delete().compile()
+
+
+def test_empty_upsert(graph):
     """Test upsert with empty data."""
-    g = Graph.connect("bolt://localhost:7687", auth=("neo4j", "password"))
-    
-    plan = g.nodes("Person").upsert([], key="email")
+    plan = graph.nodes("Person").upsert([], key="email")
     compiled = plan.compile()
     
     assert "// No data to upsert" in compiled["cypher"]
     assert compiled["params"] == {}
 
-def test_single_record_upsert():
-    """Test upsert with single record (not list)."""
-    g = Graph.connect("bolt://localhost:7687", auth=("neo4j", "password"))
+def test_empty_upsert_skips_templating(graph):
+    """Test that empty upserts report zero work without touching the template cache."""
+    misses = UpsertCompiler.cache_info().misses
+
+    node_plan = graph.nodes("Person").upsert([], key="missing")
+    rel_plan = graph.rels("WORKS_AT").upsert([], src=("Person", "email"), dst=("Company", "name"))
     
-    plan = g.nodes("Person").upsert({"email": "john@example.com", "name": "John"}, key="email")
+    assert node_plan.compile().stats == {"nodes_processed": 0, "batches": 0}
+    assert rel_plan.compile().stats == {"relationships_processed": 0, "batches": 0}
+    assert rel_plan.compile().cypher == "// No data to upsert"
+    assert UpsertCompiler.cache_info().misses == misses
+
+def test_empty_mapping_upsert_is_validated(graph):
+    """Test that an empty mapping is a record missing its keys, not an empty batch."""
+    with pytest.raises(WriteError, match="Key field 'email' not found"):
+        graph.nodes("Person").upsert({}, key="email").compile()
+
+    with pytest.raises(WriteError, match="Source key field 'email' not found"):
+        graph.rels("WORKS_AT").upsert({}, src=("Person", "email"), dst=("Company", "name")).compile()
+
+def test_single_record_upsert(graph):
+    """Test upsert with single record (not list)."""
+    plan = graph.nodes("Person").upsert({"email": "john@example.com", "name": "John"}, key="email")
     compiled = plan.compile()
     
     assert compiled["params"]["batch"] == [{"email": "john@example.com", "name": "John"}]
 
-def test_relationship_upsert_missing_key_fields():
-    """Test that relationship upsert validates key fields."""
-    g = Graph.connect("bolt://localhost:7687", auth=("neo4j", "password"))
+def test_mapping_and_generator_upsert(graph):
+    """Test that any mapping is one record and any iterable of records is materialized."""
+    record = MappingProxyType({"email": "john@example.com", "name": "John"})
+
+    single = graph.nodes("Person").upsert(record, key="email").compile()
+    rows = graph.nodes("Person").upsert((dict(record) for _ in range(2)), key="email").compile()
     
+    assert single["params"]["batch"] == [record]
+    assert rows["params"]["batch"] == [dict(record), dict(record)]
+    assert rows["stats"]["nodes_processed"] == 2
+
+def test_relationship_upsert_missing_key_fields(graph):
+    """Test that relationship upsert validates key fields."""
     data = [{"domain": "company.com"}]  # Missing email field
     
     with pytest.raises(Exception) as exc_info:
-        plan = g.rels("WORKS_AT").upsert(
+        plan = graph.rels("WORKS_AT").upsert(
             data, 
             src=("Person", "email"), 
             dst=("Company", "domain")
@@ -532,23 +656,19 @@ def test_relationship_upsert_missing_key_fields():
     
     assert "Source key field 'email' not found" in str(exc_info.value)
 
-def test_node_upsert_missing_key_fields():
+def test_node_upsert_missing_key_fields(graph):
     """Test that node upsert validates key fields."""
-    g = Graph.connect("bolt://localhost:7687", auth=("neo4j", "password"))
-    
     data = [{"name": "John"}]  # Missing email field
     
     with pytest.raises(Exception) as exc_info:
-        plan = g.nodes("Person").upsert(data, key="email")
+        plan = graph.nodes("Person").upsert(data, key="email")
         plan.compile()
     
     assert "Key field 'email' not found" in str(exc_info.value)
 
-def test_complex_update_with_multiple_conditions():
+def test_complex_update_with_multiple_conditions(graph):
     """Test update with multiple where conditions."""
-    g = Graph.connect("bolt://localhost:7687", auth=("neo4j", "password"))
-    
-    query = g.nodes("Person").where(age__gte=18, country="US", status="active")
+    query = graph.nodes("Person").where(age__gte=18, country="US", status="active")
     plan = query.patch(verified=True)
     compiled = plan.compile()
     
@@ -558,14 +678,30 @@ def test_complex_update_with_multiple_conditions():
     assert compiled["params"]["where_2"] == "active"
 
 
-def test_relationship_uniqueness_policy_default():
-    """Test relationship uniqueness policy with default (single_edge_per_pair)."""
-    g = Graph.connect("bolt://localhost:7687", auth=("neo4j", "password"))
+def test_patch_drops_nulls_before_template_lookup(graph):
+    """Test that None updates under ignore_nulls share the template of the shape without them."""
+    with_null = graph.nodes("Person").where(country="US").patch(active=True, last_updated=None).compile()
+    without = graph.nodes("Person").where(country="US").patch(active=False).compile()
     
+    assert with_null["cypher"] is without["cypher"]
+    assert with_null["params"] == {"param_0": True, "where_0": "US"}
+
+
+def test_node_update_with_null_operations(graph):
+    """Test that node updates render NULL checks like deletes do, without a parameter."""
+    plan = graph.nodes("Person").where(email__is_null=True, country="US").patch(status="unverified")
+    compiled = plan.compile()
+
+    assert "WHERE n.email IS NULL AND n.country = $where_1" in compiled["cypher"]
+    assert compiled["params"] == {"param_0": "unverified", "where_1": "US"}
+
+
+def test_relationship_uniqueness_policy_default(graph):
+    """Test relationship uniqueness policy with default (single_edge_per_pair)."""
     data = [{"email": "john@example.com", "domain": "company.com", "role": "Engineer"}]
     
     # Should work without rel_key (default policy)
-    plan = g.rels("WORKS_AT").upsert(
+    plan = graph.rels("WORKS_AT").upsert(
         data,
         src=("Person", "email"),
         dst=("Company", "domain")
@@ -613,11 +749,9 @@ def test_relationship_uniqueness_policy_with_rel_key():
     assert "MERGE (a)-[r:WORKS_AT {role: item.role}]->(b)" in compiled["cypher"]
 
 
-def test_advanced_inc_update():
+def test_advanced_inc_update(graph):
     """Test increment update operation."""
-    g = Graph.connect("bolt://localhost:7687", auth=("neo4j", "password"))
-    
-    query = g.nodes("Person").where(name="John")
+    query = graph.nodes("Person").where(name="John")
     plan = query.inc("score", 10)
     compiled = plan.compile()
     
@@ -628,11 +762,9 @@ def test_advanced_inc_update():
     assert compiled["params"]["inc_1"] == 10
 
 
-def test_advanced_unset_update():
+def test_advanced_unset_update(graph):
     """Test unset (remove property) operation."""
-    g = Graph.connect("bolt://localhost:7687", auth=("neo4j", "password"))
-    
-    query = g.nodes("Person").where(status="inactive")
+    query = graph.nodes("Person").where(status="inactive")
     plan = query.unset("temporary_field")
     compiled = plan.compile()
     
@@ -642,11 +774,9 @@ def test_advanced_unset_update():
     assert compiled["params"]["where_0"] == "inactive"
 
 
-def test_advanced_list_append():
+def test_advanced_list_append(graph):
     """Test list append operation."""
-    g = Graph.connect("bolt://localhost:7687", auth=("neo4j", "password"))
-    
-    query = g.nodes("Person").where(email="john@example.com")
+    query = graph.nodes("Person").where(email="john@example.com")
     plan = query.list_append("tags", "premium")
     compiled = plan.compile()
     
@@ -657,11 +787,9 @@ def test_advanced_list_append():
     assert compiled["params"]["list_1"] == "premium"
 
 
-def test_advanced_list_remove():
+def test_advanced_list_remove(graph):
     """Test list remove operation."""
-    g = Graph.connect("bolt://localhost:7687", auth=("neo4j", "password"))
-    
-    query = g.nodes("Person").where(role="Engineer")
+    query = graph.nodes("Person").where(role="Engineer")
     plan = query.list_remove("tags", "temp")
     compiled = plan.compile()
     
@@ -672,11 +800,9 @@ def test_advanced_list_remove():
     assert compiled["params"]["list_1"] == "temp"
 
 
-def test_advanced_map_merge():
+def test_advanced_map_merge(graph):
     """Test map merge operation."""
-    g = Graph.connect("bolt://localhost:7687", auth=("neo4j", "password"))
-    
-    query = g.nodes("Person").where(country="US")
+    query = graph.nodes("Person").where(country="US")
     metadata = {"last_updated": "2024-01-01", "source": "import"}
     plan = query.map_merge("metadata", metadata)
     compiled = plan.compile()
@@ -688,13 +814,48 @@ def test_advanced_map_merge():
     assert compiled["params"]["map_1"] == metadata
 
 
-def test_advanced_operations_without_where():
+def test_advanced_operations_without_where(graph):
     """Test advanced operations without where conditions."""
-    g = Graph.connect("bolt://localhost:7687", auth=("neo4j", "password"))
-    
     # Test inc without where
-    plan = g.nodes("Person").inc("views", 1)
+    plan = graph.nodes("Person").inc("views", 1)
     compiled = plan.compile()
     assert "MATCH (n:Person)" in compiled["cypher"]
     assert "WHERE" not in compiled["cypher"]  # No WHERE clause
     assert "SET n.views = coalesce(n.views, 0) + $inc_0" in compiled["cypher"]
+
+
+def test_advanced_operations_reuse_template(graph):
+    """Test that advanced updates of the same shape share their Cypher and rebind values."""
+    first = graph.nodes("Person").where(country="US", email__exists=True).inc("score", 10).compile()
+    hits = _advanced_template.cache_info().hits
+    second = graph.nodes("Person").where(country="UK", email__exists=True).inc("score", 5).compile()
+
+    assert _advanced_template.cache_info().hits == hits + 1
+    assert second["cypher"] is first["cypher"]
+    assert "WHERE n.country = $where_0 AND n.email IS NOT NULL" in second["cypher"]
+    assert "SET n.score = coalesce(n.score, 0) + $inc_1" in second["cypher"]
+    assert second["params"] == {"where_0": "UK", "inc_1": 5}
+
+
+def test_schema_batch_compiles_and_commits_in_one_transaction(graph, fake_writes):
+    """Test that schema.batch() joins DDL statements and commits them in one transaction."""
+    schema = graph.schema()
+    batch = schema.batch([
+        schema.ensure_unique("Person", "email"),
+        schema.ensure_index("Person", "name"),
+    ])
+    batch.add(schema.drop_index("Person", "country"))
+
+    compiled = batch.compile()
+    assert compiled["params"] == {}
+    assert compiled["cypher"].split(";\n") == [
+        "CREATE CONSTRAINT IF NOT EXISTS constraint_Person_email FOR (n:Person) REQUIRE n.email IS UNIQUE",
+        "CREATE INDEX IF NOT EXISTS index_Person_name FOR (n:Person) ON (n.name)",
+        "DROP INDEX IF EXISTS index_Person_country",
+    ]
+
+    results = batch.commit()
+
+    assert len(fake_writes.sessions) == 1
+    assert [call.args[0] for call in fake_writes.tx.run.call_args_list] == compiled["cypher"].split(";\n")
+    assert len(results) == 3
@@ -2,14 +2,19 @@
 Test basic WritePlan functionality.
 """
 
-from graphframe_neo4j import Graph, WritePlan
+import asyncio
 
-def test_writeplan_creation():
+import pytest
+
+from graphframe_neo4j import WritePlan
+from graphframe_neo4j.util.errors import WriteError
+from graphframe_neo4j.write.writeplan import _OP_DISPATCH, _chunk_params, _compile_fallback
+
+
+def test_writeplan_creation(graph):
     """Test that we can create a WritePlan."""
-    g = Graph.connect("bolt://localhost:7687", auth=("neo4j", "password"))
-    
     # Create a write plan directly
-    plan = WritePlan(g, "test_operation", "Person")
+    plan = WritePlan(graph, "test_operation", "Person")
     assert plan is not None
     assert str(plan) == "<WritePlan test_operation Person>"
     
@@ -35,3 +40,189 @@ def test_writeplan_creation():
     
     profile_result = plan.profile()
     assert "profile" in profile_result
+
+def test_commit_chunks_unwind_batches(graph, fake_writes):
+    """Test that commit splits large UNWIND batches into separate transactions."""
+    data = [{"email": f"user{i}@example.com", "name": f"User {i}"} for i in range(25)]
+    plan = graph.nodes("Person").upsert(data, key="email", batch_size=10)
+    fake_writes.counters.nodes_created = 2
+    fake_writes.counters.properties_set = 5
+
+    stats = plan.commit()
+
+    chunk_sizes = [len(call.kwargs["batch"]) for call in fake_writes.cypher_write.call_args_list]
+    assert chunk_sizes == [10, 10, 5]
+    assert stats["batches"] == 3
+    assert stats["nodes_created"] == 6
+    assert stats["nodes_updated"] == 19
+    assert stats["properties_set"] == 15
+    assert stats["rows_affected"] == 25
+
+def test_rows_affected_by_operation(graph, fake_writes):
+    """Test that deletes count deleted entities and updates leave rows_affected unknown."""
+    fake_writes.counters.nodes_deleted = 4
+    fake_writes.counters.relationships_deleted = 7
+    fake_writes.counters.properties_set = 9
+
+    node_delete = graph.nodes("Person").where(country="US").delete(detach=True).commit()
+    rel_delete = graph.rels("WORKS_AT").where(role="Intern").delete().commit()
+    patch = graph.nodes("Person").where(country="US").patch(active=False).commit()
+
+    assert node_delete["rows_affected"] == 4
+    assert rel_delete["rows_affected"] == 7
+    assert patch["rows_affected"] is None
+    assert patch["properties_set"] == 9
+    assert WritePlan(graph, "test_operation", "Person").commit()["rows_affected"] == 0
+
+def test_chunk_params_soa_layout():
+    """Test that column-oriented parameters are chunked column by column."""
+    params = {"columns": {"email": list("abcde"), "name": list("ABCDE")}, "count": 5}
+    chunks, rows = _chunk_params(params, 2)
+
+    assert rows == 5
+    assert [chunk["count"] for chunk in chunks] == [2, 2, 1]
+    assert chunks[2]["columns"] == {"email": ["e"], "name": ["E"]}
+
+def test_chunk_params_single_chunk_is_not_copied():
+    """Test that a batch that fits in one chunk is sent as is."""
+    params = {"batch": [{"email": "a"}, {"email": "b"}]}
+    chunks, rows = _chunk_params(params, 2)
+
+    assert rows == 2
+    assert chunks == [params]
+    assert chunks[0]["batch"] is params["batch"]
+
+def test_writeplans_share_graph_compiler(graph):
+    """Test that plans created from one graph reuse its upsert compiler."""
+    first = graph.nodes("Person").upsert({"email": "a@example.com"}, key="email")
+    second = graph.nodes("Person").delete()
+
+    assert first._upsert_compiler is graph.upsert_compiler
+    assert second._upsert_compiler is graph.upsert_compiler
+
+def test_commit_runs_in_caller_transaction(graph, fake_writes):
+    """Test that commit(tx=...) runs every chunk in the given transaction."""
+    tx = fake_writes.tx
+    fake_writes.counters.nodes_created = 1
+
+    data = [{"email": f"user{i}@example.com"} for i in range(3)]
+    stats = graph.nodes("Person").upsert(data, key="email").commit(batch_size=2, tx=tx)
+
+    assert tx.run.call_count == 2
+    assert not fake_writes.cypher_write.called
+    assert stats["nodes_created"] == 2
+
+def test_writeplan_uses_slots(graph):
+    """Test that WritePlan instances carry no per-instance __dict__."""
+    plan = WritePlan(graph, "test_operation", "Person")
+
+    assert not hasattr(plan, "__dict__")
+    assert plan.commit()["status"] == "skipped"
+    assert plan._stats.status == "skipped"
+
+def test_compiled_is_computed_once(graph):
+    """Test that compile(), preview() and compiled share one compiled result."""
+    plan = graph.nodes("Person").upsert({"email": "a@example.com", "name": "A"}, key="email")
+
+    assert plan.preview() is plan.compile()
+    assert plan.compiled is plan.compile()
+
+def test_compiled_plan_attributes(graph):
+    """Test that compiled plans are dicts that also expose cypher/params/stats attributes."""
+    upsert = graph.nodes("Person").upsert([{"email": "a@example.com"}], key="email").compile()
+    delete = graph.nodes("Person").where(country="US").delete().compile()
+
+    assert upsert.cypher == upsert["cypher"]
+    assert upsert.params is upsert["params"]
+    assert upsert.stats == {"nodes_processed": 1, "batches": 1}
+    assert "stats" not in delete and delete.stats is None
+    assert not hasattr(graph.schema(), "__dict__")
+
+def test_compile_function_bound_at_construction(graph):
+    """Test that each plan binds its operation's compile function up front."""
+    people = graph.nodes("Person")
+
+    assert people.upsert({"email": "a@example.com"}, key="email")._compile is _OP_DISPATCH["upsert"]
+    assert people.where(country="US").delete()._compile is _OP_DISPATCH["delete"]
+    assert WritePlan(graph, "merge_everything", "Person")._compile is _compile_fallback
+
+def test_commit_many_runs_plans_concurrently(graph, fake_writes):
+    """Test that Graph.commit_many commits every plan via commit_async."""
+    fake_writes.counters.nodes_created = 1
+    fake_writes.counters.properties_set = 2
+
+    plans = [
+        graph.nodes("Person").upsert({"email": "a@example.com", "name": "A"}, key="email"),
+        graph.nodes("Company").upsert({"domain": "example.com", "name": "Example"}, key="domain"),
+        WritePlan(graph, "test_operation", "Person")
+    ]
+    results = asyncio.run(graph.commit_many(plans, concurrency=2))
+
+    assert fake_writes.cypher_write_async.await_count == 2
+    assert [result["target"] for result in results] == ["Person", "Company", "Person"]
+    assert [result["status"] for result in results] == ["committed", "committed", "skipped"]
+    assert results[0]["nodes_created"] == 1
+
+def test_unknown_operation_resolved_at_construction(graph):
+    """Test that unknown operation types are compiled and skipped up front."""
+    plan = WritePlan(graph, "merge_everything", "Person")
+
+    assert plan._skip
+    assert plan._compiled == {"cypher": "// merge_everything Person", "params": {}}
+    assert not WritePlan(graph, "delete", "Person")._skip
+
+def test_batch_merges_upserts_into_one_transaction(graph, fake_writes):
+    """Test that Graph.batch() merges same-shape upserts and shares one transaction."""
+    tx = fake_writes.tx
+    fake_writes.counters.nodes_created = 3
+    fake_writes.counters.properties_set = 3
+    people = graph.nodes("Person")
+
+    with graph.batch() as batch:
+        batch.add(people.upsert([{"email": "a@example.com"}], key="email"))
+        batch.add(people.upsert([{"email": "b@example.com"}, {"email": "c@example.com"}], key="email"))
+        batch.add(graph.nodes("Company").upsert([{"name": "Acme"}], key="name"))
+        assert not tx.run.called
+
+    assert len(fake_writes.sessions) == 1
+    assert tx.run.call_count == 2
+    assert len(tx.run.call_args_list[0].kwargs["batch"]) == 3
+    assert [stats["target"] for stats in batch.stats] == ["Person", "Company"]
+    assert batch.stats[0]["rows_affected"] == 3
+    assert len(batch) == 0
+
+def test_batch_does_not_commit_on_error(graph, fake_writes):
+    """Test that nothing is written when the batch block raises."""
+    with pytest.raises(RuntimeError), graph.batch() as batch:
+        batch.add(graph.nodes("Person").upsert([{"email": "a@example.com"}], key="email"))
+        raise RuntimeError("abort")
+
+    assert not fake_writes.sessions
+
+def test_batch_respects_plan_batch_sizes(graph, fake_writes):
+    """Test that merged plans are chunked by their batch_size and differing sizes are not merged."""
+    people = graph.nodes("Person")
+    rows = [{"email": f"{i}@example.com"} for i in range(3)]
+
+    with graph.batch() as batch:
+        first = batch.add(people.upsert(rows, key="email", batch_size=2))
+        second = batch.add(people.upsert(rows, key="email", batch_size=2))
+        batch.add(people.upsert(rows, key="email"))
+
+    # 6 merged rows in chunks of 2, then the default-size plan in one chunk
+    assert [len(call.kwargs["batch"]) for call in fake_writes.tx.run.call_args_list] == [2, 2, 2, 3]
+    assert [stats["batches"] for stats in batch.stats] == [3, 1]
+    assert first._stats is second._stats
+    assert first._stats.as_dict() == batch.stats[0]
+
+def test_batch_failure_clears_queue(graph, fake_writes):
+    """Test that a failing batch raises WriteError and drops its queued plans."""
+    fake_writes.tx.run.side_effect = RuntimeError("connection lost")
+    people = graph.nodes("Person")
+
+    with pytest.raises(WriteError, match="connection lost"), graph.batch() as batch:
+        batch.add(people.upsert([{"email": "a@example.com"}], key="email"))
+        batch.add(people.upsert([{"email": "b@example.com"}], key="email"))
+
+    assert len(batch) == 0
+    assert batch.stats == []